@@ -21,17 +21,16 @@
 #
 
 from argparse import _SubParsersAction, ArgumentParser, ArgumentTypeError, BooleanOptionalAction, Namespace
-from beat_studio_importer.arg_summary import ArgSummary
 from beat_studio_importer.beat_studio_tempo import BEAT_STUDIO_TEMPO_MAX, BEAT_STUDIO_TEMPO_MIN, BeatStudioTempo
-from beat_studio_importer.constants import PROGRAM_NAME, PROGRAM_URL
+from beat_studio_importer.console import console_output
+from beat_studio_importer.constants import PROGRAM_NAME, PROGRAM_URL, VIRTUAL_PORT_NAME
 from beat_studio_importer.custom_formatter import CustomFormatter
-from beat_studio_importer.import_command import do_import
-from beat_studio_importer.info_command import do_info
-from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
 from beat_studio_importer.misc import MidiChannel, RegionId
 from beat_studio_importer.note_value import NoteValue
-from beat_studio_importer.play_command import do_play
-from beat_studio_importer.remap_command import do_remap
+from beat_studio_importer.output_format import DumpFormat, SummaryFormat
+from beat_studio_importer.path_util import is_multi_path
+from beat_studio_importer.serve_client import SERVED_COMMANDS, SOCKET_ENV_VAR, forward_to_server, server_socket_path
+from beat_studio_importer.time_signature import TimeSignature
 from beat_studio_importer.user_error import UserError
 from colorama import Fore, Style
 from pathlib import Path
@@ -57,7 +56,13 @@ DEFAULT_LOG_LEVEL: str = "warning"
 @runtime_checkable
 class ImportArgs(Protocol):
     @property
-    def path(self) -> Path: ...
+    def path(self) -> Path | None: ...
+
+    @property
+    def manifest_path(self) -> Path | None: ...
+
+    @property
+    def jobs(self) -> int | None: ...
 
     @property
     def note_name_path(self) -> Path | None: ...
@@ -68,6 +73,9 @@ class ImportArgs(Protocol):
     @property
     def region(self) -> int | None: ...
 
+    @property
+    def at_seconds(self) -> float | None: ...
+
     @property
     def quantum(self) -> int: ...
 
@@ -90,15 +98,66 @@ class ImportArgs(Protocol):
     def all(self) -> bool: ...
 
 
+# Command modules pull in mido, PyYAML and the rest of the package, so
+# each is imported only once its subcommand has been dispatched
 def do_import_args(args: ImportArgs) -> None:
+    from beat_studio_importer.arg_summary import ArgSummary
+    from beat_studio_importer.import_command import do_import
+    from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+
     def wrap_optional[T, U](func: Callable[[T], U], obj: T | None) -> U | None:
         return None if obj is None else func(obj)
 
+    # Options apply to jobs that do not specify their own
+    defaults: dict[str, object] = {
+        "channel": args.channel,
+        "region": args.region,
+        "quantum": args.quantum,
+        "tempo": args.override_tempo,
+        "repeat": args.repeat,
+        "name": args.name,
+        "note_map": args.note_name_path,
+        "discard_boundary_hits": args.discard_boundary_hits,
+        "all": args.all
+    }
+
+    if args.manifest_path is not None:
+        from beat_studio_importer.batch_import import do_import_manifest
+
+        if args.path is not None:
+            raise UserError("Cannot specify both PATH and --manifest")
+        if args.at_seconds is not None:
+            raise UserError("Cannot use --at with --manifest")
+
+        do_import_manifest(
+            manifest_path=args.manifest_path,
+            defaults=defaults,
+            add=args.add,
+            worker_count=args.jobs)
+        return
+
+    if args.path is None:
+        raise UserError("PATH is required unless --manifest is specified")
+
+    if is_multi_path(args.path):
+        from beat_studio_importer.batch_import import do_import_paths
+
+        if args.at_seconds is not None or args.name is not None:
+            raise UserError("Cannot use --at or --name when PATH is a directory or glob")
+
+        do_import_paths(
+            path=args.path,
+            defaults=defaults,
+            add=args.add,
+            worker_count=args.jobs)
+        return
+
     do_import(
         path=args.path,
         note_name_map=wrap_optional(MidiNoteNameMap.load, args.note_name_path),
         channel=wrap_optional(MidiChannel, args.channel),
         region_id=wrap_optional(RegionId, args.region),
+        at_seconds=args.at_seconds,
         quantum=NoteValue.from_int(args.quantum),
         name=args.name,
         override_tempo=wrap_optional(BeatStudioTempo, args.override_tempo),
@@ -120,9 +179,30 @@ class InfoArgs(Protocol):
     @property
     def exclude(self) -> list[str] | None: ...
 
+    @property
+    def dump_format(self) -> str: ...
+
+    @property
+    def summary_format(self) -> str: ...
+
+    @property
+    def output_path(self) -> Path | None: ...
+
+    @property
+    def jobs(self) -> int | None: ...
+
 
 def do_info_args(args: InfoArgs) -> None:
-    do_info(path=args.path, dump=args.dump, exclude=args.exclude)
+    from beat_studio_importer.info_command import do_info
+
+    do_info(
+        path=args.path,
+        dump=args.dump,
+        exclude=args.exclude,
+        dump_format=DumpFormat(args.dump_format),
+        summary_format=SummaryFormat(args.summary_format),
+        output_path=args.output_path,
+        jobs=args.jobs)
 
 
 @runtime_checkable
@@ -136,12 +216,44 @@ class PlayArgs(Protocol):
     @property
     def force_channel_10(self) -> bool | None: ...
 
+    @property
+    def pause_gc(self) -> bool: ...
+
+    @property
+    def benchmark(self) -> bool: ...
+
+    @property
+    def region(self) -> int | None: ...
+
+    @property
+    def loop_count(self) -> int: ...
+
+    @property
+    def note_name_path(self) -> Path | None: ...
+
+    @property
+    def velocity_scale(self) -> float: ...
+
+    @property
+    def velocity_offset(self) -> int: ...
+
 
 def do_play_args(args: PlayArgs) -> None:
+    from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+    from beat_studio_importer.play_command import do_play
+
     do_play(
         path=args.path,
         port_name=args.port_name,
-        force_channel_10=args.force_channel_10 or False)
+        force_channel_10=args.force_channel_10 or False,
+        pause_gc=args.pause_gc,
+        benchmark=args.benchmark,
+        region_id=None if args.region is None else RegionId(args.region),
+        loop_count=args.loop_count,
+        note_name_map=None if args.note_name_path is None else MidiNoteNameMap.load(
+            args.note_name_path),
+        velocity_scale=args.velocity_scale,
+        velocity_offset=args.velocity_offset)
 
 
 @runtime_checkable
@@ -152,9 +264,122 @@ class RemapArgs(Protocol):
     @property
     def output_path(self) -> Path: ...
 
+    @property
+    def jobs(self) -> int | None: ...
+
+    @property
+    def note_name_path(self) -> Path | None: ...
+
+    @property
+    def velocity_scale(self) -> float: ...
+
+    @property
+    def velocity_offset(self) -> int: ...
+
 
 def do_remap_args(args: RemapArgs) -> None:
-    do_remap(path=args.path, output_path=args.output_path)
+    from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+    from beat_studio_importer.remap_command import do_remap
+
+    do_remap(
+        path=args.path,
+        output_path=args.output_path,
+        jobs=args.jobs,
+        note_name_map=None if args.note_name_path is None else MidiNoteNameMap.load(
+            args.note_name_path),
+        velocity_scale=args.velocity_scale,
+        velocity_offset=args.velocity_offset)
+
+
+@runtime_checkable
+class CompactArgs(Protocol):
+    @property
+    def patterns_path(self) -> Path | None: ...
+
+    @property
+    def drop_generated_comments(self) -> bool: ...
+
+
+def do_compact_args(args: CompactArgs) -> None:
+    from beat_studio_importer.compact_command import do_compact
+
+    do_compact(
+        path=args.patterns_path,
+        drop_generated_comments=args.drop_generated_comments)
+
+
+@runtime_checkable
+class LibrarySyncArgs(Protocol):
+    @property
+    def patterns_path(self) -> Path | None: ...
+
+    @property
+    def index_path(self) -> Path | None: ...
+
+
+def do_library_sync_args(args: LibrarySyncArgs) -> None:
+    from beat_studio_importer.library_command import do_library_sync
+    from beat_studio_importer.library_index import default_library_index_path
+
+    do_library_sync(
+        patterns_path=args.patterns_path,
+        index_path=args.index_path or default_library_index_path())
+
+
+@runtime_checkable
+class LibraryQueryArgs(Protocol):
+    @property
+    def index_path(self) -> Path | None: ...
+
+    @property
+    def name(self) -> str | None: ...
+
+    @property
+    def time_signature(self) -> TimeSignature | None: ...
+
+    @property
+    def min_tempo(self) -> int | None: ...
+
+    @property
+    def max_tempo(self) -> int | None: ...
+
+    @property
+    def min_step_count(self) -> int | None: ...
+
+    @property
+    def max_step_count(self) -> int | None: ...
+
+    @property
+    def quantum(self) -> int | None: ...
+
+
+def do_library_query_args(args: LibraryQueryArgs) -> None:
+    from beat_studio_importer.library_command import do_library_query
+    from beat_studio_importer.library_index import default_library_index_path
+
+    do_library_query(
+        index_path=args.index_path or default_library_index_path(),
+        name=args.name,
+        time_signature=args.time_signature,
+        min_tempo=args.min_tempo,
+        max_tempo=args.max_tempo,
+        min_step_count=args.min_step_count,
+        max_step_count=args.max_step_count,
+        quantum=None if args.quantum is None else NoteValue.from_int(args.quantum))
+
+
+@runtime_checkable
+class ServeArgs(Protocol):
+    @property
+    def socket_path(self) -> Path | None: ...
+
+
+def do_serve_args(args: ServeArgs) -> None:
+    from beat_studio_importer.serve_command import default_socket_path, do_serve
+
+    do_serve(
+        socket_path=args.socket_path or default_socket_path(),
+        run=run_command)
 
 
 def resolve_path(cwd: Path, s: str) -> Path:
@@ -173,6 +398,16 @@ def add_log_level_arg(parser: ArgumentParser) -> None:
         help=f"log level (one of: {', '.join(LOG_LEVELS)})")
 
 
+def add_colour_arg(parser: ArgumentParser) -> None:
+    _ = parser.add_argument(
+        "--colour",
+        "--color",
+        dest="colour",
+        action=BooleanOptionalAction,
+        default=None,
+        help="colour output (default: only on a terminal and if NO_COLOR is not set)")
+
+
 def add_path_arg(parser: ArgumentParser, cwd: Path, optional: bool = False) -> None:
     def resolved_path(s: str) -> Path:
         return resolve_path(cwd, s)
@@ -182,7 +417,7 @@ def add_path_arg(parser: ArgumentParser, cwd: Path, optional: bool = False) -> N
         metavar="PATH",
         type=resolved_path,
         nargs="?" if optional else None,
-        help="path of file to import")
+        help="path of file, directory or glob to import")
 
 
 def add_output_path_arg(parser: ArgumentParser, cwd: Path, optional: bool = False) -> None:
@@ -197,6 +432,31 @@ def add_output_path_arg(parser: ArgumentParser, cwd: Path, optional: bool = Fals
         help="output path")
 
 
+def add_patterns_path_arg(parser: ArgumentParser, cwd: Path) -> None:
+    def resolved_path(s: str) -> Path:
+        return resolve_path(cwd, s)
+
+    _ = parser.add_argument(
+        dest="patterns_path",
+        metavar="PATTERNS_PATH",
+        type=resolved_path,
+        nargs="?",
+        help="path to patterns.beat file (default: file in Beat Studio profile)")
+
+
+def add_index_path_arg(parser: ArgumentParser, cwd: Path) -> None:
+    def resolved_path(s: str) -> Path:
+        return resolve_path(cwd, s)
+
+    _ = parser.add_argument(
+        "--index-path",
+        dest="index_path",
+        metavar="INDEX_PATH",
+        type=resolved_path,
+        default=None,
+        help="path to library index database (default: file in cache directory)")
+
+
 def add_note_map_path_arg(parser: ArgumentParser, cwd: Path) -> None:
     def resolved_path(s: str) -> Path:
         return resolve_path(cwd, s)
@@ -212,7 +472,22 @@ def add_note_map_path_arg(parser: ArgumentParser, cwd: Path) -> None:
         help="path to note name file")
 
 
+# Served commands are forwarded to the import server when BS_IMPORTER_SOCKET
+# is set and it is listening, and run locally otherwise
 def main(cwd: Path, argv: list[str]) -> None:
+    if len(argv) > 0 and argv[0] in SERVED_COMMANDS:
+        socket_path = server_socket_path()
+        if socket_path is not None:
+            exit_code = forward_to_server(socket_path, cwd, argv)
+            if exit_code is not None:
+                if exit_code != 0:
+                    sys.exit(exit_code)
+                return
+
+    run_command(cwd, argv)
+
+
+def run_command(cwd: Path, argv: list[str]) -> None:
     def add_parser[T](parsers: "_SubParsersAction[ArgumentParser]", name: str, help: str, args_cls: type[T], func: Func[T]) -> ArgumentParser:
         p = parsers.add_parser(
             name=name,
@@ -221,6 +496,68 @@ def main(cwd: Path, argv: list[str]) -> None:
         p.set_defaults(handler=(args_cls, func))
         return p
 
+    def time_signature(s: str) -> TimeSignature:
+        try:
+            return TimeSignature.parse(s)
+        except ValueError:
+            raise ArgumentTypeError(f"invalid time signature {s}")
+
+    # Resolves the path of a virtual port against the working directory
+    def port_name(s: str) -> str:
+        name, sep, path_str = s.partition(":")
+        if name != VIRTUAL_PORT_NAME or sep == "" or path_str == "":
+            return s
+        return f"{VIRTUAL_PORT_NAME}:{resolve_path(cwd, path_str)}"
+
+    def non_negative_float(s: str) -> float:
+        try:
+            value = float(s)
+        except ValueError:
+            raise ArgumentTypeError(f"invalid number {s}")
+        if not value >= 0:
+            raise ArgumentTypeError(f"{s} is negative")
+        return value
+
+    def positive_int(s: str) -> int:
+        try:
+            value = int(s)
+        except ValueError:
+            raise ArgumentTypeError(f"invalid integer {s}")
+        if value <= 0:
+            raise ArgumentTypeError(f"{s} is not positive")
+        return value
+
+    def resolved_path(s: str) -> Path:
+        return resolve_path(cwd, s)
+
+    def add_jobs_arg(parser: ArgumentParser, help: str = "number of worker processes when PATH is a directory or glob") -> None:
+        _ = parser.add_argument(
+            "--jobs",
+            "-j",
+            dest="jobs",
+            metavar="JOBS",
+            type=positive_int,
+            default=None,
+            help=f"{help} (default: number of CPUs)")
+
+    # Applied together with any channel change in a single pass
+    def add_transform_args(parser: ArgumentParser) -> None:
+        add_note_map_path_arg(parser, cwd)
+        _ = parser.add_argument(
+            "--velocity-scale",
+            dest="velocity_scale",
+            metavar="VELOCITY_SCALE",
+            type=non_negative_float,
+            default=1.0,
+            help="multiply note velocities by this factor")
+        _ = parser.add_argument(
+            "--velocity-offset",
+            dest="velocity_offset",
+            metavar="VELOCITY_OFFSET",
+            type=int,
+            default=0,
+            help="add this to note velocities after scaling")
+
     def beat_studio_tempo(s: str) -> BeatStudioTempo:
         try:
             return BeatStudioTempo(int(s))
@@ -240,9 +577,18 @@ def main(cwd: Path, argv: list[str]) -> None:
         "import pattern from MIDI file",
         ImportArgs,  # type: ignore[type-abstract]
         do_import_args)
-    add_path_arg(p, cwd)
+    add_path_arg(p, cwd, optional=True)
     add_log_level_arg(p)
+    add_colour_arg(p)
     add_note_map_path_arg(p, cwd)
+    _ = p.add_argument(
+        "--manifest",
+        dest="manifest_path",
+        metavar="MANIFEST_PATH",
+        type=resolved_path,
+        default=None,
+        help="import the jobs listed in a YAML or CSV file instead of PATH, using other options as defaults")
+    add_jobs_arg(p, help="number of worker processes when PATH is a directory or glob or with --manifest")
     _ = p.add_argument(
         "--channel",
         "-c",
@@ -252,7 +598,8 @@ def main(cwd: Path, argv: list[str]) -> None:
         choices=range(1, 17),
         default=10,
         help="MIDI channel")
-    _ = p.add_argument(
+    group = p.add_mutually_exclusive_group()
+    _ = group.add_argument(
         "--region",
         "-r",
         dest="region",
@@ -260,6 +607,13 @@ def main(cwd: Path, argv: list[str]) -> None:
         type=int,
         default=None,
         help="region index")
+    _ = group.add_argument(
+        "--at",
+        dest="at_seconds",
+        metavar="SECONDS",
+        type=non_negative_float,
+        default=None,
+        help="select region playing at given time in seconds")
     _ = p.add_argument(
         "--quantum",
         "-q",
@@ -321,6 +675,7 @@ def main(cwd: Path, argv: list[str]) -> None:
         do_info_args)
     add_path_arg(p, cwd, optional=True)
     add_log_level_arg(p)
+    add_colour_arg(p)
     _ = p.add_argument(
         "--dump",
         dest="dump",
@@ -336,6 +691,31 @@ def main(cwd: Path, argv: list[str]) -> None:
         nargs="+",
         default=None,
         help="filter out given message types")
+    _ = p.add_argument(
+        "--format",
+        dest="dump_format",
+        metavar="FORMAT",
+        type=str,
+        choices=[member.value for member in DumpFormat],
+        default=DumpFormat.TEXT.value,
+        help="format of dumped MIDI events (jsonl writes only the events)")
+    _ = p.add_argument(
+        "--summary-format",
+        dest="summary_format",
+        metavar="SUMMARY_FORMAT",
+        type=str,
+        choices=[member.value for member in SummaryFormat],
+        default=SummaryFormat.CSV.value,
+        help="format of per-file summary when PATH is a directory or glob")
+    _ = p.add_argument(
+        "--output",
+        "-o",
+        dest="output_path",
+        metavar="OUTPUT_PATH",
+        type=resolved_path,
+        default=None,
+        help="write per-file summary to file instead of standard output")
+    add_jobs_arg(p)
 
     p = add_parser(
         parsers,
@@ -345,6 +725,7 @@ def main(cwd: Path, argv: list[str]) -> None:
         do_play_args)
     add_path_arg(p, cwd)
     add_log_level_arg(p)
+    add_colour_arg(p)
     _ = p.add_argument(
         "--10",
         dest="force_channel_10",
@@ -357,44 +738,193 @@ def main(cwd: Path, argv: list[str]) -> None:
         "-p",
         dest="port_name",
         metavar="PORT_NAME",
-        type=str,
+        type=port_name,
         default=None,
-        help="MIDI port name")
+        help=f"MIDI port name (\"{VIRTUAL_PORT_NAME}\" records messages in memory, \"{VIRTUAL_PORT_NAME}:PATH\" also writes them to PATH)")
+    _ = p.add_argument(
+        "--pause-gc",
+        dest="pause_gc",
+        metavar="PAUSE_GC",
+        action=BooleanOptionalAction,
+        default=True,
+        help="pause garbage collection during playback to reduce timing jitter")
+    _ = p.add_argument(
+        "--benchmark",
+        dest="benchmark",
+        metavar="BENCHMARK",
+        action=BooleanOptionalAction,
+        default=False,
+        help=f"report latency percentiles, jitter and throughput (default port: {VIRTUAL_PORT_NAME})")
+    _ = p.add_argument(
+        "--region",
+        "-r",
+        dest="region",
+        metavar="REGION",
+        type=int,
+        default=None,
+        help="play only the given region")
+    _ = p.add_argument(
+        "--loop",
+        dest="loop_count",
+        metavar="LOOP_COUNT",
+        type=positive_int,
+        default=1,
+        help="number of times to play region")
+    add_transform_args(p)
 
     p = add_parser(
         parsers,
         "remap",
-        "remap all notes to MIDI channel 10",
+        "remap all notes to MIDI channel 10, optionally mapping notes and velocities",
         RemapArgs,  # type: ignore[type-abstract]
         do_remap_args)
     add_path_arg(p, cwd)
     add_output_path_arg(p, cwd)
     add_log_level_arg(p)
+    add_colour_arg(p)
+    add_jobs_arg(p)
+    add_transform_args(p)
+
+    p = add_parser(
+        parsers,
+        "compact",
+        "remove duplicate patterns from Beat Studio patterns.beat file",
+        CompactArgs,  # type: ignore[type-abstract]
+        do_compact_args)
+    add_patterns_path_arg(p, cwd)
+    add_log_level_arg(p)
+    add_colour_arg(p)
+    _ = p.add_argument(
+        "--drop-comments",
+        dest="drop_generated_comments",
+        metavar="DROP_GENERATED_COMMENTS",
+        action=BooleanOptionalAction,
+        default=False,
+        help=f"remove comments generated by {PROGRAM_NAME} from kept patterns")
+
+    p = add_parser(
+        parsers,
+        "serve",
+        f"run import server for clients that set {SOCKET_ENV_VAR}",
+        ServeArgs,  # type: ignore[type-abstract]
+        do_serve_args)
+    add_log_level_arg(p)
+    add_colour_arg(p)
+    _ = p.add_argument(
+        "--socket",
+        "-s",
+        dest="socket_path",
+        metavar="SOCKET_PATH",
+        type=resolved_path,
+        default=None,
+        help="path to Unix domain socket (default: file in cache directory)")
+
+    p = parsers.add_parser(
+        name="library",
+        help="index and query Beat Studio patterns.beat file",
+        description="Index and query Beat Studio patterns.beat file")
+    library_parsers = p.add_subparsers(required=True)
+
+    p = add_parser(
+        library_parsers,
+        "sync",
+        "update library index from Beat Studio patterns.beat file",
+        LibrarySyncArgs,  # type: ignore[type-abstract]
+        do_library_sync_args)
+    add_patterns_path_arg(p, cwd)
+    add_index_path_arg(p, cwd)
+    add_log_level_arg(p)
+    add_colour_arg(p)
+
+    p = add_parser(
+        library_parsers,
+        "query",
+        "find patterns in library index",
+        LibraryQueryArgs,  # type: ignore[type-abstract]
+        do_library_query_args)
+    add_index_path_arg(p, cwd)
+    add_log_level_arg(p)
+    add_colour_arg(p)
+    _ = p.add_argument(
+        "--name",
+        dest="name",
+        metavar="NAME",
+        type=str,
+        default=None,
+        help="pattern name (case-insensitive, wildcards * and ? allowed)")
+    _ = p.add_argument(
+        "--time-signature",
+        "-t",
+        dest="time_signature",
+        metavar="TIME_SIGNATURE",
+        type=time_signature,
+        default=None,
+        help="time signature (e.g. 7/8)")
+    _ = p.add_argument(
+        "--min-tempo",
+        dest="min_tempo",
+        metavar="MIN_TEMPO",
+        type=int,
+        default=None,
+        help="minimum tempo")
+    _ = p.add_argument(
+        "--max-tempo",
+        dest="max_tempo",
+        metavar="MAX_TEMPO",
+        type=int,
+        default=None,
+        help="maximum tempo")
+    _ = p.add_argument(
+        "--min-steps",
+        dest="min_step_count",
+        metavar="MIN_STEPS",
+        type=int,
+        default=None,
+        help="minimum number of steps")
+    _ = p.add_argument(
+        "--max-steps",
+        dest="max_step_count",
+        metavar="MAX_STEPS",
+        type=int,
+        default=None,
+        help="maximum number of steps")
+    _ = p.add_argument(
+        "--quantum",
+        "-q",
+        dest="quantum",
+        metavar="QUANTUM",
+        type=int,
+        choices=sorted(member.int_value for member in NoteValue),
+        default=None,
+        help="note value (4=quarter note, 8=eighth etc.)")
 
     args = parser.parse_args(argv)
 
     level_str = cast(str, args.level).upper()
     level = logging.getLevelNamesMapping()[level_str]
-    handler = logging.StreamHandler()
-    handler.setFormatter(CustomFormatter())
-    logging.basicConfig(level=level, handlers=[handler])
 
     args_cls, func = cast(tuple[ArgsType, Func[Namespace]], args.handler)
     assert \
         isinstance(args, args_cls), \
         f"type of arguments {type(args)} does not conform to protocol {args_cls}"
 
-    try:
-        func(args)
-    except KeyboardInterrupt:
-        print(
-            "\n",
-            Fore.LIGHTRED_EX,
-            "Operation cancelled",
-            Style.RESET_ALL,
-            sep="",
-            file=sys.stderr)
-        sys.exit(2)
-    except UserError as e:
-        print(Fore.LIGHTRED_EX, str(e), Style.RESET_ALL, sep="", file=sys.stderr)
-        sys.exit(1)
+    with console_output(cast(bool | None, args.colour)):
+        # Log to the console's stderr, which may be a plain writer
+        handler = logging.StreamHandler()
+        handler.setFormatter(CustomFormatter())
+        logging.basicConfig(level=level, handlers=[handler], force=True)
+
+        try:
+            func(args)
+        except KeyboardInterrupt:
+            print(
+                "\n",
+                Fore.LIGHTRED_EX,
+                "Operation cancelled",
+                Style.RESET_ALL,
+                sep="",
+                file=sys.stderr)
+            sys.exit(2)
+        except UserError as e:
+            print(Fore.LIGHTRED_EX, str(e), Style.RESET_ALL, sep="", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,427 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.arg_summary import ArgSummary
+from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
+from beat_studio_importer.beat_studio_tempo import BeatStudioTempo
+from beat_studio_importer.beat_studio_util import resolve_patterns_path
+from beat_studio_importer.import_command import PatternInfo, build_pattern, load_timeline, render_pattern_output
+from beat_studio_importer.library_index import default_library_index_path
+from beat_studio_importer.midi_note_name_map import DEFAULT_MIDI_NOTE_NAME_MAP, MidiNoteNameMap
+from beat_studio_importer.misc import MidiChannel, RegionId
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.parallel_util import bounded_map, default_worker_count, describe_error
+from beat_studio_importer.path_util import expand_midi_paths
+from beat_studio_importer.region import Region
+from beat_studio_importer.table import Table
+from beat_studio_importer.ui import cprint
+from beat_studio_importer.user_error import UserError
+from collections.abc import Iterator, Mapping
+from colorama import Fore, Style
+from dataclasses import dataclass, replace
+from enum import Enum, unique
+from pathlib import Path
+from typing import Self, TextIO, cast
+import csv
+import sys
+
+
+# Manifest columns: path is required and all others are optional
+MANIFEST_COLUMNS: list[str] = [
+    "path",
+    "channel",
+    "region",
+    "quantum",
+    "tempo",
+    "repeat",
+    "name",
+    "note_map",
+    "discard_boundary_hits",
+    "all",
+]
+
+
+@unique
+class JobStatus(Enum):
+    RENDERED = "rendered"
+    ADDED = "added"
+    IDENTICAL_PATTERN_DEFINED = "identical pattern already defined"
+    PATTERN_NAME_IN_USE = "pattern name already in use"
+    EMPTY = "empty pattern skipped"
+    FAILED = "failed"
+
+
+# One file to import: a row of a manifest, with paths resolved relative
+# to the manifest, or a file in a directory or matching a glob
+@dataclass(frozen=True)
+class ImportJob:
+    path: Path
+    channel: MidiChannel | None = None
+    region_id: RegionId | None = None
+    quantum: NoteValue = NoteValue.SIXTEENTH
+    override_tempo: BeatStudioTempo | None = None
+    repeat: int | None = None
+    name: str | None = None
+    note_name_path: Path | None = None
+    discard_boundary_hits: bool = False
+    all: bool = False
+
+    # Values missing from row, or empty, are taken from defaults
+    @classmethod
+    def parse(cls: type[Self], row: Mapping[str, object], base_dir: Path, defaults: Mapping[str, object]) -> Self:
+        unknown = sorted(k for k in row.keys() if k not in MANIFEST_COLUMNS)
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown columns {', '.join(unknown)}")
+
+        def present(items: Mapping[str, object]) -> dict[str, object]:
+            return {k: v for k, v in items.items() if v is not None and v != ""}
+
+        values = present(defaults) | present(row)
+        if "path" not in values:
+            raise ValueError("Missing path")
+
+        def get_int(key: str) -> int | None:
+            value = values.get(key)
+            return None if value is None else int(cast(str | int, value))
+
+        channel = get_int("channel")
+        if channel is not None and not (1 <= channel <= 16):
+            raise ValueError(f"Invalid MIDI channel {channel}")
+        region_id = get_int("region")
+        quantum = get_int("quantum")
+        tempo = get_int("tempo")
+        note_map = values.get("note_map")
+        return cls(
+            path=base_dir / str(values["path"]),
+            channel=None if channel is None else MidiChannel(channel),
+            region_id=None if region_id is None else RegionId(region_id),
+            quantum=NoteValue.SIXTEENTH if quantum is None else NoteValue.from_int(quantum),
+            override_tempo=None if tempo is None else BeatStudioTempo(tempo),
+            repeat=get_int("repeat"),
+            name=None if "name" not in values else str(values["name"]),
+            note_name_path=None if note_map is None else base_dir / str(note_map),
+            discard_boundary_hits=parse_bool(values.get("discard_boundary_hits", False)),
+            all=parse_bool(values.get("all", False)))
+
+    @property
+    def args(self) -> ArgSummary:
+        attrs = [
+            ("path", str(self.path)),
+            ("quantum", str(self.quantum.int_value)),
+            ("discard_boundary_hits", str(self.discard_boundary_hits).lower()),
+        ]
+        for key, value in [
+                ("channel", self.channel),
+                ("region", self.region_id),
+                ("override_tempo", self.override_tempo),
+                ("repeat", self.repeat),
+                ("name", self.name),
+                ("note_name_path", self.note_name_path)]:
+            if value is not None:
+                attrs.append((key, str(value)))
+        return ArgSummary(attrs=sorted(attrs))
+
+
+@dataclass(frozen=True)
+class JobResult:
+    index: int
+    job: ImportJob
+    status: JobStatus
+    region_id: RegionId | None = None
+    pattern: BeatStudioPattern | None = None
+    output: str | None = None
+    error: str | None = None
+
+
+def parse_bool(value: object) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() in ["1", "true", "yes"]
+
+
+# Reads jobs from a YAML list of mappings, optionally under a "jobs" key,
+# or from a CSV file with a header row: PyYAML is slow to import so is
+# only imported when a manifest is read
+def load_manifest(path: Path, defaults: Mapping[str, object]) -> list[ImportJob]:
+    import yaml
+
+    try:
+        with path.open("rt", newline="") as f:
+            if path.suffix.lower() == ".csv":
+                rows: list[dict[str, object]] = list(csv.DictReader(f))
+            else:
+                obj = cast(object, yaml.safe_load(f))
+                if isinstance(obj, dict):
+                    obj = cast(dict[str, object], obj).get("jobs")
+                if not isinstance(obj, list):
+                    raise UserError(f"Manifest {path} does not contain a list of jobs")
+                rows = cast(list[dict[str, object]], obj)
+    except (OSError, yaml.YAMLError, csv.Error) as e:
+        raise UserError(f"Cannot read manifest {path}: {e}")
+
+    jobs: list[ImportJob] = []
+    for i, row in enumerate(rows, 1):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("Job is not a mapping")
+            jobs.append(ImportJob.parse(row, path.parent, defaults))
+        except ValueError as e:
+            raise UserError(f"Invalid job {i} in manifest {path}: {e}")
+
+    if len(jobs) == 0:
+        raise UserError(f"No jobs in manifest {path}")
+
+    return jobs
+
+
+# Module-level so that it can be pickled for worker processes: each MIDI
+# file is parsed once for all of the jobs that use it
+def render_jobs(item: tuple[list[tuple[int, ImportJob]], dict[Path, MidiNoteNameMap]]) -> list[JobResult]:
+    jobs, note_name_maps = item
+    return [
+        result
+        for index, job in jobs
+        for result in render_job(index, job, note_name_maps)
+    ]
+
+
+# One result for each region imported by the job
+def render_job(index: int, job: ImportJob, note_name_maps: Mapping[Path, MidiNoteNameMap]) -> list[JobResult]:
+    try:
+        _, timeline = load_timeline(job.path, job.channel)
+        regions = Region.build_all(
+            timeline,
+            discard_boundary_hits=job.discard_boundary_hits)
+        if job.all:
+            if len(regions) == 0:
+                raise UserError("No regions in file")
+            name = job.name or job.path.stem
+            return [
+                render_region(
+                    index,
+                    job,
+                    region,
+                    f"{name} region {region.id}",
+                    note_name_maps,
+                    job.args.append("region", str(region.id)))
+                for region in regions
+            ]
+
+        if job.region_id is not None:
+            if not (1 <= job.region_id <= len(regions)):
+                raise UserError(f"No region with ID {job.region_id}")
+            region = regions[job.region_id - 1]
+        elif len(regions) == 1:
+            region = regions[0]
+        else:
+            raise UserError(f"{len(regions)} regions in file: specify region or all")
+
+        return [
+            render_region(
+                index,
+                job,
+                region,
+                job.name or job.path.stem,
+                note_name_maps,
+                job.args)
+        ]
+    except Exception as e:
+        return [job_failed(index, job, e)]
+
+
+def render_region(index: int, job: ImportJob, region: Region, name: str, note_name_maps: Mapping[Path, MidiNoteNameMap], args: ArgSummary) -> JobResult:
+    try:
+        pattern = build_pattern(
+            region=region,
+            name=name,
+            note_name_map=DEFAULT_MIDI_NOTE_NAME_MAP
+            if job.note_name_path is None
+            else note_name_maps[job.note_name_path],
+            quantum=job.quantum,
+            override_tempo=job.override_tempo,
+            repeat=job.repeat)
+    except Exception as e:
+        return replace(job_failed(index, job, e), region_id=region.id)
+
+    if pattern.is_empty:
+        return JobResult(
+            index=index,
+            job=job,
+            status=JobStatus.EMPTY,
+            region_id=region.id)
+
+    return JobResult(
+        index=index,
+        job=job,
+        status=JobStatus.RENDERED,
+        region_id=region.id,
+        pattern=pattern,
+        output=render_pattern_output(pattern, region, args))
+
+
+def job_failed(index: int, job: ImportJob, e: Exception) -> JobResult:
+    return JobResult(
+        index=index,
+        job=job,
+        status=JobStatus.FAILED,
+        error=str(e) if isinstance(e, UserError) else describe_error(e))
+
+
+# Renders jobs grouped by MIDI file across worker processes, yielding
+# results in job order as soon as all earlier jobs are done: at most a
+# bounded number of files are in flight so that reading and parsing
+# later files overlaps rendering of earlier ones
+def run_jobs(jobs: list[ImportJob], progress: TextIO | None, worker_count: int | None = None) -> Iterator[JobResult]:
+    note_name_maps: dict[Path, MidiNoteNameMap] = {}
+    for path in sorted({j.note_name_path for j in jobs if j.note_name_path is not None}):
+        try:
+            note_name_maps[path] = MidiNoteNameMap.load(path)
+        except Exception as e:
+            raise UserError(f"Cannot load note map {path}: {describe_error(e)}")
+
+    groups: dict[Path, list[tuple[int, ImportJob]]] = {}
+    for index, job in enumerate(jobs):
+        groups.setdefault(job.path, []).append((index, job))
+
+    items = (
+        (group, {
+            j.note_name_path: note_name_maps[j.note_name_path]
+            for _, j in group
+            if j.note_name_path is not None
+        })
+        for group in groups.values()
+    )
+    worker_count = min(worker_count or default_worker_count(), len(groups))
+
+    # Results of finished jobs waiting for earlier jobs in other files
+    pending: dict[int, list[JobResult]] = {}
+    next_index = 0
+    for group, group_results in zip(groups.values(), bounded_map(render_jobs, items, worker_count)):
+        for index, _ in group:
+            pending[index] = []
+        for result in group_results:
+            pending[result.index].append(result)
+        while next_index in pending:
+            yield from pending.pop(next_index)
+            next_index += 1
+
+        if progress is not None:
+            _ = progress.write(f"\r[{next_index + len(pending)}/{len(jobs)}]")
+            progress.flush()
+
+    if progress is not None:
+        _ = progress.write("\n")
+
+
+# Checks all rendered patterns against a single load of the library and
+# appends the new ones to the patterns file in one write
+def add_patterns(results: list[JobResult], patterns_path: Path, index_path: Path | None = None) -> list[JobResult]:
+    rendered = [
+        (i, cast(BeatStudioPattern, r.pattern), cast(str, r.output))
+        for i, r in enumerate(results)
+        if r.status is JobStatus.RENDERED
+    ]
+    infos = PatternInfo.find_all(
+        patterns_path,
+        [pattern for _, pattern, _ in rendered],
+        index_path=index_path)
+
+    # Patterns added earlier in this batch
+    added: dict[str, BeatStudioPattern] = {}
+    outputs: list[str] = []
+    statuses: dict[int, JobStatus] = {}
+    for (i, pattern, output), info in zip(rendered, infos):
+        if info is None:
+            info = PatternInfo.classify(pattern, added.get(pattern.name.lower()))
+        match info:
+            case PatternInfo.IDENTICAL_PATTERN_DEFINED:
+                statuses[i] = JobStatus.IDENTICAL_PATTERN_DEFINED
+            case PatternInfo.PATTERN_NAME_IN_USE:
+                statuses[i] = JobStatus.PATTERN_NAME_IN_USE
+            case None:
+                statuses[i] = JobStatus.ADDED
+                added[pattern.name.lower()] = pattern
+                outputs.append(output)
+
+    if len(outputs) > 0:
+        with patterns_path.open("at") as f:
+            _ = f.write("".join(f"\n{output}" for output in outputs))
+
+    return [
+        replace(r, status=statuses[i]) if i in statuses else r
+        for i, r in enumerate(results)
+    ]
+
+
+def do_import_manifest(manifest_path: Path, defaults: Mapping[str, object], add: bool, worker_count: int | None = None) -> None:
+    import_jobs(load_manifest(manifest_path, defaults), add, worker_count)
+
+
+# Imports each MIDI file in a directory tree or matching a glob in path
+# order
+def do_import_paths(path: Path, defaults: Mapping[str, object], add: bool, worker_count: int | None = None) -> None:
+    paths = expand_midi_paths(path)
+    if len(paths) == 0:
+        raise UserError(f"No MIDI files found at {path}")
+
+    template = ImportJob.parse({"path": "."}, Path.cwd(), defaults)
+    import_jobs([replace(template, path=p) for p in paths], add, worker_count)
+
+
+# Patterns are written to stdout in job order as jobs complete and all
+# new patterns are added to the library at the end
+def import_jobs(jobs: list[ImportJob], add: bool, worker_count: int | None = None) -> None:
+    # Progress would be interleaved with patterns on a console
+    progress = sys.stderr if sys.stderr.isatty() and not sys.stdout.isatty() else None
+
+    results: list[JobResult] = []
+    for result in run_jobs(jobs, progress=progress, worker_count=worker_count):
+        if result.output is not None:
+            _ = sys.stdout.write(
+                f"{Fore.LIGHTYELLOW_EX}{result.output}{Style.RESET_ALL}\n")
+        results.append(result)
+
+    if add:
+        results = add_patterns(
+            results,
+            resolve_patterns_path(None),
+            index_path=default_library_index_path())
+
+    show_import_report(results)
+
+    failure_count = sum(1 for r in results if r.status is JobStatus.FAILED)
+    if failure_count > 0:
+        raise UserError(f"{failure_count} of {len(results)} import(s) failed")
+
+
+def show_import_report(results: list[JobResult]) -> None:
+    with Table(
+            ("Job", Fore.LIGHTYELLOW_EX, "{:>3}", Fore.LIGHTBLUE_EX),
+            ("File", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTCYAN_EX),
+            ("Region", Fore.LIGHTYELLOW_EX, "{:>6}", Fore.LIGHTCYAN_EX),
+            ("Status", Fore.LIGHTYELLOW_EX, "{}", Fore.WHITE),
+            column_sep="  ") as table:
+        for result in results:
+            table.add_row(
+                result.index + 1,
+                result.job.path.name,
+                "" if result.region_id is None else result.region_id,
+                result.status.value if result.error is None else f"{result.status.value}: {result.error}")
+        table.print()
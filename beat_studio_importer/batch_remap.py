@@ -0,0 +1,162 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.constants import DRUM_CHANNEL
+from beat_studio_importer.midi_transform import MidiTransform, transform_file
+from beat_studio_importer.parallel_util import bounded_map, default_worker_count, describe_error
+from beat_studio_importer.path_util import expand_midi_paths, multi_path_root
+from beat_studio_importer.user_error import UserError
+from dataclasses import dataclass, field
+from enum import Enum, auto, unique
+from pathlib import Path
+from time import perf_counter
+from typing import TextIO
+import os
+
+
+# Written to the output directory after a run without failures: holds
+# the digest of the transform that produced the files in it
+REMAP_STAMP_NAME: str = ".remap-transform"
+
+
+@unique
+class RemapStatus(Enum):
+    WRITTEN = auto()
+    # Output is newer than input and was made by the same transform
+    UP_TO_DATE = auto()
+    # Output already had the same content
+    UNCHANGED = auto()
+    FAILED = auto()
+
+
+@dataclass(frozen=True)
+class RemapResult:
+    path: Path
+    status: RemapStatus
+    size: int = 0
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class RemapSummary:
+    results: list[RemapResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def count(self, status: RemapStatus) -> int:
+        return sum(1 for r in self.results if r.status is status)
+
+    @property
+    def failures(self) -> list[RemapResult]:
+        return [r for r in self.results if r.status is RemapStatus.FAILED]
+
+    @property
+    def total_size(self) -> int:
+        return sum(r.size for r in self.results)
+
+
+# Module-level so that it can be pickled for worker processes: output
+# newer than its input is left alone without being read if use_mtime is
+# set, i.e. if it was made by the same transform
+def remap_job(job: tuple[Path, Path, MidiTransform, bool]) -> RemapResult:
+    path, output_path, transform, use_mtime = job
+    try:
+        input_stat = path.stat()
+        try:
+            output_stat = output_path.stat()
+        except FileNotFoundError:
+            output_stat = None
+
+        if use_mtime and output_stat is not None and output_stat.st_mtime_ns >= input_stat.st_mtime_ns:
+            return RemapResult(path=path, status=RemapStatus.UP_TO_DATE)
+
+        data = transform_file(path, transform)
+        if output_stat is not None and output_stat.st_size == len(data) and output_path.read_bytes() == data:
+            # Bring mtime up to date so the next run can skip the file
+            os.utime(output_path)
+            return RemapResult(
+                path=path,
+                status=RemapStatus.UNCHANGED,
+                size=input_stat.st_size)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("wb") as f:
+            _ = f.write(data)
+        return RemapResult(
+            path=path,
+            status=RemapStatus.WRITTEN,
+            size=input_stat.st_size)
+    except Exception as e:
+        return RemapResult(
+            path=path,
+            status=RemapStatus.FAILED,
+            error=describe_error(e))
+
+
+# Remaps every MIDI file in a directory tree or matching a glob into
+# output_dir, mirroring the directory structure below the input root
+def remap_corpus(path: Path, output_dir: Path, progress: TextIO | None, jobs: int | None = None, transform: MidiTransform = MidiTransform.channel(DRUM_CHANNEL)) -> RemapSummary:
+    if output_dir.exists() and not output_dir.is_dir():
+        raise UserError(f"Output path {output_dir} is not a directory")
+
+    # Previous output may lie within the input tree
+    resolved_output_dir = output_dir.resolve()
+    paths = [
+        p
+        for p in expand_midi_paths(path)
+        if not p.resolve().is_relative_to(resolved_output_dir)
+    ]
+    if len(paths) == 0:
+        raise UserError(f"No MIDI files found at {path}")
+
+    # Outputs of an earlier run with a different transform, or one that
+    # did not finish cleanly, must be rendered again to be checked
+    stamp_path = output_dir / REMAP_STAMP_NAME
+    try:
+        use_mtime = stamp_path.read_text().strip() == transform.digest
+    except FileNotFoundError:
+        use_mtime = False
+    stamp_path.unlink(missing_ok=True)
+
+    root = multi_path_root(path)
+    jobs_list = [
+        (p, output_dir / p.relative_to(root), transform, use_mtime)
+        for p in paths
+    ]
+    worker_count = min(jobs or default_worker_count(), len(paths))
+    total = len(paths)
+
+    results: list[RemapResult] = []
+    start = perf_counter()
+    for i, result in enumerate(bounded_map(remap_job, jobs_list, worker_count), 1):
+        results.append(result)
+        if progress is not None:
+            _ = progress.write(f"\r[{i}/{total}]")
+            progress.flush()
+
+    if progress is not None:
+        _ = progress.write("\n")
+
+    if all(r.status is not RemapStatus.FAILED for r in results):
+        output_dir.mkdir(parents=True, exist_ok=True)
+        _ = stamp_path.write_text(transform.digest + "\n")
+
+    return RemapSummary(results=results, elapsed=perf_counter() - start)
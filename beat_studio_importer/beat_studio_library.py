@@ -0,0 +1,117 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
+from beat_studio_importer.constants import PROGRAM_NAME
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+
+GENERATED_COMMENT_PREFIX: str = f"# Generated using {PROGRAM_NAME} "
+
+
+# One pattern from a patterns.beat file as raw lines (including line
+# endings) so that it can be written back out unchanged
+@dataclass(frozen=True)
+class LibraryEntry:
+    # Comment and blank lines preceding the header
+    leading_lines: list[str]
+    # Header followed by hit lines and any interleaved comment or blank
+    # lines: empty for comments at the end of the file
+    pattern_lines: list[str]
+
+    @property
+    def has_pattern(self) -> bool:
+        return len(self.pattern_lines) > 0
+
+    def read(self) -> BeatStudioPattern:
+        header, *lines = [
+            s for s in map(str.strip, self.pattern_lines)
+            if len(s) > 0 and not s.startswith("#")
+        ]
+        return BeatStudioPattern.read(header, lines)
+
+    def render(self, drop_generated_comments: bool = False) -> str:
+        if drop_generated_comments:
+            leading_lines = [
+                line
+                for block in comment_blocks(self.leading_lines)
+                if not is_generated_comment_block(block)
+                for line in block
+            ]
+        else:
+            leading_lines = self.leading_lines
+        return "".join(leading_lines) + "".join(self.pattern_lines)
+
+
+def read_library(lines: Iterable[str]) -> Iterator[LibraryEntry]:
+    leading_lines: list[str] = []
+    pattern_lines: list[str] = []
+    pending_lines: list[str] = []
+    for line in lines:
+        s = line.strip()
+        if len(s) == 0 or s.startswith("#"):
+            pending_lines.append(line)
+        elif s.startswith("[") and s.endswith("]"):
+            if len(pattern_lines) > 0:
+                yield LibraryEntry(
+                    leading_lines=leading_lines,
+                    pattern_lines=pattern_lines)
+                leading_lines = pending_lines
+            else:
+                leading_lines.extend(pending_lines)
+            pattern_lines = [line]
+            pending_lines = []
+        else:
+            if len(pattern_lines) == 0:
+                raise ValueError(f"Invalid pattern {s}: no header found")
+            pattern_lines.extend(pending_lines)
+            pattern_lines.append(line)
+            pending_lines = []
+
+    if len(pattern_lines) > 0:
+        yield LibraryEntry(
+            leading_lines=leading_lines,
+            pattern_lines=pattern_lines)
+        leading_lines = []
+    leading_lines.extend(pending_lines)
+    if len(leading_lines) > 0:
+        yield LibraryEntry(leading_lines=leading_lines, pattern_lines=[])
+
+
+# Splits lines into runs of comment lines and runs of blank lines
+def comment_blocks(lines: list[str]) -> list[list[str]]:
+    blocks: list[list[str]] = []
+    is_comment_block: bool | None = None
+    for line in lines:
+        is_comment = len(line.strip()) > 0
+        if is_comment != is_comment_block:
+            blocks.append([])
+            is_comment_block = is_comment
+        blocks[-1].append(line)
+    return blocks
+
+
+# Comment blocks written by import --add
+def is_generated_comment_block(lines: list[str]) -> bool:
+    return lines[0].startswith("# Pattern ") and \
+        any(line.startswith(GENERATED_COMMENT_PREFIX) for line in lines)
@@ -20,6 +20,8 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.enum_util import enum_index
+from collections.abc import Mapping
 from enum import Enum, auto, unique
 
 
@@ -49,10 +51,13 @@ class BeatStudioNoteName(Enum):
 
     @staticmethod
     def parse(s: str) -> "BeatStudioNoteName":
-        for member in BeatStudioNoteName:
-            if member.display == s:
-                return member
-        raise ValueError(f"Invalid Beat Studio note name {s}")
+        member = _MEMBERS_BY_DISPLAY.get(s)
+        if member is None:
+            raise ValueError(f"Invalid Beat Studio note name {s}")
+        return member
 
     @property
     def display(self) -> str: return self.value[1]
+
+
+_MEMBERS_BY_DISPLAY: Mapping[object, BeatStudioNoteName] = enum_index(BeatStudioNoteName, "display")
@@ -25,10 +25,21 @@ from beat_studio_importer.beat_studio_tempo import BeatStudioTempo
 from beat_studio_importer.beat_studio_velocity import BeatStudioVelocity
 from beat_studio_importer.constants import BEAT_STUDIO_DEFAULT_TIME_SIGNATURE
 from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.parallel_util import default_worker_count
 from beat_studio_importer.time_signature import Numerator, TimeSignature
+from bisect import bisect_left
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import cache, cached_property, partial
+from hashlib import blake2b
+from io import BytesIO, TextIOWrapper
+from mmap import ACCESS_READ, mmap
 from pathlib import Path
+from re import Pattern
 from typing import TYPE_CHECKING, Self
+import os
+import re
+import sys
 
 
 if TYPE_CHECKING:
@@ -38,6 +49,34 @@ if TYPE_CHECKING:
 type Hits = dict[BeatStudioNoteName, list[BeatStudioVelocity | None]]
 
 
+# Don't bother spawning worker processes for less than this much data
+# per chunk
+PARALLEL_LOAD_MIN_CHUNK_SIZE: int = 1 << 20
+
+# Start of any line recognized as a header by BeatStudioPattern.load
+HEADER_LINE_PATTERN: Pattern[bytes] = re.compile(
+    rb"^[ \t]*\[[^\n]*\][ \t\r]*$",
+    re.MULTILINE)
+
+# Well-formed header e.g. ["name" - 28 - 100 - 16 - 7/8]: headers not
+# matching this pattern go through the slower general parser
+HEADER_PATTERN: Pattern[str] = re.compile(
+    r"\[\"([^\"]*)\" *- *(\d+) *- *(\d+) *- *(\d+) *(?:- *(\d+) */ *(\d+) *)?\]",
+    re.ASCII)
+
+HIT_CHAR_VELOCITIES: dict[str, BeatStudioVelocity | None] = {
+    ".": None,
+    **{str(v): BeatStudioVelocity(v) for v in range(1, 10)}
+}
+
+HIT_CHAR_DELETIONS: dict[int, int | None] = str.maketrans(
+    "", "", "".join(HIT_CHAR_VELOCITIES.keys()))
+
+VELOCITY_CHARS: dict[BeatStudioVelocity | None, str] = {
+    v: c for c, v in HIT_CHAR_VELOCITIES.items()
+}
+
+
 @dataclass(frozen=True)
 class BeatStudioPattern:
     name: str
@@ -51,8 +90,42 @@ class BeatStudioPattern:
     @classmethod
     def load(cls: type[Self], path: Path) -> list[Self]:
         with path.open("rt") as f:
-            lines = f.readlines()
+            return cls.read_lines(f)
+
+    # Splits large files into chunks at header lines and parses the
+    # chunks in worker processes: patterns are returned in file order
+    # and errors are the same as for load
+    @classmethod
+    def load_parallel(cls: type[Self], path: Path, max_workers: int | None = None, min_chunk_size: int = PARALLEL_LOAD_MIN_CHUNK_SIZE) -> list[Self]:
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []
+            with mmap(f.fileno(), 0, access=ACCESS_READ) as m:
+                header_offsets = [
+                    match.start()
+                    for match in HEADER_LINE_PATTERN.finditer(m)
+                ]
 
+        worker_count = max_workers or default_worker_count()
+        chunk_count = min(worker_count * 4, size // min_chunk_size)
+        if chunk_count < 2 or worker_count < 2:
+            return cls.load(path)
+
+        # Imported here since multiprocessing is slow to import and only
+        # needed for large files
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = _split_chunks(header_offsets, size, chunk_count)
+        with ProcessPoolExecutor(max_workers=min(worker_count, len(chunks))) as executor:
+            return [
+                pattern
+                for patterns in executor.map(partial(_load_chunk, cls, path), chunks)
+                for pattern in patterns
+            ]
+
+    @classmethod
+    def read_lines(cls: type[Self], lines: Iterable[str]) -> list[Self]:
         patterns: list[Self] = []
         header: str | None = None
         pattern_lines: list[str] = []
@@ -93,9 +166,54 @@ class BeatStudioPattern:
 
     @classmethod
     def read(cls: type[Self], header: str, lines: list[str]) -> Self:
-        def translate_hit_char(c: str) -> BeatStudioVelocity | None:
-            return None if c == "." else BeatStudioVelocity(int(c))
+        m = HEADER_PATTERN.fullmatch(header)
+        if m is None:
+            name, step_count, tempo, quantum, time_signature = \
+                cls._read_header(header)
+        else:
+            name = m[1].replace("\\\"", "\"")
+            step_count = int(m[2])
+            tempo = BeatStudioTempo(int(m[3]))
+            quantum = NoteValue.from_int(int(m[4]))
+            if m[5] is None:
+                time_signature = BEAT_STUDIO_DEFAULT_TIME_SIGNATURE
+            else:
+                time_signature = TimeSignature(
+                    numerator=Numerator(int(m[5])),
+                    denominator=NoteValue.from_int(int(m[6])))
+
+        hits: Hits = {}
 
+        is_empty = True
+
+        for line in lines:
+            label, sep, s = line.partition(":")
+            if len(sep) == 0 or ":" in s:
+                raise ValueError(f"Invalid pattern {line}: invalid format")
+            note_name = BeatStudioNoteName.parse(label.strip())
+            s = s.strip()
+            if len(s) != step_count:
+                raise ValueError(f"Invalid pattern {line}: invalid step count")
+
+            if len(s.strip(".")) == 0:
+                hits[note_name] = [None] * step_count
+            else:
+                hits[note_name] = cls._decode_hits(s)
+                is_empty = False
+
+        return cls(
+            name=name,
+            tempo=tempo,
+            time_signature=time_signature,
+            quantum=quantum,
+            step_count=step_count,
+            hits=hits,
+            is_empty=is_empty)
+
+    # General header parser: handles unusual spacing and reports errors
+    # for headers not matched by HEADER_PATTERN
+    @staticmethod
+    def _read_header(header: str) -> tuple[str, int, BeatStudioTempo, NoteValue, TimeSignature]:
         if not header.startswith("[\"") or not header.endswith("]"):
             raise ValueError(f"Invalid header {header}: brackets not found")
 
@@ -133,44 +251,57 @@ class BeatStudioPattern:
         else:
             time_signature = BEAT_STUDIO_DEFAULT_TIME_SIGNATURE
 
-        hits: Hits = {}
-
-        is_empty = True
+        return name, step_count, tempo, quantum, time_signature
 
-        for line in lines:
-            parts = line.split(":")
-            if len(parts) != 2:
-                raise ValueError(f"Invalid pattern {line}: invalid format")
-            note_name = BeatStudioNoteName.parse(parts[0].strip())
-            s = parts[1].strip()
-            if len(s) != step_count:
-                raise ValueError(f"Invalid pattern {line}: invalid step count")
+    @staticmethod
+    def _decode_hits(s: str) -> list[BeatStudioVelocity | None]:
+        if len(s.translate(HIT_CHAR_DELETIONS)) > 0:
+            # Slow path: fails on the first invalid character
+            return [None if c == "." else BeatStudioVelocity(int(c)) for c in s]
+        return list(map(HIT_CHAR_VELOCITIES.__getitem__, s))
 
-            hits[note_name] = [translate_hit_char(c) for c in s]
-            is_empty = is_empty and len(s.strip(".")) == 0
+    # Digest of the pattern's content excluding its name: rest-only
+    # lines are ignored so that patterns listing different sets of
+    # drums compare equal if their hits are the same
+    @cached_property
+    def content_digest(self) -> str:
+        h = blake2b(digest_size=16)
+        h.update(
+            f"{self.step_count}-{self.tempo}-{self.quantum.int_value}-{self.time_signature}\n".encode())
+        for note_name, _ in _line_prefixes(frozenset(self.hits.keys())):
+            hits = self.hits[note_name]
+            if hits.count(None) != len(hits):
+                h.update(note_name.display.encode())
+                h.update(
+                    "".join(map(VELOCITY_CHARS.__getitem__, hits)).encode())
+                h.update(b"\n")
+        return h.hexdigest()
 
-        return cls(
-            name=name,
-            tempo=tempo,
-            time_signature=time_signature,
-            quantum=quantum,
-            step_count=step_count,
-            hits=hits,
-            is_empty=is_empty)
+    # Digest of the whole pattern including its name and rest-only lines:
+    # patterns are equal if and only if their digests are
+    @cached_property
+    def pattern_digest(self) -> str:
+        h = blake2b(self.render().encode(), digest_size=16)
+        h.update(b"empty" if self.is_empty else b"")
+        return h.hexdigest()
 
-    def print(self, file: "SupportsWrite[str] | None" = None) -> None:
-        print(self._make_header(), file=file)
-        temp = list(map(lambda n: (n, n.display), self.hits.keys()))
-        note_names = sorted(temp, key=lambda p: p[1])
-        width = max(map(lambda p: len(p[1]), temp))
-        for note_name, label in note_names:
+    def render(self) -> str:
+        lines = [self._make_header()]
+        for note_name, prefix in _line_prefixes(frozenset(self.hits.keys())):
             hits = self.hits[note_name]
-            hit_str = "".join(map(self.__class__._velocity_char, hits))
-            print(f"{label:<{width}}: {hit_str}", file=file)
+            if hits.count(None) == len(hits):
+                lines.append(prefix + "." * len(hits))
+            else:
+                lines.append(
+                    prefix + "".join(map(VELOCITY_CHARS.__getitem__, hits)))
+        lines.append("")
+        return "\n".join(lines)
 
-    @staticmethod
-    def _velocity_char(velocity: BeatStudioVelocity | None) -> str:
-        return "." if velocity is None else str(velocity)
+    def encode(self, encoding: str = "utf-8") -> bytes:
+        return self.render().encode(encoding)
+
+    def print(self, file: "SupportsWrite[str] | None" = None) -> None:
+        _ = (sys.stdout if file is None else file).write(self.render())
 
     def _make_header(self) -> str:
         if not all(map(lambda c: c.isprintable(), self.name)):
@@ -178,3 +309,35 @@ class BeatStudioPattern:
 
         encoded_name = self.name.replace("\"", "\\\"")
         return f"[\"{encoded_name}\" - {self.step_count} - {self.tempo} - {self.quantum.int_value} - {self.time_signature}]"
+
+
+# Note names sorted by label, each with its padded "LABEL: " prefix
+@cache
+def _line_prefixes(note_names: frozenset[BeatStudioNoteName]) -> tuple[tuple[BeatStudioNoteName, str], ...]:
+    if len(note_names) == 0:
+        return ()
+    width = max(len(n.display) for n in note_names)
+    return tuple(
+        (n, f"{n.display:<{width}}: ")
+        for n in sorted(note_names, key=lambda n: n.display))
+
+
+# Picks chunk boundaries from header offsets so that chunks are of
+# roughly equal size: the first chunk also includes anything before the
+# first header
+def _split_chunks(header_offsets: list[int], size: int, chunk_count: int) -> list[tuple[int, int]]:
+    boundaries = [0]
+    for i in range(1, chunk_count):
+        idx = bisect_left(header_offsets, i * size // chunk_count)
+        if idx < len(header_offsets) and header_offsets[idx] > boundaries[-1]:
+            boundaries.append(header_offsets[idx])
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _load_chunk[T: BeatStudioPattern](cls: type[T], path: Path, chunk: tuple[int, int]) -> list[T]:
+    start, end = chunk
+    with path.open("rb") as f:
+        _ = f.seek(start)
+        data = f.read(end - start)
+    return cls.read_lines(TextIOWrapper(BytesIO(data)))
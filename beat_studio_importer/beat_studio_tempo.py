@@ -20,7 +20,7 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
-from beat_studio_importer.tempos import MidiTempo, Qpm, midi_tempo_to_qpm
+from beat_studio_importer.tempos import MidiTempo, Qpm, midi_tempo_to_rounded_qpm
 from typing import Self
 
 
@@ -42,4 +42,4 @@ class BeatStudioTempo(int):
 
     @classmethod
     def from_midi_tempo(cls: type[Self], tempo: MidiTempo) -> Self:
-        return cls(round(midi_tempo_to_qpm(tempo)))
+        return cls(midi_tempo_to_rounded_qpm(tempo))
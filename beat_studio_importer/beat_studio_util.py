@@ -20,6 +20,7 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.user_error import UserError
 from os import getenv
 from pathlib import Path
 
@@ -35,3 +36,18 @@ def default_beat_studio_profile() -> tuple[Path, Path | None] | None:
 
     patterns_path = profile_dir / "patterns.beat"
     return profile_dir, patterns_path if patterns_path.is_file() else None
+
+
+def resolve_patterns_path(patterns_path: Path | None) -> Path:
+    if patterns_path is None:
+        profile = default_beat_studio_profile()
+        if profile is None:
+            raise UserError("Cannot find Beat Studio profile")
+
+        patterns_path = profile[1]
+        if patterns_path is None:
+            raise UserError("Cannot find Beat Studio patterns file")
+    elif not patterns_path.is_file():
+        raise UserError(f"Patterns file {patterns_path} not found")
+
+    return patterns_path
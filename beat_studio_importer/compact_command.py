@@ -0,0 +1,72 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_library import read_library
+from beat_studio_importer.beat_studio_util import resolve_patterns_path
+from beat_studio_importer.ui import print_key_value
+from beat_studio_importer.user_error import UserError
+from pathlib import Path
+from stat import S_IMODE
+from tempfile import NamedTemporaryFile
+import os
+
+
+def do_compact(path: Path | None, drop_generated_comments: bool) -> None:
+    path = resolve_patterns_path(path)
+
+    original_size = path.stat().st_size
+    pattern_count = 0
+    removed_pattern_count = 0
+    content_digests: set[str] = set()
+
+    # Write to a temporary file in the same directory and then replace
+    # the original so that the library is never left half-written
+    with path.open("rt") as f, NamedTemporaryFile("wt", dir=path.parent, prefix=f".{path.name}.", delete=False) as output:
+        try:
+            # read_library and entry.read both raise ValueError
+            try:
+                for entry in read_library(f):
+                    if entry.has_pattern:
+                        pattern = entry.read()
+                        pattern_count += 1
+                        if pattern.content_digest in content_digests:
+                            removed_pattern_count += 1
+                            continue
+                        content_digests.add(pattern.content_digest)
+
+                    _ = output.write(entry.render(
+                        drop_generated_comments=drop_generated_comments))
+            except ValueError as e:
+                raise UserError(f"Invalid pattern in {path}: {e}")
+        except BaseException:
+            output.close()
+            os.unlink(output.name)
+            raise
+
+    os.chmod(output.name, S_IMODE(path.stat().st_mode))
+    os.replace(output.name, path)
+    size = path.stat().st_size
+
+    print_key_value("Patterns file", path)
+    print_key_value("Patterns kept", pattern_count - removed_pattern_count)
+    print_key_value("Patterns removed", removed_pattern_count)
+    print_key_value("Bytes removed", original_size - size)
@@ -0,0 +1,148 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from io import TextIOBase
+from typing import TYPE_CHECKING, TextIO
+import os
+import re
+import sys
+
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsFlush
+
+
+# Disables colour when set to a non-empty value (https://no-color.org)
+NO_COLOR_ENV_VAR: str = "NO_COLOR"
+
+# Characters of plain output held before writing to the underlying stream
+PLAIN_BUFFER_SIZE: int = 1 << 16
+
+ANSI_ESCAPE_RE: re.Pattern[str] = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+_colour_override: bool | None = None
+
+
+# Plain text writer: buffers writes and removes ANSI escape codes from
+# each batch in a single pass so that colour codes and many small
+# writes cost next to nothing when output is redirected: flush_first is
+# flushed before each batch to keep the order of interleaved streams
+class PlainWriter(TextIOBase):
+    def __init__(self, stream: TextIO, buffer_size: int = PLAIN_BUFFER_SIZE, flush_first: "SupportsFlush | None" = None) -> None:
+        super().__init__()
+        self._stream: TextIO = stream
+        self._buffer_size: int = buffer_size
+        self._flush_first: "SupportsFlush | None" = flush_first
+        self._chunks: list[str] = []
+        self._size: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._stream.isatty()
+
+    def write(self, s: str) -> int:
+        self._chunks.append(s)
+        self._size += len(s)
+        if self._size >= self._buffer_size:
+            self.flush()
+        return len(s)
+
+    # Leaves the underlying stream open
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+    # Does nothing once the underlying stream is closed, as it may be by
+    # the time the writer is finalised
+    def flush(self) -> None:
+        if self._stream.closed:
+            return
+        if len(self._chunks) > 0:
+            if self._flush_first is not None:
+                self._flush_first.flush()
+            _ = self._stream.write(ANSI_ESCAPE_RE.sub("", "".join(self._chunks)))
+            self._chunks.clear()
+            self._size = 0
+        self._stream.flush()
+
+
+# Output to a plain writer can skip colour codes and be written in one
+# piece instead of value by value
+def is_plain(stream: object) -> bool:
+    return isinstance(stream, PlainWriter)
+
+
+# Colour is used on terminals unless disabled by NO_COLOR or overridden
+# by colour_override
+def colour_enabled(stream: TextIO | TextIOBase) -> bool:
+    if is_plain(stream):
+        return False
+    if _colour_override is not None:
+        return _colour_override
+    if len(os.getenv(NO_COLOR_ENV_VAR, "")) > 0:
+        return False
+    return stream.isatty()
+
+
+# Makes colour_enabled return the given value: used by the import
+# server to colour output captured for a client's terminal
+@contextmanager
+def colour_override(colour: bool | None) -> Iterator[None]:
+    global _colour_override
+    saved = _colour_override
+    _colour_override = colour
+    try:
+        yield
+    finally:
+        _colour_override = saved
+
+
+# Replaces stdout and stderr with plain writers unless colour is
+# requested or detected: stdout is buffered while stderr is written
+# through so that errors and progress appear immediately
+@contextmanager
+def console_output(colour: bool | None = None) -> Iterator[None]:
+    saved_stdout = sys.stdout
+    saved_stderr = sys.stderr
+    stdout = None if colour or colour is None and colour_enabled(saved_stdout) else PlainWriter(saved_stdout)
+    stderr = None if colour or colour is None and colour_enabled(saved_stderr) else PlainWriter(
+        saved_stderr,
+        buffer_size=0,
+        flush_first=sys.stdout if stdout is None else stdout)
+    if stdout is not None:
+        sys.stdout = stdout
+    if stderr is not None:
+        sys.stderr = stderr
+    try:
+        # Commands that check colour_enabled follow an explicit choice
+        with colour_override(_colour_override if colour is None else colour):
+            yield
+    finally:
+        sys.stdout = saved_stdout
+        sys.stderr = saved_stderr
+        if stdout is not None:
+            stdout.flush()
@@ -20,6 +20,7 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.misc import MidiChannel
 from beat_studio_importer.note_value import NoteValue
 from beat_studio_importer.time_signature import Numerator, TimeSignature
 
@@ -28,6 +29,13 @@ PROGRAM_NAME: str = "beat-studio-importer"
 
 PROGRAM_URL: str = "https://github.com/rcook/beat-studio-importer"
 
+# General MIDI percussion channel
+DRUM_CHANNEL: MidiChannel = MidiChannel(10)
+
+# Name of built-in output port that records messages instead of playing
+# them: "virtual:PATH" also writes the recording to a file on close
+VIRTUAL_PORT_NAME: str = "virtual"
+
 BEAT_STUDIO_STEP_COUNT_MIN: int = 4
 BEAT_STUDIO_STEP_COUNT_MAX: int = 8192
 
@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.meta_scan import MetaScan
+from beat_studio_importer.midi_util import MidiFileSummary
+from beat_studio_importer.output_format import SummaryFormat
+from beat_studio_importer.parallel_util import bounded_map, default_worker_count, describe_error
+from beat_studio_importer.path_util import expand_midi_paths, multi_path_root
+from beat_studio_importer.table import Table
+from beat_studio_importer.user_error import UserError
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, fields, replace
+from mido import MidiFile
+from pathlib import Path
+from typing import Self, TextIO
+import csv
+import json
+
+
+# Rows of a table summary that fix its column widths before it streams
+TABLE_SAMPLE_SIZE: int = 100
+
+
+# One row of a corpus scan: error is set, and all other fields except
+# path are empty, if the file could not be read
+@dataclass(frozen=True)
+class FileScanResult:
+    path: str
+    error: str | None = None
+    ticks_per_beat: int | None = None
+    track_count: int | None = None
+    channels: str | None = None
+    message_count: int | None = None
+    note_count: int | None = None
+    region_count: int | None = None
+    tempos: str | None = None
+    time_signatures: str | None = None
+
+    @classmethod
+    def scan(cls: type[Self], path: Path) -> Self:
+        try:
+            file = MidiFile(path)
+            summary = MidiFileSummary.build(file)
+            regions = MetaScan.load(path).regions
+        except Exception as e:
+            return cls(path=str(path), error=describe_error(e))
+
+        return cls(
+            path=str(path),
+            ticks_per_beat=summary.ticks_per_beat,
+            track_count=len(summary.track_names),
+            channels=" ".join(str(c) for c in summary.channels),
+            message_count=sum(summary.message_counts.values()),
+            note_count=summary.message_counts.get("note_on", 0),
+            region_count=len(regions),
+            tempos=" ".join(
+                dict.fromkeys(f"{r.qpm:.1f}" for r in regions)),
+            time_signatures=" ".join(
+                dict.fromkeys(str(r.time_signature) for r in regions)))
+
+
+# Module-level so that it can be pickled for worker processes
+def scan_file(path: Path) -> FileScanResult:
+    return FileScanResult.scan(path)
+
+
+def scan_corpus(path: Path, summary_format: SummaryFormat, out: TextIO, progress: TextIO | None, jobs: int | None = None) -> int:
+    paths = expand_midi_paths(path)
+    if len(paths) == 0:
+        raise UserError(f"No MIDI files found at {path}")
+
+    root = multi_path_root(path)
+    worker_count = min(jobs or default_worker_count(), len(paths))
+    total = len(paths)
+    error_count = 0
+
+    write_row, finish = _row_writer(summary_format, out)
+    for i, result in enumerate(bounded_map(scan_file, paths, worker_count), 1):
+        if result.error is not None:
+            error_count += 1
+
+        p = Path(result.path)
+        if p.is_relative_to(root):
+            result = replace(result, path=str(p.relative_to(root)))
+        write_row(result)
+
+        if progress is not None:
+            _ = progress.write(f"\r[{i}/{total}] {error_count} error(s)")
+            progress.flush()
+
+    finish()
+    if progress is not None:
+        _ = progress.write("\n")
+
+    return error_count
+
+
+# Returns functions that write one row and finish the output
+def _row_writer(summary_format: SummaryFormat, out: TextIO) -> tuple[Callable[[FileScanResult], None], Callable[[], None]]:
+    match summary_format:
+        case SummaryFormat.CSV:
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(f.name for f in fields(FileScanResult))
+
+            def write_csv(result: FileScanResult) -> None:
+                writer.writerow(
+                    "" if value is None else value
+                    for value in asdict(result).values())
+            return write_csv, lambda: None
+        case SummaryFormat.JSONL:
+            def write_jsonl(result: FileScanResult) -> None:
+                _ = out.write(json.dumps(asdict(result)) + "\n")
+            return write_jsonl, lambda: None
+        case SummaryFormat.TABLE:
+            table = Table(
+                *(f.name for f in fields(FileScanResult)),
+                column_sep="  ",
+                sample_size=TABLE_SAMPLE_SIZE,
+                file=out)
+
+            def write_table(result: FileScanResult) -> None:
+                table.add_row(*(
+                    "" if value is None else value
+                    for value in asdict(result).values()))
+            return write_table, table.print
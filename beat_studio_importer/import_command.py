@@ -23,43 +23,80 @@
 from beat_studio_importer.arg_summary import ArgSummary
 from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
 from beat_studio_importer.beat_studio_tempo import BEAT_STUDIO_TEMPO_MAX, BEAT_STUDIO_TEMPO_MIN, BeatStudioTempo
-from beat_studio_importer.beat_studio_util import default_beat_studio_profile
+from beat_studio_importer.beat_studio_util import resolve_patterns_path
 from beat_studio_importer.constants import BEAT_STUDIO_STEP_COUNT_MAX, BEAT_STUDIO_STEP_COUNT_MIN, PROGRAM_NAME, PROGRAM_URL
+from beat_studio_importer.library_index import LibraryIndex, default_library_index_path
 from beat_studio_importer.midi_note_name_map import DEFAULT_MIDI_NOTE_NAME_MAP, MidiNoteNameMap
 from beat_studio_importer.midi_util import summarize_midi_file
 from beat_studio_importer.misc import MidiChannel, RegionId
 from beat_studio_importer.note_value import NoteValue
 from beat_studio_importer.region import Region
-from beat_studio_importer.tempos import midi_tempo_to_qpm
+from beat_studio_importer.tempos import is_qpm_in_range
 from beat_studio_importer.timeline import Timeline
 from beat_studio_importer.ui import cprint, select_region
 from beat_studio_importer.user_error import UserError
 from colorama import Fore, Style
 from datetime import datetime, timezone
 from enum import Enum, auto, unique
+from functools import lru_cache
 from mido import MidiFile
 from pathlib import Path
 from typing import TYPE_CHECKING
+import sys
 
 
 if TYPE_CHECKING:
     from _typeshed import SupportsWrite
 
 
+# Number of parsed MIDI files kept in memory
+TIMELINE_CACHE_SIZE: int = 64
+
+
 @unique
 class PatternInfo(Enum):
     IDENTICAL_PATTERN_DEFINED = auto()
     PATTERN_NAME_IN_USE = auto()
 
+    # Uses the library index at index_path, if it exists, instead of
+    # parsing the whole patterns file
+    @staticmethod
+    def find_existing(patterns_path: Path, pattern: BeatStudioPattern, index_path: Path | None = None) -> "PatternInfo | None":
+        return PatternInfo.find_all(patterns_path, [pattern], index_path=index_path)[0]
+
+    # Checks each pattern against a single sync of the library index or
+    # parse of the patterns file: both compare with the first pattern
+    # with the same case-insensitive name using full pattern equality
+    @staticmethod
+    def find_all(patterns_path: Path, patterns: list[BeatStudioPattern], index_path: Path | None = None) -> "list[PatternInfo | None]":
+        if index_path is not None and index_path.is_file():
+            with LibraryIndex(index_path) as index:
+                _ = index.sync(patterns_path)
+                matches = [index.find_by_name(p.name) for p in patterns]
+            return [
+                None if len(m) == 0
+                else PatternInfo.IDENTICAL_PATTERN_DEFINED
+                if m[0].pattern_digest == p.pattern_digest
+                else PatternInfo.PATTERN_NAME_IN_USE
+                for p, m in zip(patterns, matches)
+            ]
+
+        # First pattern in the file with each name
+        existing: dict[str, BeatStudioPattern] = {}
+        for p in BeatStudioPattern.load_parallel(patterns_path):
+            _ = existing.setdefault(p.name.lower(), p)
+        return [
+            PatternInfo.classify(p, existing.get(p.name.lower()))
+            for p in patterns
+        ]
+
     @staticmethod
-    def find_existing(patterns_path: Path, pattern: BeatStudioPattern) -> "PatternInfo | None":
-        patterns = BeatStudioPattern.load(patterns_path)
-        for p in patterns:
-            if pattern == p:
-                return PatternInfo.IDENTICAL_PATTERN_DEFINED
-            if pattern.name.lower() == p.name.lower():
-                return PatternInfo.PATTERN_NAME_IN_USE
-        return None
+    def classify(pattern: BeatStudioPattern, existing: BeatStudioPattern | None) -> "PatternInfo | None":
+        if existing is None:
+            return None
+        if existing == pattern:
+            return PatternInfo.IDENTICAL_PATTERN_DEFINED
+        return PatternInfo.PATTERN_NAME_IN_USE
 
 
 def do_import(
@@ -67,6 +104,7 @@ def do_import(
         note_name_map: MidiNoteNameMap | None,
         channel: MidiChannel | None,
         region_id: RegionId | None,
+        at_seconds: float | None,
         quantum: NoteValue, name: str | None,
         override_tempo: BeatStudioTempo | None,
         repeat: int | None,
@@ -77,10 +115,9 @@ def do_import(
     if not path.is_file():
         raise UserError(f"Input file {path} not found")
 
-    file = MidiFile(path)
+    file, timeline = load_timeline(path, channel)
     summarize_midi_file(file)
 
-    timeline = Timeline.build(file, channel=channel)
     regions = Region.build_all(
         timeline,
         discard_boundary_hits=discard_boundary_hits)
@@ -104,7 +141,15 @@ def do_import(
                 add=add,
                 args=args.append("region", str(region.id)))
     else:
-        region = select_region(path, regions, region_id)
+        if at_seconds is None:
+            region = select_region(path, regions, region_id)
+        else:
+            temp = Region.find(
+                regions,
+                timeline.tempo_map.seconds_to_tick(at_seconds))
+            if temp is None:
+                raise UserError(f"No region at {at_seconds} seconds")
+            region = temp
         import_region(
             region=region,
             name=name or path.stem,
@@ -116,26 +161,27 @@ def do_import(
             args=args)
 
 
-def import_region(region: Region, name: str, note_name_map: MidiNoteNameMap, quantum: NoteValue,  override_tempo: BeatStudioTempo | None, repeat: int | None, add: bool, args: ArgSummary) -> None:
-    if override_tempo is None:
-        qpm = midi_tempo_to_qpm(region.tempo)
-        if not (BEAT_STUDIO_TEMPO_MIN <= qpm <= BEAT_STUDIO_TEMPO_MAX):
-            raise UserError(
-                f"Tempo {qpm} is outside allowed range ({BEAT_STUDIO_TEMPO_MIN}, {BEAT_STUDIO_TEMPO_MAX})")
-        tempo = BeatStudioTempo.from_qpm(qpm)
-    else:
-        tempo = override_tempo
+# Parsed files are cached by path, modification time and size so that
+# the import server only parses each version of a file once
+def load_timeline(path: Path, channel: MidiChannel | None) -> tuple[MidiFile, Timeline]:
+    st = path.stat()
+    return _load_timeline(path, st.st_mtime_ns, st.st_size, channel)
 
-    pattern = region.render(
-        name,
-        note_name_map,
-        quantum,
-        tempo=tempo,
-        repeat=repeat)
 
-    if not (BEAT_STUDIO_STEP_COUNT_MIN <= pattern.step_count <= BEAT_STUDIO_STEP_COUNT_MAX):
-        raise UserError(
-            f"Number of steps {pattern.step_count} is outside allowed range ({BEAT_STUDIO_STEP_COUNT_MIN}, {BEAT_STUDIO_STEP_COUNT_MAX}): use a shorter pattern or specify repetitions using --repeat")
+@lru_cache(maxsize=TIMELINE_CACHE_SIZE)
+def _load_timeline(path: Path, mtime_ns: int, size: int, channel: MidiChannel | None) -> tuple[MidiFile, Timeline]:
+    file = MidiFile(path)
+    return file, Timeline.build(file, channel=channel)
+
+
+def import_region(region: Region, name: str, note_name_map: MidiNoteNameMap, quantum: NoteValue,  override_tempo: BeatStudioTempo | None, repeat: int | None, add: bool, args: ArgSummary) -> None:
+    pattern = build_pattern(
+        region=region,
+        name=name,
+        note_name_map=note_name_map,
+        quantum=quantum,
+        override_tempo=override_tempo,
+        repeat=repeat)
 
     if pattern.is_empty:
         cprint(
@@ -143,20 +189,13 @@ def import_region(region: Region, name: str, note_name_map: MidiNoteNameMap, qua
             f"Skipping empty pattern in region {region.id}")
         return
 
-    print(Fore.LIGHTYELLOW_EX, end="")
-    write_pattern_output(pattern, region, args)
-    print(Style.RESET_ALL)
+    output = render_pattern_output(pattern, region, args)
+    _ = sys.stdout.write(f"{Fore.LIGHTYELLOW_EX}{output}{Style.RESET_ALL}\n")
 
     if add:
-        profile = default_beat_studio_profile()
-        if profile is None:
-            raise UserError("Cannot find Beat Studio profile")
+        patterns_path = resolve_patterns_path(None)
 
-        patterns_path = profile[1]
-        if patterns_path is None:
-            raise UserError("Cannot find Beat Studio patterns file")
-
-        match PatternInfo.find_existing(patterns_path, pattern):
+        match PatternInfo.find_existing(patterns_path, pattern, index_path=default_library_index_path()):
             case PatternInfo.IDENTICAL_PATTERN_DEFINED:
                 print(
                     Fore.WHITE,
@@ -183,8 +222,7 @@ def import_region(region: Region, name: str, note_name_map: MidiNoteNameMap, qua
                     sep="")
             case None:
                 with patterns_path.open("at") as f:
-                    print(file=f)
-                    write_pattern_output(pattern, region, args, file=f)
+                    _ = f.write(f"\n{output}")
                 print(
                     Fore.WHITE,
                     "Pattern ",
@@ -198,10 +236,37 @@ def import_region(region: Region, name: str, note_name_map: MidiNoteNameMap, qua
                     sep="")
 
 
+def build_pattern(region: Region, name: str, note_name_map: MidiNoteNameMap, quantum: NoteValue, override_tempo: BeatStudioTempo | None, repeat: int | None) -> BeatStudioPattern:
+    if override_tempo is None:
+        if not is_qpm_in_range(region.tempo, BEAT_STUDIO_TEMPO_MIN, BEAT_STUDIO_TEMPO_MAX):
+            raise UserError(
+                f"Tempo {region.qpm} is outside allowed range ({BEAT_STUDIO_TEMPO_MIN}, {BEAT_STUDIO_TEMPO_MAX})")
+        tempo = BeatStudioTempo.from_midi_tempo(region.tempo)
+    else:
+        tempo = override_tempo
+
+    pattern = region.render(
+        name,
+        note_name_map,
+        quantum,
+        tempo=tempo,
+        repeat=repeat)
+
+    if not (BEAT_STUDIO_STEP_COUNT_MIN <= pattern.step_count <= BEAT_STUDIO_STEP_COUNT_MAX):
+        raise UserError(
+            f"Number of steps {pattern.step_count} is outside allowed range ({BEAT_STUDIO_STEP_COUNT_MIN}, {BEAT_STUDIO_STEP_COUNT_MAX}): use a shorter pattern or specify repetitions using --repeat")
+
+    return pattern
+
+
 def write_pattern_output(pattern: BeatStudioPattern, region: Region, args: ArgSummary, file: "SupportsWrite[str]|None" = None) -> None:
-    for line in summarize_pattern(pattern, region, args):
-        print(line, file=file)
-    pattern.print(file=file)
+    output = render_pattern_output(pattern, region, args)
+    _ = (sys.stdout if file is None else file).write(output)
+
+
+def render_pattern_output(pattern: BeatStudioPattern, region: Region, args: ArgSummary) -> str:
+    comments = summarize_pattern(pattern, region, args)
+    return "".join(f"{line}\n" for line in comments) + pattern.render()
 
 
 def summarize_pattern(pattern: BeatStudioPattern, region: Region, args: ArgSummary) -> list[str]:
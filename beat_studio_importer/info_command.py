@@ -22,18 +22,68 @@
 
 from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
 from beat_studio_importer.beat_studio_util import default_beat_studio_profile
+from beat_studio_importer.console import colour_enabled
+from beat_studio_importer.corpus_scan import scan_corpus
+from beat_studio_importer.meta_scan import MetaScan
 from beat_studio_importer.midi_util import summarize_midi_file
-from beat_studio_importer.region import Region
+from beat_studio_importer.output_format import DumpFormat, SummaryFormat
+from beat_studio_importer.path_util import is_multi_path
 from beat_studio_importer.table import Table
-from beat_studio_importer.timeline import Timeline
 from beat_studio_importer.ui import cprint, print_key_value
 from beat_studio_importer.user_error import UserError
-from colorama import Fore
+from colorama import Fore, Style
 from mido import MidiFile
 from pathlib import Path
+from typing import TextIO, cast
+import json
+import sys
+
+
+# Number of dumped messages to write at a time
+DUMP_BATCH_SIZE: int = 4096
+
+
+def do_info(path: Path | None, dump: bool, exclude: list[str] | None, dump_format: DumpFormat = DumpFormat.TEXT, summary_format: SummaryFormat = SummaryFormat.CSV, output_path: Path | None = None, jobs: int | None = None) -> None:
+    # Directories and globs produce a machine-readable summary of each
+    # MIDI file instead of the usual console output
+    if path is not None and is_multi_path(path):
+        if dump:
+            raise UserError("Cannot dump MIDI events for multiple files")
+        progress = sys.stderr if sys.stderr.isatty() else None
+        if output_path is None:
+            error_count = scan_corpus(
+                path=path,
+                summary_format=summary_format,
+                out=sys.stdout,
+                progress=progress,
+                jobs=jobs)
+        else:
+            with output_path.open("wt", newline="") as f:
+                error_count = scan_corpus(
+                    path=path,
+                    summary_format=summary_format,
+                    out=f,
+                    progress=progress,
+                    jobs=jobs)
+        if error_count > 0:
+            print(f"Failed to read {error_count} file(s)", file=sys.stderr)
+        return
+
+    # JSONL output consists only of messages so that it can be piped
+    # into other tools
+    if dump and dump_format is DumpFormat.JSONL:
+        if path is None:
+            raise UserError("Path is required for JSONL dump")
+        if not path.is_file():
+            raise UserError(f"Input file {path} not found")
+        dump_messages(
+            MidiFile(path),
+            exclude=frozenset(exclude or ()),
+            dump_format=dump_format,
+            out=sys.stdout,
+            colour=False)
+        return
 
-
-def do_info(path: Path | None, dump: bool, exclude: list[str] | None) -> None:
     show_beat_studio_info()
 
     if path is not None:
@@ -51,7 +101,7 @@ def show_beat_studio_info() -> None:
         if patterns_path is not None:
             print_key_value("Beat Studio patterns file", patterns_path)
 
-            patterns = BeatStudioPattern.load(patterns_path)
+            patterns = BeatStudioPattern.load_parallel(patterns_path)
             if len(patterns) > 0:
                 cprint(Fore.LIGHTBLUE_EX, "Available patterns:")
                 for pattern in sorted(patterns, key=lambda p: p.name):
@@ -67,12 +117,17 @@ def show_file_info(path: Path, dump: bool, exclude: list[str] | None) -> None:
     file = MidiFile(path)
     summarize_midi_file(file)
 
-    timeline = Timeline.build(file)
-    regions = Region.build_all(timeline)
-    for region in regions:
+    # Notes are not needed to describe the regions
+    scan = MetaScan.load(path)
+    tempo_map = scan.tempo_map
+    for region in scan.regions:
+        start_time = tempo_map.tick_to_seconds(region.start_tick)
+        end_time = tempo_map.tick_to_seconds(region.end_tick)
         print()
         cprint(Fore.LIGHTYELLOW_EX, f"Region {region.id}")
         with Table((None, None, "{}", Fore.LIGHTBLUE_EX), (None, None, "{}", Fore.LIGHTCYAN_EX), column_sep="  ") as table:
+            table.add_row("Start time (seconds)", f"{start_time:.3f}")
+            table.add_row("Duration (seconds)", f"{end_time - start_time:.3f}")
             table.add_row("MIDI tempo", region.tempo)
             table.add_row("Time signature", region.time_signature)
             table.add_row(
@@ -86,18 +141,39 @@ def show_file_info(path: Path, dump: bool, exclude: list[str] | None) -> None:
     if dump:
         print()
         cprint(Fore.LIGHTYELLOW_EX, f"MIDI messages")
+        sys.stdout.flush()
+        dump_messages(
+            file,
+            exclude=frozenset(exclude or ()),
+            dump_format=DumpFormat.TEXT,
+            out=sys.stdout,
+            colour=colour_enabled(sys.stdout))
+
+
+def dump_messages(file: MidiFile, exclude: frozenset[str], dump_format: DumpFormat, out: TextIO, colour: bool) -> None:
+    if colour:
+        line_format = f"{Fore.LIGHTBLUE_EX}  {{:<10}}  {Fore.LIGHTCYAN_EX}{{}}{Style.RESET_ALL}\n"
+    else:
+        line_format = "  {:<10}  {}\n"
+
+    lines: list[str] = []
+    time = 0.0
+    for message in file:  # yields messages with delta time in seconds
+        time += message.time
+
+        if message.type in exclude:
+            continue
 
-        time = 0.0
-        for message in file:  # yields messages with absolute time
-            time += message.time
+        match dump_format:
+            case DumpFormat.TEXT:
+                lines.append(line_format.format(time, message))
+            case DumpFormat.JSONL:
+                obj = cast(dict[str, object], message.dict())
+                obj["time"] = time
+                lines.append(json.dumps(obj, default=str) + "\n")
 
-            if exclude is not None and message.type in exclude:
-                continue
+        if len(lines) >= DUMP_BATCH_SIZE:
+            _ = out.write("".join(lines))
+            lines.clear()
 
-            cprint(
-                Fore.LIGHTBLUE_EX,
-                "  ",
-                f"{time:<10}",
-                "  ",
-                Fore.LIGHTCYAN_EX,
-                message)
+    _ = out.write("".join(lines))
@@ -0,0 +1,80 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_util import resolve_patterns_path
+from beat_studio_importer.library_index import LibraryIndex
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.table import Table
+from beat_studio_importer.time_signature import TimeSignature
+from beat_studio_importer.ui import cprint, print_key_value
+from beat_studio_importer.user_error import UserError
+from colorama import Fore
+from pathlib import Path
+
+
+def do_library_sync(patterns_path: Path | None, index_path: Path) -> None:
+    patterns_path = resolve_patterns_path(patterns_path)
+    with LibraryIndex(index_path) as index:
+        try:
+            result = index.sync(patterns_path)
+        except ValueError as e:
+            raise UserError(f"Invalid pattern in {patterns_path}: {e}")
+
+    print_key_value("Patterns file", patterns_path)
+    print_key_value("Library index", index_path)
+    if result.rebuilt:
+        cprint(Fore.LIGHTBLUE_EX, "Rebuilt library index")
+    print_key_value("Patterns added", result.added_count)
+    print_key_value("Patterns indexed", result.pattern_count)
+
+
+def do_library_query(index_path: Path, name: str | None, time_signature: TimeSignature | None, min_tempo: int | None, max_tempo: int | None, min_step_count: int | None, max_step_count: int | None, quantum: NoteValue | None) -> None:
+    if not index_path.is_file():
+        raise UserError(
+            f"Library index {index_path} not found: run \"library sync\" first")
+
+    with LibraryIndex(index_path) as index:
+        patterns = index.query(
+            name=name,
+            time_signature=time_signature,
+            min_tempo=min_tempo,
+            max_tempo=max_tempo,
+            min_step_count=min_step_count,
+            max_step_count=max_step_count,
+            quantum=quantum)
+
+    with Table(
+            ("Name", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTCYAN_EX),
+            ("Steps", Fore.LIGHTYELLOW_EX, "{:>5}", Fore.LIGHTBLUE_EX),
+            ("Tempo", Fore.LIGHTYELLOW_EX, "{:>5}", Fore.LIGHTBLUE_EX),
+            ("Quantum", Fore.LIGHTYELLOW_EX, "{:>7}", Fore.LIGHTBLUE_EX),
+            ("Time signature", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTBLUE_EX),
+            column_sep="  ") as table:
+        for p in patterns:
+            table.add_row(
+                p.name,
+                p.step_count,
+                p.tempo,
+                p.quantum,
+                p.time_signature)
+        table.print()
+
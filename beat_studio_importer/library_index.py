@@ -0,0 +1,348 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_library import read_library
+from beat_studio_importer.beat_studio_note_name import BeatStudioNoteName
+from beat_studio_importer.beat_studio_pattern import BeatStudioPattern, Hits
+from beat_studio_importer.beat_studio_tempo import BeatStudioTempo
+from beat_studio_importer.beat_studio_velocity import BeatStudioVelocity
+from beat_studio_importer.cache_util import default_cache_dir
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.time_signature import Numerator, TimeSignature
+from dataclasses import dataclass
+from hashlib import blake2b
+from io import StringIO
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Self, cast
+import locale
+import sqlite3
+
+
+SCHEMA_VERSION: str = "2"
+
+META_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)"""
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS patterns (
+    position INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL,
+    pattern_digest TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    step_count INTEGER NOT NULL,
+    tempo INTEGER NOT NULL,
+    quantum INTEGER NOT NULL,
+    numerator INTEGER NOT NULL,
+    denominator INTEGER NOT NULL,
+    hits BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patterns_digest ON patterns (digest);
+CREATE INDEX IF NOT EXISTS patterns_name_key ON patterns (name_key);
+CREATE INDEX IF NOT EXISTS patterns_tempo ON patterns (tempo);
+CREATE INDEX IF NOT EXISTS patterns_time_signature ON patterns (numerator, denominator);
+CREATE INDEX IF NOT EXISTS patterns_quantum ON patterns (quantum);
+CREATE INDEX IF NOT EXISTS patterns_step_count ON patterns (step_count);
+"""
+
+PATTERN_COLUMNS: str = "position, digest, pattern_digest, name, step_count, tempo, quantum, numerator, denominator, hits"
+
+# Order of drum lines in packed hits
+NOTE_NAMES: list[BeatStudioNoteName] = list(BeatStudioNoteName)
+
+VELOCITIES: list[BeatStudioVelocity | None] = [
+    None,
+    *(BeatStudioVelocity(v) for v in range(1, 10))
+]
+
+CHUNK_SIZE: int = 1 << 20
+
+
+def default_library_index_path() -> Path:
+    return default_cache_dir() / "library.sqlite3"
+
+
+# Packs hits as one byte per step per drum with 0 for rests
+def pack_hits(step_count: int, hits: Hits) -> bytes:
+    rests = bytes(step_count)
+    return b"".join(
+        rests
+        if (h := hits.get(note_name)) is None
+        else bytes(0 if v is None else v for v in h)
+        for note_name in NOTE_NAMES)
+
+
+def unpack_hits(step_count: int, data: bytes) -> Hits:
+    return {
+        note_name: list(map(
+            VELOCITIES.__getitem__,
+            data[i * step_count:(i + 1) * step_count]))
+        for i, note_name in enumerate(NOTE_NAMES)
+    }
+
+
+@dataclass(frozen=True)
+class IndexedPattern:
+    position: int
+    digest: str
+    pattern_digest: str
+    name: str
+    step_count: int
+    tempo: int
+    quantum: int
+    time_signature: TimeSignature
+    hits: bytes
+
+    def to_pattern(self) -> BeatStudioPattern:
+        hits = unpack_hits(self.step_count, self.hits)
+        return BeatStudioPattern(
+            name=self.name,
+            tempo=BeatStudioTempo(self.tempo),
+            time_signature=self.time_signature,
+            quantum=NoteValue.from_int(self.quantum),
+            step_count=self.step_count,
+            hits=hits,
+            is_empty=not any(self.hits))
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    added_count: int
+    pattern_count: int
+    rebuilt: bool
+
+
+# SQLite mirror of a patterns.beat file: sync parses only what has been
+# appended since the last sync as long as the previously synced bytes
+# are unchanged, otherwise it rebuilds the mirror from scratch
+class LibraryIndex:
+    def __init__(self, path: Path) -> None:
+        self._path: Path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: sqlite3.Connection = sqlite3.connect(path)
+        with self._connection:
+            _ = self._connection.execute(META_SCHEMA)
+            upgrade = self._get_meta("schema_version") != SCHEMA_VERSION
+            if upgrade:
+                # Tables from earlier versions may lack columns
+                _ = self._connection.execute("DROP TABLE IF EXISTS patterns")
+            _ = self._connection.executescript(SCHEMA)
+            if upgrade:
+                self._clear()
+                self._set_meta("schema_version", SCHEMA_VERSION)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path: return self._path
+
+    @property
+    def source_path(self) -> Path | None:
+        s = self._get_meta("source_path")
+        return None if s is None else Path(s)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def sync(self, patterns_path: Path) -> SyncResult:
+        st = patterns_path.stat()
+        source_path = str(patterns_path.resolve())
+        stamp = f"{st.st_size}:{st.st_mtime_ns}"
+        is_same_source = self._get_meta("source_path") == source_path
+        if is_same_source and self._get_meta("stamp") == stamp:
+            return SyncResult(
+                added_count=0,
+                pattern_count=self.pattern_count,
+                rebuilt=False)
+
+        with patterns_path.open("rb") as f:
+            h, offset = self._hash_synced_prefix(f) \
+                if is_same_source \
+                else (blake2b(), 0)
+            tail = f.read()
+        h.update(tail)
+
+        patterns: list[BeatStudioPattern] | None = None
+        if offset > 0:
+            try:
+                patterns = self._read_patterns(tail)
+            except ValueError:
+                # Appended text does not start with a new pattern
+                pass
+
+        with self._connection:
+            if patterns is None:
+                if offset > 0:
+                    tail = patterns_path.read_bytes()
+                    h = blake2b(tail)
+                    offset = 0
+                self._clear()
+                patterns = self._read_patterns(tail)
+
+            first_position = cast(
+                tuple[int],
+                self._connection.execute(
+                    "SELECT COALESCE(MAX(position), 0) + 1 FROM patterns").fetchone())[0]
+            _ = self._connection.executemany(
+                "INSERT INTO patterns (position, digest, pattern_digest, name, name_key, step_count, tempo, quantum, numerator, denominator, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        first_position + i,
+                        p.content_digest,
+                        p.pattern_digest,
+                        p.name,
+                        p.name.lower(),
+                        p.step_count,
+                        int(p.tempo),
+                        p.quantum.int_value,
+                        int(p.time_signature.numerator),
+                        p.time_signature.denominator.int_value,
+                        pack_hits(p.step_count, p.hits)
+                    )
+                    for i, p in enumerate(patterns)
+                ))
+            self._set_meta("source_path", source_path)
+            self._set_meta("stamp", stamp)
+            self._set_meta("synced_size", str(st.st_size))
+            self._set_meta("synced_digest", h.hexdigest())
+
+        return SyncResult(
+            added_count=len(patterns),
+            pattern_count=self.pattern_count,
+            rebuilt=offset == 0)
+
+    @property
+    def pattern_count(self) -> int:
+        return cast(
+            tuple[int],
+            self._connection.execute("SELECT COUNT(*) FROM patterns").fetchone())[0]
+
+    def find_by_name(self, name: str) -> list[IndexedPattern]:
+        return self._select("WHERE name_key = ?", [name.lower()])
+
+    def query(self, name: str | None = None, time_signature: TimeSignature | None = None, min_tempo: int | None = None, max_tempo: int | None = None, min_step_count: int | None = None, max_step_count: int | None = None, quantum: NoteValue | None = None) -> list[IndexedPattern]:
+        conditions: list[str] = []
+        params: list[object] = []
+        if name is not None:
+            conditions.append("name_key GLOB ?")
+            params.append(name.lower())
+        if time_signature is not None:
+            conditions.append("numerator = ? AND denominator = ?")
+            params.extend([
+                int(time_signature.numerator),
+                time_signature.denominator.int_value
+            ])
+        if min_tempo is not None:
+            conditions.append("tempo >= ?")
+            params.append(min_tempo)
+        if max_tempo is not None:
+            conditions.append("tempo <= ?")
+            params.append(max_tempo)
+        if min_step_count is not None:
+            conditions.append("step_count >= ?")
+            params.append(min_step_count)
+        if max_step_count is not None:
+            conditions.append("step_count <= ?")
+            params.append(max_step_count)
+        if quantum is not None:
+            conditions.append("quantum = ?")
+            params.append(quantum.int_value)
+
+        where = "" if len(conditions) == 0 else \
+            "WHERE " + " AND ".join(conditions)
+        return self._select(where, params)
+
+    def _select(self, where: str, params: list[object]) -> list[IndexedPattern]:
+        rows = cast(
+            list[tuple[int, str, str, str, int, int, int, int, int, bytes]],
+            self._connection.execute(
+                f"SELECT {PATTERN_COLUMNS} FROM patterns {where} ORDER BY position",
+                params).fetchall())
+        return [
+            IndexedPattern(
+                position=position,
+                digest=digest,
+                pattern_digest=pattern_digest,
+                name=name,
+                step_count=step_count,
+                tempo=tempo,
+                quantum=quantum,
+                time_signature=TimeSignature(
+                    numerator=Numerator(numerator),
+                    denominator=NoteValue.from_int(denominator)),
+                hits=hits)
+            for position, digest, pattern_digest, name, step_count, tempo, quantum, numerator, denominator, hits in rows
+        ]
+
+    # Returns hash of previously synced bytes and the offset to continue
+    # from, or a fresh hash and offset 0 if those bytes have changed
+    def _hash_synced_prefix(self, f: BinaryIO) -> tuple["blake2b", int]:
+        synced_size = int(self._get_meta("synced_size") or 0)
+        h = blake2b()
+        remaining = synced_size
+        while remaining > 0:
+            chunk = f.read(min(remaining, CHUNK_SIZE))
+            if len(chunk) == 0:
+                break
+            h.update(chunk)
+            remaining -= len(chunk)
+
+        if remaining == 0 and h.hexdigest() == self._get_meta("synced_digest"):
+            return h, synced_size
+
+        _ = f.seek(0)
+        return blake2b(), 0
+
+    @staticmethod
+    def _read_patterns(data: bytes) -> list[BeatStudioPattern]:
+        text = data.decode(locale.getpreferredencoding(False))
+        return [
+            entry.read()
+            for entry in read_library(StringIO(text))
+            if entry.has_pattern
+        ]
+
+    def _clear(self) -> None:
+        _ = self._connection.execute("DELETE FROM patterns")
+        _ = self._connection.execute(
+            "DELETE FROM meta WHERE key <> 'schema_version'")
+
+    def _get_meta(self, key: str) -> str | None:
+        row = cast(
+            tuple[str] | None,
+            self._connection.execute(
+                "SELECT value FROM meta WHERE key = ?",
+                [key]).fetchone())
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value: str) -> None:
+        _ = self._connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [key, value])
@@ -0,0 +1,235 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.events import TempoEvent, TimeSignatureEvent
+from beat_studio_importer.midi_bytes import MESSAGE_DATA_LENGTHS, META_STATUS, META_TYPE_SET_TEMPO, META_TYPE_TIME_SIGNATURE, NOTE_ON_STATUS, SYSEX_STATUSES
+from beat_studio_importer.misc import MidiChannel, Ppqn, RegionId, Tick
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.region_summary import RegionSummary
+from beat_studio_importer.tempo_map import DEFAULT_MIDI_TEMPO, TempoMap
+from beat_studio_importer.tempos import MidiTempo
+from beat_studio_importer.time_signature import DEFAULT_TIME_SIGNATURE, Numerator, TimeSignature
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Self
+import struct
+
+
+type MetaEvent = TempoEvent | TimeSignatureEvent
+
+
+# Tempo and time signature events plus the ticks of note-on messages
+# read directly from Standard MIDI File bytes without decoding
+# channel messages: produces the same regions as Region.build_all
+# applied to Timeline.build but at a fraction of the cost
+@dataclass(frozen=True)
+class MetaScan:
+    ppqn: Ppqn
+    meta_events: list[MetaEvent]
+    # Note-on ticks of each track, in ascending order
+    note_ticks: list[list[Tick]]
+    discard_boundary_hits: bool
+
+    @classmethod
+    def load(cls: type[Self], path: Path, channel: MidiChannel | None = None, discard_boundary_hits: bool = True) -> Self:
+        return cls.scan(
+            path.read_bytes(),
+            channel=channel,
+            discard_boundary_hits=discard_boundary_hits)
+
+    @classmethod
+    def scan(cls: type[Self], data: bytes, channel: MidiChannel | None = None, discard_boundary_hits: bool = True) -> Self:
+        if len(data) < 14:
+            raise EOFError("Truncated MIDI file header")
+        name, size = struct.unpack_from(">4sL", data, 0)
+        if name != b"MThd":
+            raise ValueError("MThd not found. Probably not a MIDI file")
+        _, track_count, ppqn = struct.unpack_from(">hhh", data, 8)
+
+        note_status = None if channel is None else NOTE_ON_STATUS | (channel - 1)
+
+        meta_events: list[MetaEvent] = []
+        note_ticks: list[list[Tick]] = []
+        i = 8 + size
+        for _ in range(track_count):
+            if i + 8 > len(data):
+                raise EOFError("Truncated MIDI track header")
+            name, size = struct.unpack_from(">4sL", data, i)
+            if name != b"MTrk":
+                raise ValueError("No MTrk header at start of track")
+            start = i + 8
+            i = start + size
+            if i > len(data):
+                raise EOFError("Truncated MIDI track")
+            note_ticks.append(
+                _scan_track(data, start, i, note_status, meta_events))
+
+        # Stable sort matches the order of mido's merged track
+        meta_events.sort(key=lambda e: e.tick)
+
+        return cls(
+            ppqn=Ppqn(ppqn),
+            meta_events=meta_events,
+            note_ticks=note_ticks,
+            discard_boundary_hits=discard_boundary_hits)
+
+    @property
+    def tempo_events(self) -> list[TempoEvent]:
+        return [e for e in self.meta_events if isinstance(e, TempoEvent)]
+
+    @cached_property
+    def tempo_map(self) -> TempoMap:
+        return TempoMap.build(self.ppqn, self.tempo_events)
+
+    # Every tempo or time signature event starts a new region, as does
+    # the first note if it precedes them
+    @cached_property
+    def regions(self) -> list[RegionSummary]:
+        starts: list[tuple[Tick, TempoEvent | None, TimeSignatureEvent | None]] = []
+        for e in self.meta_events:
+            if len(starts) == 0 or starts[-1][0] != e.tick:
+                starts.append((e.tick, None, None))
+            tick, tempo_event, time_signature_event = starts[-1]
+            if isinstance(e, TempoEvent):
+                assert tempo_event is None, "conflicting tempo events"
+                starts[-1] = (tick, e, time_signature_event)
+            else:
+                assert time_signature_event is None, "conflicting time signature events"
+                starts[-1] = (tick, tempo_event, e)
+
+        first_note_ticks = [t[0] for t in self.note_ticks if len(t) > 0]
+        if len(first_note_ticks) > 0:
+            first_note_tick = min(first_note_ticks)
+            if len(starts) == 0 or first_note_tick < starts[0][0]:
+                starts.insert(0, (first_note_tick, None, None))
+
+        regions: list[RegionSummary] = []
+        tempo = DEFAULT_MIDI_TEMPO
+        time_signature = DEFAULT_TIME_SIGNATURE
+        for i, (start_tick, tempo_event, time_signature_event) in enumerate(starts):
+            end_tick = starts[i + 1][0] if i + 1 < len(starts) else None
+            if tempo_event is not None:
+                tempo = tempo_event.tempo
+            if time_signature_event is not None:
+                time_signature = time_signature_event.time_signature
+
+            note_count = sum(
+                (len(t) if end_tick is None else bisect_left(t, end_tick)) - bisect_left(t, start_tick)
+                for t in self.note_ticks)
+
+            ticks_per_bar = time_signature.ticks_per_bar(self.ppqn)
+
+            # Same boundary handling as RegionBuildState: only the
+            # final note of the last region can lie on a bar boundary
+            if note_count > 0:
+                last_tick = max(t[-1] for t in self.note_ticks if len(t) > 0) \
+                    if end_tick is None \
+                    else end_tick
+                bar_count, r = divmod(last_tick - start_tick, ticks_per_bar)
+                if r == 0 and self.discard_boundary_hits:
+                    if end_tick is None:
+                        note_count -= 1
+                else:
+                    bar_count += 1
+            else:
+                bar_count = 1
+
+            regions.append(RegionSummary(
+                id=RegionId(i + 1),
+                ppqn=self.ppqn,
+                start_tick=start_tick,
+                end_tick=Tick(start_tick + bar_count * ticks_per_bar),
+                tempo=tempo,
+                time_signature=time_signature,
+                note_count=note_count,
+                bar_count=bar_count))
+
+        return regions
+
+
+# Appends tempo and time signature events to meta_events and returns
+# the ticks of note-on messages with the given status byte (any channel
+# if None): all other messages are skipped over without being decoded
+def _scan_track(data: bytes, start: int, end: int, note_status: int | None, meta_events: list[MetaEvent]) -> list[Tick]:
+    note_ticks: list[Tick] = []
+    lengths = MESSAGE_DATA_LENGTHS
+    tick = 0
+    last_status: int | None = None
+    i = start
+    while i < end:
+        b = data[i]
+        i += 1
+        delta = b & 0x7f
+        while b & 0x80:
+            b = data[i]
+            i += 1
+            delta = (delta << 7) | (b & 0x7f)
+        tick += delta
+
+        status = data[i]
+        if status < 0x80:
+            # Running status: this is the first data byte
+            if last_status is None:
+                raise ValueError("Running status without last status")
+            status = last_status
+        else:
+            i += 1
+            if status != META_STATUS:
+                last_status = status
+
+        if status == META_STATUS or status in SYSEX_STATUSES:
+            meta_type = data[i] if status == META_STATUS else None
+            if meta_type is not None:
+                i += 1
+            b = data[i]
+            i += 1
+            length = b & 0x7f
+            while b & 0x80:
+                b = data[i]
+                i += 1
+                length = (length << 7) | (b & 0x7f)
+            if meta_type == META_TYPE_SET_TEMPO:
+                meta_events.append(TempoEvent(
+                    tick=Tick(tick),
+                    tempo=MidiTempo(int.from_bytes(data[i:i + 3]))))
+            elif meta_type == META_TYPE_TIME_SIGNATURE:
+                numerator, denominator_power, clocks_per_click, notated_32nd_notes_per_beat = data[i:i + 4]
+                assert clocks_per_click == 24, f"unsupported clocks_per_click value {clocks_per_click}"
+                assert notated_32nd_notes_per_beat == 8, f"unsupported notated_32nd_notes_per_beat value {notated_32nd_notes_per_beat}"
+                meta_events.append(TimeSignatureEvent(
+                    tick=Tick(tick),
+                    time_signature=TimeSignature(
+                        numerator=Numerator(numerator),
+                        denominator=NoteValue.from_int(2 ** denominator_power))))
+            i += length
+            continue
+
+        data_length = lengths[status]
+        if data_length is None:
+            raise ValueError(f"Undefined status byte 0x{status:02x}")
+        if status == note_status or (note_status is None and status & 0xf0 == NOTE_ON_STATUS):
+            note_ticks.append(Tick(tick))
+        i += data_length
+
+    return note_ticks
@@ -0,0 +1,73 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# Layout of Standard MIDI Files at the byte level
+# Reference: https://www.midi.org/specifications/file-format-specifications/standard-midi-files
+
+
+CHUNK_HEADER_SIZE: int = 8
+FILE_HEADER_DATA_SIZE: int = 6
+
+META_STATUS: int = 0xff
+META_TYPE_CHANNEL_PREFIX: int = 0x20
+META_TYPE_END_OF_TRACK: int = 0x2f
+META_TYPE_SET_TEMPO: int = 0x51
+META_TYPE_TIME_SIGNATURE: int = 0x58
+
+SYSEX_STATUS: int = 0xf0
+SYSEX_END: int = 0xf7
+SYSEX_STATUSES: tuple[int, int] = (SYSEX_STATUS, SYSEX_END)
+NOTE_ON_STATUS: int = 0x90
+
+# Status bytes below this carry a note number: note off, note on and
+# polyphonic aftertouch
+CONTROL_CHANGE_STATUS: int = 0xb0
+
+# Status bytes of channel messages
+CHANNEL_STATUS_MIN: int = 0x80
+CHANNEL_STATUS_END: int = 0xf0
+
+# Status bytes of real-time messages
+REALTIME_STATUS_MIN: int = 0xf8
+
+
+# Number of data bytes following each status byte, or None if the status
+# byte is not valid as the start of a channel or system message
+def _message_data_lengths() -> tuple[int | None, ...]:
+    lengths: list[int | None] = [None] * 256
+    for status in range(CHANNEL_STATUS_MIN, CHANNEL_STATUS_END):
+        lengths[status] = 1 if status & 0xf0 in (0xc0, 0xd0) else 2
+    for status, length in {0xf1: 1, 0xf2: 2, 0xf3: 1, 0xf6: 0, 0xf8: 0, 0xfa: 0, 0xfb: 0, 0xfc: 0, 0xfe: 0}.items():
+        lengths[status] = length
+    return tuple(lengths)
+
+
+MESSAGE_DATA_LENGTHS: tuple[int | None, ...] = _message_data_lengths()
+
+
+def encode_variable_int(value: int) -> bytes:
+    result = [value & 0x7f]
+    value >>= 7
+    while value > 0:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    return bytes(reversed(result))
@@ -21,7 +21,9 @@
 #
 
 from beat_studio_importer.beat_studio_note_name import BeatStudioNoteName
+from beat_studio_importer.enum_util import enum_index
 from beat_studio_importer.misc import MidiNote
+from collections.abc import Mapping
 from enum import Enum, auto, unique
 
 
@@ -53,10 +55,10 @@ class MidiNoteName(Enum):
 
     @staticmethod
     def parse(s: str) -> "MidiNoteName":
-        for member in MidiNoteName:
-            if member.display == s:
-                return member
-        raise ValueError(f"Invalid General MIDI drum note name {s}")
+        member = _MEMBERS_BY_DISPLAY.get(s)
+        if member is None:
+            raise ValueError(f"Invalid General MIDI drum note name {s}")
+        return member
 
     @property
     def display(self) -> str: return self.value[1]
@@ -66,3 +68,6 @@ class MidiNoteName(Enum):
 
     @property
     def beat_studio_note_name(self) -> BeatStudioNoteName: return self.value[3]
+
+
+_MEMBERS_BY_DISPLAY: Mapping[object, MidiNoteName] = enum_index(MidiNoteName, "display")
@@ -20,12 +20,19 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.cache_util import default_cache_dir
 from beat_studio_importer.midi_note_name import MidiNoteName
 from beat_studio_importer.misc import MidiNote
 from dataclasses import dataclass
+from hashlib import blake2b
 from pathlib import Path
 from typing import Self, cast
-import yaml
+import json
+import os
+
+
+# Path, modification time and size of note map file
+type CacheKey = tuple[Path, int, int]
 
 
 @dataclass(frozen=True)
@@ -34,12 +41,38 @@ class MidiNoteNameMap:
     name: str
     notes: dict[MidiNote, MidiNoteName]
 
+    # Maps are cached in memory and in the cache directory keyed by path,
+    # modification time and size so that repeated loads skip YAML parsing
     @classmethod
-    def load(cls: type[Self], path: Path) -> Self:
+    def load(cls: type[Self], path: Path, cache_dir: Path | None = None) -> Self:
+        st = path.stat()
+        key = (path, st.st_mtime_ns, st.st_size)
+        note_name_map = _LOADED_MAPS.get(key)
+        if isinstance(note_name_map, cls):
+            return note_name_map
+
+        cache_path = (cache_dir or default_cache_dir()) / "note-maps" / \
+            f"{blake2b(str(path).encode(), digest_size=16).hexdigest()}.json"
+        note_name_map = cls._load_cached(cache_path, key)
+        if note_name_map is None:
+            note_name_map = cls._load_yaml(path)
+            note_name_map._save_cached(cache_path, key)
+
+        _LOADED_MAPS[key] = note_name_map
+        return note_name_map
+
+    # PyYAML is slow to import so is only imported when the cache misses
+    @classmethod
+    def _load_yaml(cls: type[Self], path: Path) -> Self:
+        import yaml
+
+        # Use libyaml if available
+        loader: type[yaml.SafeLoader] | type[yaml.CSafeLoader] = \
+            getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with path.open("rt") as f:
             obj = cast(
                 dict[str, object],
-                yaml.load(stream=f, Loader=yaml.SafeLoader))
+                yaml.load(stream=f, Loader=loader))
         return cls(
             path=path,
             name=cast(str, obj["name"]),
@@ -48,6 +81,46 @@ class MidiNoteNameMap:
                 for note, s in cast(dict[int, str], obj["notes"]).items()
             })
 
+    @classmethod
+    def _load_cached(cls: type[Self], cache_path: Path, key: CacheKey) -> Self | None:
+        path, mtime_ns, size = key
+        try:
+            with cache_path.open("rt") as f:
+                obj = cast(dict[str, object], json.load(f))
+            if obj["path"] != str(path) or obj["mtime_ns"] != mtime_ns or obj["size"] != size:
+                return None
+            return cls(
+                path=path,
+                name=cast(str, obj["name"]),
+                notes={
+                    MidiNote(int(note)): MidiNoteName[member_name]
+                    for note, member_name in cast(dict[str, str], obj["notes"]).items()
+                })
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # Failure to write the cache is not an error
+    def _save_cached(self, cache_path: Path, key: CacheKey) -> None:
+        path, mtime_ns, size = key
+        obj = {
+            "path": str(path),
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "name": self.name,
+            "notes": {
+                str(note): note_name.name
+                for note, note_name in self.notes.items()
+            }
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+            with temp_path.open("wt") as f:
+                json.dump(obj, f)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+
     def __getitem__(self, key: MidiNote) -> MidiNoteName:
         return self.notes[key]
 
@@ -55,6 +128,8 @@ class MidiNoteNameMap:
         return self.notes.get(key)
 
     def save_as(self, path: Path) -> None:
+        import yaml
+
         with path.open("wt") as f:
             yaml.dump({
                 "name": self.name,
@@ -72,3 +147,6 @@ DEFAULT_MIDI_NOTE_NAME_MAP: MidiNoteNameMap = MidiNoteNameMap(
         x.midi_note: x
         for x in MidiNoteName
     })
+
+
+_LOADED_MAPS: dict[CacheKey, MidiNoteNameMap] = {}
@@ -0,0 +1,323 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.midi_bytes import CHANNEL_STATUS_END, CHANNEL_STATUS_MIN, CHUNK_HEADER_SIZE, CONTROL_CHANGE_STATUS, FILE_HEADER_DATA_SIZE, MESSAGE_DATA_LENGTHS, META_STATUS, META_TYPE_CHANNEL_PREFIX, META_TYPE_END_OF_TRACK, NOTE_ON_STATUS, REALTIME_STATUS_MIN, SYSEX_END, SYSEX_STATUS, SYSEX_STATUSES, encode_variable_int
+from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+from beat_studio_importer.misc import MidiChannel
+from collections.abc import Iterable, MutableSequence
+from dataclasses import dataclass
+from hashlib import blake2b
+from io import BytesIO
+from logging import Logger
+from mido import Message, MidiFile
+from pathlib import Path
+from typing import Self
+import logging
+import struct
+
+
+LOGGER: Logger = logging.getLogger(__name__)
+
+
+CHANNEL_COUNT: int = 16
+NOTE_COUNT: int = 128
+
+_IDENTITY_CHANNELS: bytes = bytes(range(CHANNEL_COUNT))
+_IDENTITY_NOTES: bytes = bytes(range(NOTE_COUNT))
+
+
+# Lookup tables applied to channel messages: the channel of every
+# channel message, the note number of note off, note on and polyphonic
+# aftertouch messages and the velocity of note on messages. Transforms
+# compose into a single set of tables so that any number of them cost
+# one pass over the messages
+@dataclass(frozen=True)
+class MidiTransform:
+    channels: bytes = _IDENTITY_CHANNELS
+    notes: bytes = _IDENTITY_NOTES
+    velocities: bytes = _IDENTITY_NOTES
+
+    # Moves every channel message to the given channel
+    @classmethod
+    def channel(cls: type[Self], channel: MidiChannel) -> Self:
+        return cls(channels=bytes([channel - 1] * CHANNEL_COUNT))
+
+    # Maps each note in the note name map to the General MIDI note of
+    # its name, leaving other notes alone
+    @classmethod
+    def note_map(cls: type[Self], note_name_map: MidiNoteNameMap) -> Self:
+        notes = bytearray(_IDENTITY_NOTES)
+        for note, note_name in note_name_map.notes.items():
+            notes[note] = note_name.midi_note
+        return cls(notes=bytes(notes))
+
+    # Scales and offsets note on velocities, clamped to 1-127 so that
+    # notes are never turned into note offs
+    @classmethod
+    def velocity_curve(cls: type[Self], scale: float = 1.0, offset: int = 0) -> Self:
+        return cls(velocities=bytes(
+            [0] + [
+                min(max(round(v * scale + offset), 1), NOTE_COUNT - 1)
+                for v in range(1, NOTE_COUNT)
+            ]))
+
+    # Applies transforms in order
+    @classmethod
+    def compose(cls: type[Self], transforms: Iterable["MidiTransform"]) -> Self:
+        result = cls()
+        for transform in transforms:
+            result = result.then(transform)
+        return result
+
+    @classmethod
+    def build(cls: type[Self], channel: MidiChannel | None = None, note_name_map: MidiNoteNameMap | None = None, velocity_scale: float = 1.0, velocity_offset: int = 0) -> Self:
+        transforms: list[MidiTransform] = []
+        if channel is not None:
+            transforms.append(MidiTransform.channel(channel))
+        if note_name_map is not None:
+            transforms.append(MidiTransform.note_map(note_name_map))
+        if velocity_scale != 1.0 or velocity_offset != 0:
+            transforms.append(MidiTransform.velocity_curve(
+                scale=velocity_scale,
+                offset=velocity_offset))
+        return cls.compose(transforms)
+
+    # Identifies the transform's effect: equal transforms have equal
+    # digests
+    @property
+    def digest(self) -> str:
+        return blake2b(self.channels + self.notes + self.velocities, digest_size=16).hexdigest()
+
+    @property
+    def is_identity(self) -> bool:
+        return self.channels == _IDENTITY_CHANNELS and \
+            self.notes == _IDENTITY_NOTES and \
+            self.velocities == _IDENTITY_NOTES
+
+    # This transform followed by other
+    def then(self, other: "MidiTransform") -> Self:
+        return type(self)(
+            channels=bytes(other.channels[c] for c in self.channels),
+            notes=bytes(other.notes[n] for n in self.notes),
+            velocities=bytes(other.velocities[v] for v in self.velocities))
+
+    # Transforms a single encoded message in place
+    def apply(self, message: MutableSequence[int]) -> None:
+        status = message[0]
+        if CHANNEL_STATUS_MIN <= status < CHANNEL_STATUS_END:
+            kind = status & 0xf0
+            message[0] = kind | self.channels[status & 0x0f]
+            if kind < CONTROL_CHANGE_STATUS:
+                message[1] = self.notes[message[1]]
+                if kind == NOTE_ON_STATUS:
+                    message[2] = self.velocities[message[2]]
+
+
+# Applies transform to every channel message in the Standard MIDI File
+# in buffer in place and returns the length of the result, which
+# occupies the start of buffer. The output is laid out exactly as mido
+# saves files: status bytes made redundant by running status and
+# non-minimal variable-length quantities are squeezed out by moving the
+# rest of the file down. Raises ValueError for files that are malformed
+# or that mido would need to lengthen, such as tracks that do not end
+# with a single end-of-track event, use running status after a meta or
+# sysex event or contain sysex events not of the form F0, data, F7.
+def transform_in_place(buffer: bytearray, transform: MidiTransform) -> int:
+    channels = transform.channels
+    notes = transform.notes
+    velocities = transform.velocities
+    map_notes = notes != _IDENTITY_NOTES or velocities != _IDENTITY_NOTES
+    lengths = MESSAGE_DATA_LENGTHS
+    end_of_buffer = len(buffer)
+
+    # Bytes [src, r) are yet to be moved down to w
+    w = 0
+    src = 0
+
+    def flush(p: int) -> None:
+        nonlocal w, src
+        n = p - src
+        if w != src:
+            buffer[w:w + n] = buffer[src:p]
+        w += n
+        src = p
+
+    def read_variable_int(i: int) -> tuple[int, int]:
+        b = buffer[i]
+        i += 1
+        value = b & 0x7f
+        while b & 0x80:
+            b = buffer[i]
+            i += 1
+            value = (value << 7) | (b & 0x7f)
+        return value, i
+
+    # Replaces non-minimal variable-length quantities
+    def squeeze_variable_int(start: int, end: int, value: int) -> None:
+        nonlocal src, w
+        if end - start > 1 and buffer[start] == 0x80:
+            flush(start)
+            encoded = encode_variable_int(value)
+            buffer[w:w + len(encoded)] = encoded
+            w += len(encoded)
+            src = end
+
+    if end_of_buffer < CHUNK_HEADER_SIZE + FILE_HEADER_DATA_SIZE:
+        raise ValueError("Truncated MIDI file header")
+    name, size = struct.unpack_from(">4sL", buffer, 0)
+    if name != b"MThd":
+        raise ValueError("MThd not found. Probably not a MIDI file")
+    _, track_count, _ = struct.unpack_from(">hhh", buffer, CHUNK_HEADER_SIZE)
+    struct.pack_into(">L", buffer, 4, FILE_HEADER_DATA_SIZE)
+    flush(CHUNK_HEADER_SIZE + FILE_HEADER_DATA_SIZE)
+    r = src = CHUNK_HEADER_SIZE + size
+
+    for _ in range(track_count):
+        if r + CHUNK_HEADER_SIZE > end_of_buffer:
+            raise ValueError("Truncated MIDI track header")
+        name, size = struct.unpack_from(">4sL", buffer, r)
+        if name != b"MTrk":
+            raise ValueError("No MTrk header at start of track")
+        end = r + CHUNK_HEADER_SIZE + size
+        if end > end_of_buffer:
+            raise ValueError("Truncated MIDI track")
+
+        # The length is filled in once the track has been squeezed
+        flush(r)
+        track_start = w
+        r += CHUNK_HEADER_SIZE
+
+        in_status: int | None = None
+        out_status: int | None = None
+        is_end_of_track = False
+        while r < end:
+            if is_end_of_track:
+                raise ValueError("Event after end of track")
+
+            delta_start = r
+            delta, r = read_variable_int(r)
+            squeeze_variable_int(delta_start, r, delta)
+
+            status = buffer[r]
+            if status < 0x80:
+                if in_status is None:
+                    raise ValueError("Running status without last status")
+                status = in_status
+                status_pos = None
+            else:
+                status_pos = r
+                r += 1
+                if status != META_STATUS:
+                    in_status = status
+
+            if status == META_STATUS or status in SYSEX_STATUSES:
+                if status_pos is None:
+                    raise ValueError("Running status after meta or sysex event")
+                meta_type = buffer[r] if status == META_STATUS else None
+                if meta_type is not None:
+                    r += 1
+                length_start = r
+                length, r = read_variable_int(r)
+                squeeze_variable_int(length_start, r, length)
+                if r + length > end:
+                    raise ValueError("Event extends past end of track")
+                if meta_type is None and not (
+                        status == SYSEX_STATUS and
+                        length > 0 and
+                        buffer[r] != SYSEX_STATUS and
+                        buffer[r + length - 1] == SYSEX_END):
+                    # mido saves every sysex event as F0, data, F7
+                    raise ValueError("Sysex event that mido would rewrite")
+                if meta_type == META_TYPE_CHANNEL_PREFIX and length == 1:
+                    buffer[r] = channels[buffer[r] & 0x0f]
+                is_end_of_track = meta_type == META_TYPE_END_OF_TRACK
+                r += length
+                out_status = None
+                continue
+
+            data_length = lengths[status]
+            if data_length is None or status >= REALTIME_STATUS_MIN:
+                raise ValueError(f"Unsupported status byte 0x{status:02x}")
+
+            if status < CHANNEL_STATUS_END:
+                kind = status & 0xf0
+                status = kind | channels[status & 0x0f]
+                if map_notes and kind < CONTROL_CHANGE_STATUS:
+                    if r + 2 > end or buffer[r] & 0x80 or buffer[r + 1] & 0x80:
+                        raise ValueError("Invalid note message")
+                    buffer[r] = notes[buffer[r]]
+                    if kind == NOTE_ON_STATUS:
+                        buffer[r + 1] = velocities[buffer[r + 1]]
+            if status == out_status:
+                if status_pos is not None:
+                    flush(status_pos)
+                    src = status_pos + 1
+            elif status_pos is None:
+                raise ValueError("Running status after meta or sysex event")
+            else:
+                buffer[status_pos] = status
+            out_status = status if status < CHANNEL_STATUS_END else None
+            r += data_length
+
+        if r != end:
+            raise ValueError("Event extends past end of track")
+        if not is_end_of_track:
+            raise ValueError("Track does not end with end of track event")
+
+        flush(r)
+        struct.pack_into(">L", buffer, track_start + 4, w - track_start - CHUNK_HEADER_SIZE)
+
+    return w
+
+
+# Transformed contents of a MIDI file: rewritten in place where
+# possible, falling back to mido otherwise
+def transform_file(path: Path, transform: MidiTransform) -> memoryview:
+    buffer = bytearray(path.stat().st_size)
+    with path.open("rb") as f:
+        _ = f.readinto(buffer)
+
+    try:
+        size = transform_in_place(buffer, transform)
+    except ValueError as e:
+        LOGGER.debug(f"Falling back to mido for {path}: {e}")
+        return memoryview(transform_midi_file(path, transform))
+
+    return memoryview(buffer)[:size]
+
+
+def transform_midi_file(path: Path, transform: MidiTransform) -> bytes:
+    file = MidiFile(path)
+
+    for track in file.tracks:
+        for i, message in enumerate(track):
+            if message.is_meta:
+                if message.type == "channel_prefix":
+                    message.channel = transform.channels[message.channel]
+            elif hasattr(message, "channel"):
+                encoded = message.bytes()
+                transform.apply(encoded)
+                track[i] = Message.from_bytes(encoded, time=message.time)
+
+    with BytesIO() as f:
+        file.save(file=f)
+        return f.getvalue()
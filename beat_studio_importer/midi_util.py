@@ -23,36 +23,60 @@
 from beat_studio_importer.table import Table
 from beat_studio_importer.ui import cprint, print_key_value
 from colorama import Fore
+from dataclasses import dataclass
 from mido import MidiFile
-from typing import cast
+from typing import Self, cast
+
+
+@dataclass(frozen=True)
+class MidiFileSummary:
+    filename: str | None
+    ticks_per_beat: int
+    track_names: list[str]
+    channels: list[int]
+    message_counts: dict[str, int]
+
+    @classmethod
+    def build(cls: type[Self], file: MidiFile) -> Self:
+        midi_channels: set[int] = set()
+        message_counts: dict[str, int] = {}
+
+        for track in file.tracks:
+            for m in track:
+                message_type = m.type
+                message_counts[message_type] = \
+                    message_counts.get(message_type, 0) + 1
+                raw_channel = cast(int | None, getattr(m, "channel", None))
+                if raw_channel is not None:
+                    midi_channel = raw_channel + 1
+                    midi_channels.add(midi_channel)
+
+        return cls(
+            filename=file.filename,
+            ticks_per_beat=file.ticks_per_beat,
+            track_names=sorted(t.name for t in file.tracks),
+            channels=sorted(midi_channels),
+            message_counts={
+                k: message_counts[k]
+                for k in sorted(message_counts.keys())
+            })
 
 
 def summarize_midi_file(file: MidiFile) -> None:
-    midi_channels: set[int] = set()
-    message_counts: dict[str, int] = {}
-
-    for track in file.tracks:
-        for m in track:
-            message_type = m.type
-            message_counts[message_type] = \
-                message_counts.get(message_type, 0) + 1
-            raw_channel = cast(int | None, getattr(m, "channel", None))
-            if raw_channel is not None:
-                midi_channel = raw_channel + 1
-                midi_channels.add(midi_channel)
-
-    print_key_value("File", file.filename)
-    print_key_value("Ticks per beat", file.ticks_per_beat)
+    summary = MidiFileSummary.build(file)
+
+    print_key_value("File", summary.filename)
+    print_key_value("Ticks per beat", summary.ticks_per_beat)
 
     cprint(Fore.LIGHTBLUE_EX, "Tracks:")
-    for track_name in sorted(t.name for t in file.tracks):
+    for track_name in summary.track_names:
         cprint("  ", Fore.LIGHTCYAN_EX, track_name)
 
     cprint(Fore.LIGHTBLUE_EX, "MIDI channels:")
-    for raw_channel in sorted(midi_channels):
+    for raw_channel in summary.channels:
         cprint("  ", Fore.LIGHTCYAN_EX, raw_channel)
 
     with Table(("MIDI message", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTBLUE_EX), ("count", Fore.LIGHTYELLOW_EX, "{:>5}", Fore.LIGHTCYAN_EX), column_sep="  ") as table:
-        for message_type in sorted(message_counts.keys()):
-            table.add_row(message_type, message_counts[message_type])
+        for message_type, count in summary.message_counts.items():
+            table.add_row(message_type, count)
         table.print()
@@ -20,8 +20,10 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.enum_util import enum_index
 from beat_studio_importer.misc import Ppqn
 from beat_studio_importer.pulse import Pulse
+from collections.abc import Mapping
 from enum import Enum, unique
 
 
@@ -37,10 +39,10 @@ class NoteValue(Enum):
 
     @staticmethod
     def from_int(value: int) -> "NoteValue":
-        for member in NoteValue:
-            if member.int_value == value:
-                return member
-        raise ValueError(f"Invalid note value {value}")
+        member = _MEMBERS_BY_INT_VALUE.get(value)
+        if member is None:
+            raise ValueError(f"Invalid note value {value}")
+        return member
 
     @property
     def int_value(self) -> int: return self.value[0]
@@ -52,3 +54,7 @@ class NoteValue(Enum):
         ticks, r = divmod(ppqn * 4, self.int_value)
         assert r == 0
         return ticks
+
+
+_MEMBERS_BY_INT_VALUE: Mapping[object, NoteValue] = \
+    enum_index(NoteValue, "int_value")
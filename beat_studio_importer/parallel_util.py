@@ -0,0 +1,66 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING
+import os
+
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+# One-line description of an error caught in a worker so that it can be
+# reported alongside the item that caused it
+def describe_error(e: Exception) -> str:
+    message = str(e)
+    return type(e).__name__ if message == "" else f"{type(e).__name__}: {message}"
+
+
+# Counts only the CPUs this process may run on where Python supports it
+# (3.13 and later)
+def default_worker_count() -> int:
+    cpu_count: Callable[[], int | None] = getattr(os, "process_cpu_count", os.cpu_count)
+    return cpu_count() or 1
+
+
+# Like Executor.map but yields results in order with at most window
+# tasks submitted and not yet consumed, so that memory use is bounded
+# regardless of the number of items: runs in-process for one worker
+def bounded_map[T, R](func: Callable[[T], R], items: Iterable[T], worker_count: int, window: int | None = None) -> Iterator[R]:
+    if worker_count <= 1:
+        yield from map(func, items)
+        return
+
+    # Imported here since multiprocessing is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    window = window or worker_count * 4
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        pending: "deque[Future[R]]" = deque()
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while len(pending) > 0:
+            yield pending.popleft().result()
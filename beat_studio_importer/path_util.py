@@ -0,0 +1,69 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from pathlib import Path
+import glob
+
+
+MIDI_FILE_SUFFIXES: set[str] = {".mid", ".midi", ".smf"}
+
+GLOB_CHARS: str = "*?["
+
+
+# Paths that exist are literal even if their names contain glob
+# characters, e.g. "Groove [v2].mid"
+def is_glob(path: Path) -> bool:
+    return any(c in str(path) for c in GLOB_CHARS) and not path.exists()
+
+
+def is_multi_path(path: Path) -> bool:
+    return is_glob(path) or path.is_dir()
+
+
+# Directory that paths matched by a glob or found in a directory are
+# relative to
+def multi_path_root(path: Path) -> Path:
+    if not is_glob(path):
+        return path
+    root = path
+    while is_glob(root):
+        root = root.parent
+    return root
+
+
+# MIDI files in a directory tree or matching a glob, in sorted order
+def expand_midi_paths(path: Path) -> list[Path]:
+    if is_glob(path):
+        root = multi_path_root(path)
+        pattern = glob.escape(str(root)) + str(path)[len(str(root)):]
+        return sorted(
+            p
+            for p in map(Path, glob.iglob(pattern, recursive=True))
+            if p.is_file())
+
+    if path.is_dir():
+        return sorted(
+            p
+            for p in path.rglob("*")
+            if p.suffix.lower() in MIDI_FILE_SUFFIXES and p.is_file())
+
+    return [path] if path.is_file() else []
@@ -20,12 +20,20 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
-from beat_studio_importer.ui import cprint, print_key_value
+from beat_studio_importer.constants import DRUM_CHANNEL, VIRTUAL_PORT_NAME
+from beat_studio_importer.meta_scan import MetaScan
+from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+from beat_studio_importer.midi_transform import MidiTransform
+from beat_studio_importer.misc import RegionId
+from beat_studio_importer.playback import PlaybackSchedule, TimingStats, play_schedule
+from beat_studio_importer.table import Table
+from beat_studio_importer.ui import cprint, print_key_value, select_region
 from beat_studio_importer.user_error import UserError
-from collections.abc import Generator
+from beat_studio_importer.virtual_port import VirtualOutput, is_virtual_port_name
+from collections.abc import Callable, Generator
 from colorama import Fore
 from contextlib import ExitStack, contextmanager
-from mido import MidiFile
+from mido import Message, MidiFile
 from mido.ports import BaseOutput
 from pathlib import Path
 from typing import cast
@@ -34,6 +42,12 @@ import mido
 
 @contextmanager
 def open_midi_port(name: str | None) -> Generator[BaseOutput, None, None]:
+    if is_virtual_port_name(name):
+        assert name is not None
+        with VirtualOutput.open(name) as virtual_port:
+            yield virtual_port
+        return
+
     if name is not None:
         if name not in mido.get_output_names():
             raise UserError(f"Unknown MIDI port {name}")
@@ -55,7 +69,32 @@ def open_midi_port(name: str | None) -> Generator[BaseOutput, None, None]:
         yield port
 
 
-def do_play(path: Path, port_name: str | None = None, force_channel_10: bool = True) -> None:
+# Sends raw MIDI bytes straight to python-rtmidi when the port uses
+# mido's rtmidi backend, skipping per-message validation and encoding
+def raw_sender(port: BaseOutput) -> Callable[[bytes], None]:
+    if isinstance(port, VirtualOutput):
+        return port.send_bytes
+
+    send_message = getattr(getattr(port, "_rt", None), "send_message", None)
+    if callable(send_message):
+        return cast(Callable[[bytes], None], send_message)
+
+    def send(data: bytes) -> None:
+        port.send(Message.from_bytes(data))
+    return send
+
+
+# In benchmark mode, timing is measured at the receiving end when
+# playing to the virtual port, which is the default
+def do_play(path: Path, port_name: str | None = None, force_channel_10: bool = True, pause_gc: bool = True, benchmark: bool = False, region_id: RegionId | None = None, loop_count: int = 1, note_name_map: MidiNoteNameMap | None = None, velocity_scale: float = 1.0, velocity_offset: int = 0) -> None:
+    if not path.is_file():
+        raise UserError(f"Input file {path} not found")
+    if loop_count != 1 and region_id is None:
+        raise UserError("Looping requires a region")
+
+    if benchmark and port_name is None:
+        port_name = VIRTUAL_PORT_NAME
+
     with open_midi_port(port_name) as port:
         print_key_value("File", path)
         print_key_value("MIDI port", port.name)
@@ -63,9 +102,61 @@ def do_play(path: Path, port_name: str | None = None, force_channel_10: bool = T
         if force_channel_10:
             cprint(Fore.LIGHTBLUE_EX, "Will remap all notes to MIDI channel 10")
 
-        file = MidiFile(path)
-        for message in file.play():
-            if force_channel_10:
-                if hasattr(message, "channel"):
-                    message.channel = 9
-            port.send(message)
+        if note_name_map is not None:
+            print_key_value("Note map", note_name_map.name)
+
+        transform = MidiTransform.build(
+            channel=DRUM_CHANNEL if force_channel_10 else None,
+            note_name_map=note_name_map,
+            velocity_scale=velocity_scale,
+            velocity_offset=velocity_offset)
+        schedule = PlaybackSchedule.build(
+            MidiFile(path),
+            transform=None if transform.is_identity else transform)
+
+        if region_id is not None:
+            region = select_region(
+                path,
+                MetaScan.load(path).regions,
+                region_id)
+            print_key_value(f"Region {region.id}", region.descriptor.description)
+            if loop_count != 1:
+                print_key_value("Loops", loop_count)
+            schedule = schedule.slice(
+                region.start_tick,
+                region.end_tick,
+                loop_count=loop_count)
+        run = play_schedule(
+            schedule,
+            raw_sender(port),
+            pause_gc=pause_gc)
+
+        if benchmark and isinstance(port, VirtualOutput):
+            stats = TimingStats.build(
+                schedule.deadlines,
+                run.start_ns,
+                port.timestamps)
+        else:
+            stats = run.stats(schedule)
+
+    show_timing_stats(stats, benchmark=benchmark)
+
+
+def show_timing_stats(stats: TimingStats, benchmark: bool = False) -> None:
+    def us(ns: float) -> str:
+        return f"{ns / 1000:.1f}"
+
+    cprint(Fore.LIGHTYELLOW_EX, "Timing error (microseconds late)")
+    with Table((None, None, "{}", Fore.LIGHTBLUE_EX), (None, None, "{:>10}", Fore.LIGHTCYAN_EX), column_sep="  ") as table:
+        table.add_row("Messages", stats.message_count)
+        table.add_row("Mean", us(stats.mean_error_ns))
+        if benchmark:
+            table.add_row("50th percentile", us(stats.p50_error_ns))
+            table.add_row("90th percentile", us(stats.p90_error_ns))
+        table.add_row("99th percentile", us(stats.p99_error_ns))
+        table.add_row("Maximum", us(stats.max_error_ns))
+        if benchmark:
+            table.add_row("Jitter (standard deviation)", us(stats.jitter_ns))
+            table.add_row("Elapsed (seconds)", f"{stats.elapsed_ns / 1_000_000_000:.3f}")
+            table.add_row("Throughput (messages per second)", f"{stats.throughput:.1f}")
+        table.print()
@@ -0,0 +1,297 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from array import array
+from beat_studio_importer.events import TempoEvent
+from beat_studio_importer.midi_transform import MidiTransform
+from beat_studio_importer.misc import Ppqn, Tick
+from beat_studio_importer.tempo_map import TempoMap
+from beat_studio_importer.tempos import MidiTempo
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from mido import MetaMessage, MidiFile
+from statistics import fmean, pstdev
+from typing import Self
+import gc
+import time
+
+
+# Wake from sleep this long before each deadline and spin for the rest
+DEFAULT_SPIN_NS: int = 1_000_000
+
+# Proportion of the worst oversleep retained after each sleep (1/8)
+OVERSLEEP_DECAY_SHIFT: int = 3
+
+
+# Raw bytes of all messages, with the optional transform already
+# applied, and their absolute deadlines in nanoseconds from the start of
+# playback computed up front from the tempo map: message i is
+# data[offsets[i]:offsets[i + 1]] at tick ticks[i]
+@dataclass(frozen=True)
+class PlaybackSchedule:
+    tempo_map: TempoMap
+    ticks: array[int]
+    deadlines: array[int]
+    offsets: array[int]
+    data: bytes
+
+    @classmethod
+    def build(cls: type[Self], file: MidiFile, transform: MidiTransform | None = None) -> Self:
+        tempo_events: list[TempoEvent] = []
+        ticks = array("q")
+        offsets = array("Q", [0])
+        data = bytearray()
+
+        tick = 0
+        for message in file.merged_track:  # yields messages with delta time
+            tick += message.time
+            if isinstance(message, MetaMessage):
+                if message.type == "set_tempo":
+                    tempo_events.append(TempoEvent(
+                        tick=Tick(tick),
+                        tempo=MidiTempo(message.tempo)))
+                continue
+
+            encoded = message.bytes()
+            if transform is not None:
+                transform.apply(encoded)
+            data.extend(encoded)
+            offsets.append(len(data))
+            ticks.append(tick)
+
+        tempo_map = TempoMap.build(Ppqn(file.ticks_per_beat), tempo_events)
+        return cls(
+            tempo_map=tempo_map,
+            ticks=ticks,
+            deadlines=array(
+                "q",
+                (tempo_map.tick_to_nanoseconds(Tick(t)) for t in ticks)),
+            offsets=offsets,
+            data=bytes(data))
+
+    @property
+    def message_count(self) -> int:
+        return len(self.deadlines)
+
+    def message_bytes(self, i: int) -> bytes:
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    # Messages from start_tick up to but excluding end_tick, plus any
+    # note-offs at exactly end_tick, repeated loop_count times without
+    # gaps, preceded by the controller, program and pitch bend state of
+    # each channel at start_tick: found by bisecting the tick index and
+    # copied from the encoded buffer. Notes still sounding at the end of
+    # the region are released at the end of each iteration
+    def slice(self, start_tick: Tick, end_tick: Tick, loop_count: int = 1) -> Self:
+        first = bisect_left(self.ticks, start_tick)
+        last = bisect_left(self.ticks, end_tick)
+        region = [
+            *range(first, last),
+            *(
+                i
+                for i in range(last, bisect_right(self.ticks, end_tick))
+                if self._is_note_off(i)
+            ),
+        ]
+        start_ns = self.tempo_map.tick_to_nanoseconds(start_tick)
+        period_ns = self.tempo_map.tick_to_nanoseconds(end_tick) - start_ns
+        period_ticks = end_tick - start_tick
+        releases = self._release_notes(region)
+
+        ticks = array("q")
+        deadlines = array("q")
+        offsets = array("Q", [0])
+        data = bytearray()
+
+        def append(encoded: bytes, tick: int, deadline: int) -> None:
+            data.extend(encoded)
+            offsets.append(len(data))
+            ticks.append(tick)
+            deadlines.append(deadline)
+
+        for i in self._channel_state(first):
+            append(self.message_bytes(i), start_tick, 0)
+
+        for n in range(loop_count):
+            for i in region:
+                append(
+                    self.message_bytes(i),
+                    self.ticks[i] + n * period_ticks,
+                    self.deadlines[i] - start_ns + n * period_ns)
+            for encoded in releases:
+                append(encoded, end_tick + n * period_ticks, (n + 1) * period_ns)
+
+        return type(self)(
+            tempo_map=self.tempo_map,
+            ticks=ticks,
+            deadlines=deadlines,
+            offsets=offsets,
+            data=bytes(data))
+
+    # Note-off or note-on with zero velocity
+    def _is_note_off(self, i: int) -> bool:
+        offset = self.offsets[i]
+        status = self.data[offset] & 0xf0
+        return status == 0x80 or (status == 0x90 and self.data[offset + 2] == 0)
+
+    # Encoded note-offs for the notes left sounding after the given
+    # messages
+    def _release_notes(self, indices: list[int]) -> list[bytes]:
+        sounding: dict[tuple[int, int], None] = {}
+        data = self.data
+        for i in indices:
+            offset = self.offsets[i]
+            status = data[offset]
+            if status & 0xf0 not in (0x80, 0x90):
+                continue
+            key = (status & 0x0f, data[offset + 1])
+            if self._is_note_off(i):
+                _ = sounding.pop(key, None)
+            else:
+                sounding[key] = None
+        return [bytes((0x80 | channel, note, 0)) for channel, note in sounding]
+
+    # Indices of the last message before message end setting each
+    # controller, program or pitch bend on each channel
+    def _channel_state(self, end: int) -> list[int]:
+        latest: dict[tuple[int, int], int] = {}
+        data = self.data
+        offsets = self.offsets
+        for i in range(end):
+            offset = offsets[i]
+            status = data[offset]
+            match status & 0xf0:
+                case 0xb0:
+                    latest[(status, data[offset + 1])] = i
+                case 0xc0 | 0xe0:
+                    latest[(status, -1)] = i
+                case _:
+                    pass
+        return sorted(latest.values())
+
+
+# Lateness of messages in nanoseconds relative to their deadlines:
+# jitter is the standard deviation of the lateness
+@dataclass(frozen=True)
+class TimingStats:
+    message_count: int
+    mean_error_ns: float
+    p50_error_ns: int
+    p90_error_ns: int
+    p99_error_ns: int
+    max_error_ns: int
+    jitter_ns: float
+    elapsed_ns: int
+
+    @classmethod
+    def build(cls: type[Self], deadlines: Sequence[int], start_ns: int, times: Sequence[int]) -> Self:
+        errors = [
+            t - start_ns - deadline
+            for deadline, t in zip(deadlines, times, strict=True)
+        ]
+        if len(errors) == 0:
+            return cls(
+                message_count=0,
+                mean_error_ns=0.0,
+                p50_error_ns=0,
+                p90_error_ns=0,
+                p99_error_ns=0,
+                max_error_ns=0,
+                jitter_ns=0.0,
+                elapsed_ns=0)
+
+        def percentile(p: int) -> int:
+            return sorted_errors[(len(sorted_errors) - 1) * p // 100]
+
+        sorted_errors = sorted(errors)
+        return cls(
+            message_count=len(errors),
+            mean_error_ns=fmean(errors),
+            p50_error_ns=percentile(50),
+            p90_error_ns=percentile(90),
+            p99_error_ns=percentile(99),
+            max_error_ns=sorted_errors[-1],
+            jitter_ns=pstdev(errors),
+            elapsed_ns=times[-1] - start_ns)
+
+    # Messages per second
+    @property
+    def throughput(self) -> float:
+        if self.elapsed_ns == 0:
+            return 0.0
+        return self.message_count * 1_000_000_000 / self.elapsed_ns
+
+
+# Clock readings taken when playback started and just before each
+# message was sent
+@dataclass(frozen=True)
+class PlaybackRun:
+    start_ns: int
+    send_ns: array[int]
+
+    def stats(self, schedule: PlaybackSchedule) -> TimingStats:
+        return TimingStats.build(schedule.deadlines, self.start_ns, self.send_ns)
+
+
+@contextmanager
+def paused_gc(pause: bool = True) -> Generator[None, None, None]:
+    was_enabled = gc.isenabled()
+    if pause and was_enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if pause and was_enabled:
+            gc.enable()
+
+
+# Sleeps until shortly before each deadline and then spins on the clock.
+# Deadlines are absolute so lateness never accumulates: the spin window
+# also grows to cover the worst recent oversleep of the OS timer
+def play_schedule(schedule: PlaybackSchedule, send: Callable[[bytes], None], pause_gc: bool = True, spin_ns: int = DEFAULT_SPIN_NS, clock: Callable[[], int] = time.perf_counter_ns, sleep: Callable[[float], None] = time.sleep) -> PlaybackRun:
+    data = schedule.data
+    offsets = schedule.offsets
+    send_ns = array("q")
+    oversleep_ns = 0
+    with paused_gc(pause_gc):
+        start = clock()
+        for i, deadline in enumerate(schedule.deadlines):
+            target = start + deadline
+            now = clock()
+
+            wake = target - spin_ns - oversleep_ns
+            if wake > now:
+                sleep((wake - now) / 1_000_000_000)
+                now = clock()
+                oversleep_ns = max(
+                    now - wake,
+                    oversleep_ns - (oversleep_ns >> OVERSLEEP_DECAY_SHIFT))
+
+            while now < target:
+                now = clock()
+
+            send(data[offsets[i]:offsets[i + 1]])
+            send_ns.append(now)
+
+    return PlaybackRun(start_ns=start, send_ns=send_ns)
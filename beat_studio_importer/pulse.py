@@ -20,7 +20,9 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
-from beat_studio_importer.tempos import Bpm, MidiTempo, midi_tempo_to_qpm
+from beat_studio_importer.enum_util import enum_index
+from beat_studio_importer.tempos import Bpm, MidiTempo, midi_tempo_to_bpm
+from collections.abc import Mapping
 from enum import Enum, auto, unique
 from fractions import Fraction
 from typing import Literal, overload
@@ -66,17 +68,16 @@ class Pulse(Enum):
 
     @staticmethod
     def from_multiplier(value: Fraction, allow_fraction: bool = False) -> "Pulse | Fraction":
-        for member in Pulse:
-            if member.multiplier == value:
-                return member
+        member = _MEMBERS_BY_MULTIPLIER.get(value)
+        if member is not None:
+            return member
         if allow_fraction:
             return value
         raise NotImplementedError(f"Unsupported fraction {value}")
 
     # Tempo as beats (pulses) per minute
     def midi_tempo_to_bpm(self, tempo: MidiTempo) -> Bpm:
-        qpm = midi_tempo_to_qpm(tempo)
-        return Bpm(qpm / self.multiplier)
+        return midi_tempo_to_bpm(tempo, self.multiplier)
 
     @property
     def multiplier(self) -> Fraction: return self.value[1]
@@ -101,7 +102,7 @@ class Pulse(Enum):
         ...
 
     def dotted(self, allow_fraction: bool = False) -> "Pulse | Fraction":
-        return self.__class__.from_multiplier(Fraction(3, 2) * self.multiplier, allow_fraction=allow_fraction)
+        return _checked(_DOTTED[self], allow_fraction)
 
     @overload
     def compound(self) -> "Pulse":
@@ -120,4 +121,29 @@ class Pulse(Enum):
         ...
 
     def compound(self, allow_fraction: bool = False) -> "Pulse | Fraction":
-        return self.__class__.from_multiplier(Fraction(3, 1) * self.multiplier, allow_fraction=allow_fraction)
+        return _checked(_COMPOUND[self], allow_fraction)
+
+
+def _checked(value: Pulse | Fraction, allow_fraction: bool) -> Pulse | Fraction:
+    if isinstance(value, Fraction) and not allow_fraction:
+        raise NotImplementedError(f"Unsupported fraction {value}")
+    return value
+
+
+_MEMBERS_BY_MULTIPLIER: Mapping[object, Pulse] = \
+    enum_index(Pulse, "multiplier")
+
+# Dotted and compound pulses computed once for each member
+_DOTTED: dict[Pulse, Pulse | Fraction] = {
+    member: Pulse.from_multiplier(
+        Fraction(3, 2) * member.multiplier,
+        allow_fraction=True)
+    for member in Pulse
+}
+
+_COMPOUND: dict[Pulse, Pulse | Fraction] = {
+    member: Pulse.from_multiplier(
+        Fraction(3, 1) * member.multiplier,
+        allow_fraction=True)
+    for member in Pulse
+}
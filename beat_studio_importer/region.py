@@ -30,12 +30,14 @@ from beat_studio_importer.misc import MidiNote, Ppqn, RegionId, Tick
 from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
 from beat_studio_importer.note_value import NoteValue
 from beat_studio_importer.quantize_util import quantize
-from beat_studio_importer.tempos import Bpm, MidiTempo, Qpm, midi_tempo_to_qpm, qpm_to_midi_tempo
-from beat_studio_importer.time_signature import Numerator, TimeSignature
+from beat_studio_importer.region_summary import RegionSummary
+from beat_studio_importer.tempo_map import DEFAULT_MIDI_TEMPO
+from beat_studio_importer.tempos import Bpm, MidiTempo, Qpm, midi_tempo_to_qpm
+from beat_studio_importer.time_signature import DEFAULT_TIME_SIGNATURE, TimeSignature
 from beat_studio_importer.timeline import Timeline
+from bisect import bisect_right
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from fractions import Fraction
 from functools import cached_property
 from logging import Logger
 from typing import Self, cast
@@ -45,12 +47,6 @@ import logging
 LOGGER: Logger = logging.getLogger(__name__)
 
 
-DEFAULT_MIDI_TEMPO: MidiTempo = qpm_to_midi_tempo(Qpm(Fraction(120)))
-DEFAULT_TIME_SIGNATURE: TimeSignature = TimeSignature(
-    numerator=Numerator(4),
-    denominator=NoteValue.QUARTER)
-
-
 @dataclass(frozen=True)
 class Region:
     id: RegionId
@@ -107,11 +103,29 @@ class Region:
         state.close_region(None)
         return state.regions
 
+    # Region containing the given tick, if any
+    @staticmethod
+    def find[R: Region](regions: list[R], tick: Tick) -> R | None:
+        i = bisect_right(regions, tick, key=lambda r: r.start_tick) - 1
+        if i < 0 or tick >= regions[i].end_tick:
+            return None
+        return regions[i]
+
+    @cached_property
+    def summary(self) -> RegionSummary:
+        return RegionSummary(
+            id=self.id,
+            ppqn=self.ppqn,
+            start_tick=self.start_tick,
+            end_tick=self.end_tick,
+            tempo=self.tempo,
+            time_signature=self.time_signature,
+            note_count=len(self.notes),
+            bar_count=self.bar_count)
+
     @cached_property
     def descriptor(self) -> Descriptor:
-        return Descriptor(
-            name=None,
-            description=f"{self.start_tick}-{self.end_tick}: {self.qpm:.1f}qpm, {self.bpm:.1f}bpm, {self.time_signature}, {self.bar_count} bars")
+        return self.summary.descriptor
 
     # Tempo as quarter notes per minute
     @cached_property
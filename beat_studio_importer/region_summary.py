@@ -0,0 +1,57 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.descriptor import Descriptor
+from beat_studio_importer.misc import Ppqn, RegionId, Tick
+from beat_studio_importer.tempos import Bpm, MidiTempo, Qpm, midi_tempo_to_qpm
+from beat_studio_importer.time_signature import TimeSignature
+from dataclasses import dataclass
+from functools import cached_property
+
+
+# Everything about a region except its notes
+@dataclass(frozen=True)
+class RegionSummary:
+    id: RegionId
+    ppqn: Ppqn  # ticks per beat, ppqn, tpqn etc.
+    start_tick: Tick
+    end_tick: Tick
+    tempo: MidiTempo
+    time_signature: TimeSignature
+    note_count: int
+    bar_count: int
+
+    @cached_property
+    def descriptor(self) -> Descriptor:
+        return Descriptor(
+            name=None,
+            description=f"{self.start_tick}-{self.end_tick}: {self.qpm:.1f}qpm, {self.bpm:.1f}bpm, {self.time_signature}, {self.bar_count} bars")
+
+    # Tempo as quarter notes per minute
+    @cached_property
+    def qpm(self) -> Qpm:
+        return midi_tempo_to_qpm(self.tempo)
+
+    # Tempo as beats (pulses) per minute
+    @cached_property
+    def bpm(self) -> Bpm:
+        return self.time_signature.pulse.midi_tempo_to_bpm(self.tempo)
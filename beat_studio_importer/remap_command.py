@@ -20,22 +20,69 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.batch_remap import RemapStatus, RemapSummary, remap_corpus
+from beat_studio_importer.constants import DRUM_CHANNEL
+from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+from beat_studio_importer.midi_transform import MidiTransform, transform_file
+from beat_studio_importer.path_util import is_multi_path
+from beat_studio_importer.table import Table
+from beat_studio_importer.ui import cprint
 from beat_studio_importer.user_error import UserError
-from mido import MidiFile
+from colorama import Fore
 from pathlib import Path
+import sys
 
 
-def do_remap(path: Path, output_path: Path) -> None:
+# Channel, note and velocity changes are applied together in a single
+# pass over each file
+def do_remap(path: Path, output_path: Path, jobs: int | None = None, note_name_map: MidiNoteNameMap | None = None, velocity_scale: float = 1.0, velocity_offset: int = 0) -> None:
+    transform = MidiTransform.build(
+        channel=DRUM_CHANNEL,
+        note_name_map=note_name_map,
+        velocity_scale=velocity_scale,
+        velocity_offset=velocity_offset)
+
+    if is_multi_path(path):
+        summary = remap_corpus(
+            path=path,
+            output_dir=output_path,
+            progress=sys.stderr if sys.stderr.isatty() else None,
+            jobs=jobs,
+            transform=transform)
+        show_remap_summary(summary)
+        failure_count = summary.count(RemapStatus.FAILED)
+        if failure_count > 0:
+            raise UserError(f"{failure_count} of {len(summary.results)} remap(s) failed")
+        return
+
     if not path.is_file():
         raise UserError(f"Path {path} not found")
     if output_path.is_file():
         raise UserError(f"Output path {output_path} already exists")
 
-    file = MidiFile(path)
+    data = transform_file(path, transform)
+    with output_path.open("wb") as f:
+        _ = f.write(data)
+
 
-    for track in file.tracks:
-        for message in track:
-            if hasattr(message, "channel"):
-                message.channel = 9
+def show_remap_summary(summary: RemapSummary) -> None:
+    with Table((None, None, "{}", Fore.LIGHTBLUE_EX), (None, None, "{:>10}", Fore.LIGHTCYAN_EX), column_sep="  ") as table:
+        table.add_row("Files remapped", summary.count(RemapStatus.WRITTEN))
+        table.add_row("Files unchanged", summary.count(RemapStatus.UNCHANGED))
+        table.add_row("Files up to date", summary.count(RemapStatus.UP_TO_DATE))
+        table.add_row("Files failed", summary.count(RemapStatus.FAILED))
+        table.add_row("Elapsed (seconds)", f"{summary.elapsed:.3f}")
+        if summary.elapsed > 0:
+            table.add_row(
+                "Throughput (files per second)",
+                f"{len(summary.results) / summary.elapsed:.1f}")
+            table.add_row(
+                "Throughput (MB per second)",
+                f"{summary.total_size / summary.elapsed / 1_000_000:.2f}")
+        table.print()
 
-    file.save(output_path)
+    failures = summary.failures
+    if len(failures) > 0:
+        cprint(Fore.LIGHTRED_EX, f"Failed to remap {len(failures)} file(s):")
+        for result in failures:
+            cprint("  ", Fore.LIGHTRED_EX, result.path, ": ", result.error)
@@ -0,0 +1,78 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.console import colour_enabled
+from os import getenv
+from pathlib import Path
+from typing import cast
+import json
+import socket
+import sys
+
+
+# Commands run by the import server on behalf of clients
+SERVED_COMMANDS: tuple[str, ...] = ("import", "info")
+
+# Forward served commands to the server listening on this socket
+SOCKET_ENV_VAR: str = "BS_IMPORTER_SOCKET"
+
+
+# Requests and responses are each a single line of JSON:
+# {"cwd": ..., "argv": [...], "colour": ...} and {"exit_code": ...,
+# "stdout": ...,
+# "stderr": ...}
+def send_message(sock: socket.socket, obj: dict[str, object]) -> None:
+    sock.sendall(json.dumps(obj).encode() + b"\n")
+
+
+# Returns None if the connection was closed without a message
+def receive_message(sock: socket.socket) -> dict[str, object] | None:
+    with sock.makefile("rb") as f:
+        line = f.readline()
+    return None if len(line) == 0 else cast(dict[str, object], json.loads(line))
+
+
+def server_socket_path() -> Path | None:
+    s = getenv(SOCKET_ENV_VAR)
+    return None if s is None or len(s) == 0 else Path(s)
+
+
+# Runs the command on the server, copying its output to stdout and
+# stderr, and returns its exit code, or None if no server is listening
+def forward_to_server(socket_path: Path, cwd: Path, argv: list[str]) -> int | None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        send_message(sock, {
+            "cwd": str(cwd),
+            "argv": argv,
+            "colour": colour_enabled(sys.stdout)
+        })
+        response = receive_message(sock)
+
+    if response is None:
+        raise ConnectionError(f"Server on {socket_path} closed connection")
+    _ = sys.stdout.write(cast(str, response["stdout"]))
+    _ = sys.stderr.write(cast(str, response["stderr"]))
+    return cast(int, response["exit_code"])
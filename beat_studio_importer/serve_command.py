@@ -0,0 +1,134 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.cache_util import default_cache_dir
+from beat_studio_importer.console import colour_override
+from beat_studio_importer.parallel_util import describe_error
+from beat_studio_importer.serve_client import SERVED_COMMANDS, receive_message, send_message
+from beat_studio_importer.ui import print_key_value
+from beat_studio_importer.user_error import UserError
+from collections.abc import Callable
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+from socketserver import BaseRequestHandler, UnixStreamServer
+from typing import cast
+import os
+import signal
+import socket
+import sys
+
+
+# Runs a command line with the given working directory and arguments
+type RunCommand = Callable[[Path, list[str]], None]
+
+
+def default_socket_path() -> Path:
+    return default_cache_dir() / "server.sock"
+
+
+# Runs a served command with its output captured and returns the
+# response to send to the client: prompts read from an empty stdin so
+# commands that need user input fail instead of blocking the server and
+# output is coloured only if the client's stdout would be
+def handle_request(request: dict[str, object], run: RunCommand) -> dict[str, object]:
+    cwd = Path(cast(str, request["cwd"]))
+    argv = cast(list[str], request["argv"])
+    colour = cast(bool | None, request.get("colour"))
+    if len(argv) == 0 or argv[0] not in SERVED_COMMANDS:
+        return {
+            "exit_code": 1,
+            "stdout": "",
+            "stderr": f"Server only runs commands {', '.join(SERVED_COMMANDS)}\n"
+        }
+
+    stdout = StringIO()
+    stderr = StringIO()
+    exit_code = 0
+    saved_stdin = sys.stdin
+    sys.stdin = StringIO()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr), colour_override(colour):
+            try:
+                run(cwd, argv)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+            except EOFError:
+                print("Command requires user input: specify all options", file=sys.stderr)
+                exit_code = 1
+            except Exception as e:
+                print(describe_error(e), file=sys.stderr)
+                exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue()
+    }
+
+
+# Handles one request per connection, one connection at a time, so that
+# commands never run concurrently: note maps, parsed MIDI files and
+# imported modules stay loaded between requests
+class ImportServer(UnixStreamServer):
+    def __init__(self, socket_path: Path, run: RunCommand) -> None:
+        self.run: RunCommand = run
+        super().__init__(str(socket_path), _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+
+class _RequestHandler(BaseRequestHandler):
+    def handle(self) -> None:
+        server = cast(ImportServer, self.server)
+        sock = cast(socket.socket, self.request)
+        request = receive_message(sock)
+        if request is not None:
+            send_message(sock, handle_request(request, server.run))
+
+
+def do_serve(socket_path: Path, run: RunCommand) -> None:
+    if socket_path.exists():
+        if not socket_path.is_socket():
+            raise UserError(f"Path {socket_path} exists and is not a socket")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(socket_path))
+                raise UserError(f"Server already listening on {socket_path}")
+            except ConnectionRefusedError:
+                # Left behind by a server that did not shut down cleanly
+                socket_path.unlink()
+
+    # Exit through the finally block so the socket is removed
+    def terminate(signum: int, frame: object) -> None:
+        sys.exit(0)
+
+    _ = signal.signal(signal.SIGTERM, terminate)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with ImportServer(socket_path, run) as server:
+            print_key_value("Listening on", socket_path)
+            sys.stdout.flush()
+            server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
@@ -20,9 +20,12 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.console import is_plain
+from collections.abc import Sequence
 from colorama import Style
 from types import TracebackType
 from typing import TYPE_CHECKING
+import sys
 
 
 if TYPE_CHECKING:
@@ -32,13 +35,22 @@ if TYPE_CHECKING:
 type Colour = object
 
 
+# Rows are held until print by default so that every column is as wide
+# as its widest value. Tables with sample_size set stream instead: the
+# first sample_size rows fix the column widths, together with headers
+# and any declared minimum widths, and are written as soon as there are
+# enough of them, after which each row is written as it is added and
+# longer values overflow their columns
 class Table:
-    def __init__(self, *columns: str | None | tuple[str | None, Colour, str, Colour], column_sep: str = "|") -> None:
+    def __init__(self, *columns: str | None | tuple[str | None, Colour, str, Colour], column_sep: str = "|", sample_size: int | None = None, widths: Sequence[int] | None = None, file: "SupportsWrite[str] | None" = None) -> None:
         self._column_sep: str = column_sep
+        self._sample_size: int | None = sample_size
+        self._file: "SupportsWrite[str] | None" = file
+        self._streaming: bool = False
 
         # (header, header_colour, value_format, value_colour, width)
         self._meta: list[tuple[str | None, Colour, str, Colour, int]] = []
-        for column in columns:
+        for i, column in enumerate(columns):
             match column:
                 case None:
                     header = None
@@ -60,8 +72,12 @@ class Table:
                 header_colour,
                 value_format,
                 value_colour,
-                0 if header is None else len(header)))
+                max(
+                    0 if header is None else len(header),
+                    0 if widths is None or i >= len(widths) else widths[i])))
         self._rows: list[list[str]] = []
+        if sample_size == 0:
+            self._start_streaming()
 
     def __enter__(self) -> "Table":
         return self
@@ -72,16 +88,20 @@ class Table:
     def add_row(self, *values: object) -> None:
         value_count = len(values)
         column_count = len(self._meta)
-        if value_count > column_count:
+        if value_count > column_count and not self._streaming:
             self._meta += [(None, None,  "{}", None, 0)] * \
                 (value_count - column_count)
 
         row: list[str] = []
         for i, value in enumerate(values):
+            if i >= len(self._meta):
+                # Column added after widths were fixed
+                row.append(str(value))
+                continue
             header, header_colour, value_format, value_colour, width = self._meta[i]
             s = value_format.format(value)
             s_len = len(s)
-            if s_len > width:
+            if s_len > width and not self._streaming:
                 self._meta[i] = (
                     header,
                     header_colour,
@@ -90,40 +110,57 @@ class Table:
                     s_len
                 )
             row.append(s)
-        self._rows.append(row)
 
-    def print(self, file: "SupportsWrite[str] | None" = None) -> None:
-        def pad(values: list[str]) -> list[str]:
-            def render(meta: tuple[str | None, Colour, str, Colour, int], value: str) -> str:
-                _, _, _, value_colour, width = meta
-                s = value.ljust(width)
-                if value_colour is None:
-                    return s
-                else:
-                    return str(value_colour) + s + Style.RESET_ALL
-
-            value_count = len(values)
-            temp_values = values
-            if value_count < column_count:
-                temp_values += [""] * (column_count - value_count)
-
-            return [
-                render(meta, value)
-                for meta, value in zip(self._meta, temp_values)
-            ]
+        if self._streaming:
+            self._write(self._file, [row], header=False)
+        else:
+            self._rows.append(row)
+            if self._sample_size is not None and len(self._rows) >= self._sample_size:
+                self._start_streaming()
 
+    # Writes the table or, for a streaming table, any rows not yet
+    # written: a streaming table is written to the file passed to the
+    # constructor
+    def print(self, file: "SupportsWrite[str] | None" = None) -> None:
+        if self._sample_size is None:
+            self._write(file, self._rows, header=True)
+        elif not self._streaming:
+            self._start_streaming()
+
+    def _start_streaming(self) -> None:
+        self._write(self._file, self._rows, header=True)
+        self._rows = []
+        self._streaming = True
+
+    def _write(self, file: "SupportsWrite[str] | None", rows: list[list[str]], header: bool) -> None:
+        out = sys.stdout if file is None else file
+        colour = not is_plain(out)
         column_count = len(self._meta)
 
-        has_headers = any(map(lambda meta: meta[0] is not None, self._meta))
-        if has_headers:
+        def render(meta: tuple[str | None, Colour, str, Colour, int], value: str) -> str:
+            _, _, _, value_colour, width = meta
+            s = value.ljust(width)
+            if not colour or value_colour is None:
+                return s
+            else:
+                return str(value_colour) + s + Style.RESET_ALL
+
+        lines: list[str] = []
+        if header and any(map(lambda meta: meta[0] is not None, self._meta)):
             headers: list[str] = []
-            for meta in self._meta:
-                header, header_colour, _, _, width = meta
-                s = ("" if header is None else header).ljust(width)
-                if header_colour is not None:
+            for header_text, header_colour, _, _, width in self._meta:
+                s = ("" if header_text is None else header_text).ljust(width)
+                if colour and header_colour is not None:
                     s = str(header_colour) + s + Style.RESET_ALL
-                headers.append(s.ljust(width))
-            print(*headers, sep=self._column_sep, file=file)
+                headers.append(s)
+            lines.append(self._column_sep.join(headers))
+
+        for row in rows:
+            values = row + [""] * (column_count - len(row))
+            lines.append(self._column_sep.join(
+                render(meta, value)
+                for meta, value in zip(self._meta, values)) +
+                "".join(self._column_sep + value for value in values[column_count:]))
 
-        for row in self._rows:
-            print(*pad(row), sep=self._column_sep, file=file)
+        if len(lines) > 0:
+            _ = out.write("\n".join(lines) + "\n")
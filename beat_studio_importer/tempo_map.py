@@ -0,0 +1,89 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.events import TempoEvent
+from beat_studio_importer.misc import Ppqn, Tick
+from beat_studio_importer.tempos import MidiTempo, Qpm, qpm_to_midi_tempo
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from fractions import Fraction
+from math import floor
+from typing import Self
+
+
+# MIDI files without a tempo event play at 120 QPM
+DEFAULT_MIDI_TEMPO: MidiTempo = qpm_to_midi_tempo(Qpm(Fraction(120)))
+
+
+# Piecewise-linear mapping between ticks and time: positions are kept
+# in units of microseconds * PPQN so that they remain exact integers
+@dataclass(frozen=True)
+class TempoMap:
+    ppqn: Ppqn
+    # Tick of each tempo change: the first is always 0
+    ticks: list[Tick]
+    tempos: list[MidiTempo]
+    # Time of each tempo change in microseconds * PPQN
+    positions: list[int]
+
+    @classmethod
+    def build(cls: type[Self], ppqn: Ppqn, events: Iterable[TempoEvent]) -> Self:
+        ticks = [Tick(0)]
+        tempos = [DEFAULT_MIDI_TEMPO]
+        positions = [0]
+        for e in events:
+            if e.tick == ticks[-1]:
+                # Later tempo event at same tick wins
+                tempos[-1] = e.tempo
+                continue
+            assert e.tick > ticks[-1], "tempo events out of order"
+            positions.append(positions[-1] + (e.tick - ticks[-1]) * tempos[-1])
+            ticks.append(e.tick)
+            tempos.append(e.tempo)
+        return cls(ppqn=ppqn, ticks=ticks, tempos=tempos, positions=positions)
+
+    def tick_to_microseconds(self, tick: Tick) -> Fraction:
+        if tick < 0:
+            raise ValueError(f"Invalid tick {tick}")
+        i = bisect_right(self.ticks, tick) - 1
+        position = self.positions[i] + (tick - self.ticks[i]) * self.tempos[i]
+        return Fraction(position, self.ppqn)
+
+    # Whole nanoseconds, rounded down, for scheduling
+    def tick_to_nanoseconds(self, tick: Tick) -> int:
+        if tick < 0:
+            raise ValueError(f"Invalid tick {tick}")
+        i = bisect_right(self.ticks, tick) - 1
+        position = self.positions[i] + (tick - self.ticks[i]) * self.tempos[i]
+        return position * 1000 // self.ppqn
+
+    def tick_to_seconds(self, tick: Tick) -> Fraction:
+        return self.tick_to_microseconds(tick) / 1_000_000
+
+    # Returns the last tick at or before the given time
+    def seconds_to_tick(self, seconds: Fraction | float) -> Tick:
+        if seconds < 0:
+            raise ValueError(f"Invalid time {seconds}")
+        position = Fraction(seconds) * 1_000_000 * self.ppqn
+        i = bisect_right(self.positions, position) - 1
+        return Tick(self.ticks[i] + floor((position - self.positions[i]) / self.tempos[i]))
@@ -20,8 +20,8 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
-
 from fractions import Fraction
+from functools import lru_cache
 from typing import NewType
 
 
@@ -39,6 +39,13 @@ MidiTempo = NewType("MidiTempo", int)
 Qpm = NewType("Qpm", Fraction)
 
 
+MICROSECONDS_PER_MINUTE: int = 60_000_000
+
+# Files rarely use more than a handful of distinct tempos
+TEMPO_CACHE_SIZE: int = 4096
+
+
+@lru_cache(maxsize=TEMPO_CACHE_SIZE)
 def midi_tempo_to_qpm(tempo: MidiTempo) -> Qpm:
     """
     Convert MIDI tempo to QPM tempo. Conversion to BPM tempo
@@ -49,8 +56,32 @@ def midi_tempo_to_qpm(tempo: MidiTempo) -> Qpm:
     :return: Tempo in quarter notes per minute
     :rtype: Fraction
     """
-    return Qpm(Fraction(60_000_000, tempo))
+    return Qpm(Fraction(MICROSECONDS_PER_MINUTE, tempo))
+
+
+@lru_cache(maxsize=TEMPO_CACHE_SIZE)
+def midi_tempo_to_bpm(tempo: MidiTempo, pulse_multiplier: Fraction) -> Bpm:
+    return Bpm(midi_tempo_to_qpm(tempo) / pulse_multiplier)
+
+
+def midi_tempo_to_rounded_qpm(tempo: MidiTempo) -> int:
+    """
+    Same as round(midi_tempo_to_qpm(tempo)), including rounding half
+    to even, using integer arithmetic only.
+    """
+    q, r = divmod(MICROSECONDS_PER_MINUTE, tempo)
+    if 2 * r > tempo or (2 * r == tempo and q % 2 == 1):
+        return q + 1
+    return q
+
+
+def is_qpm_in_range(tempo: MidiTempo, min: int, max: int) -> bool:
+    """
+    Same as min <= midi_tempo_to_qpm(tempo) <= max without constructing
+    a fraction.
+    """
+    return tempo * min <= MICROSECONDS_PER_MINUTE <= tempo * max
 
 
 def qpm_to_midi_tempo(qpm: Qpm) -> MidiTempo:
-    return MidiTempo(round(60_000_000 / qpm))
+    return MidiTempo(round(MICROSECONDS_PER_MINUTE / qpm))
@@ -25,7 +25,7 @@ from beat_studio_importer.pulse import Pulse
 from beat_studio_importer.tempos import Bpm, MidiTempo
 from dataclasses import dataclass
 from functools import cached_property
-from typing import NewType, override
+from typing import NewType, Self, override
 
 
 Numerator = NewType("Numerator", int)
@@ -36,6 +36,15 @@ class TimeSignature:
     numerator: Numerator
     denominator: NoteValue
 
+    @classmethod
+    def parse(cls: type[Self], s: str) -> Self:
+        parts = s.split("/")
+        if len(parts) != 2:
+            raise ValueError(f"Invalid time signature {s}")
+        return cls(
+            numerator=Numerator(int(parts[0])),
+            denominator=NoteValue.from_int(int(parts[1])))
+
     @override
     def __repr__(self) -> str:
         return f"{self.numerator}/{self.denominator.int_value}"
@@ -64,3 +73,8 @@ class TimeSignature:
     # Tempo as beats (pulses) per minute
     def midi_tempo_to_bpm(self, tempo: MidiTempo) -> Bpm:
         return self.pulse.midi_tempo_to_bpm(tempo)
+
+
+DEFAULT_TIME_SIGNATURE: TimeSignature = TimeSignature(
+    numerator=Numerator(4),
+    denominator=NoteValue.QUARTER)
@@ -23,9 +23,12 @@
 from beat_studio_importer.events import Event, NoteEvent, TempoEvent, TimeSignatureEvent
 from beat_studio_importer.misc import MidiChannel, MidiNote, MidiVelocity, Ppqn, Tick
 from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.tempo_map import TempoMap
 from beat_studio_importer.tempos import MidiTempo
 from beat_studio_importer.time_signature import Numerator, TimeSignature
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import cached_property
 from logging import Logger
 from mido import Message, MetaMessage, MidiFile
 from typing import Self
@@ -112,3 +115,14 @@ class Timeline:
             events.append((slot_tick, slot_events))
 
         return cls(ppqn=Ppqn(file.ticks_per_beat), events=events)
+
+    @property
+    def tempo_events(self) -> Iterator[TempoEvent]:
+        for _, events in self.events:
+            for e in events:
+                if isinstance(e, TempoEvent):
+                    yield e
+
+    @cached_property
+    def tempo_map(self) -> TempoMap:
+        return TempoMap.build(self.ppqn, self.tempo_events)
@@ -21,14 +21,20 @@
 #
 
 from beat_studio_importer.user_error import UserError
-from beat_studio_importer.region import Region
+from beat_studio_importer.console import is_plain
 from beat_studio_importer.descriptor import HasDescriptor
 from colorama import Fore, Style
 from pathlib import Path
+import sys
 
 
 def cprint(*values: object, sep: str | None = "", end: str | None = "\n") -> None:
-    print(*values, Style.RESET_ALL, sep=sep, end=end)
+    if is_plain(sys.stdout):
+        # One write per line: the plain writer removes the colour codes
+        _ = sys.stdout.write(
+            (" " if sep is None else sep).join(map(str, values)) + ("\n" if end is None else end))
+    else:
+        print(*values, Style.RESET_ALL, sep=sep, end=end)
 
 
 def print_key_value(name: str, value: object) -> None:
@@ -40,7 +46,7 @@ def print_key_value(name: str, value: object) -> None:
         value)
 
 
-def select_region(path: Path, regions: list[Region], region_id: int | None) -> Region:
+def select_region[R: HasDescriptor](path: Path, regions: list[R], region_id: int | None) -> R:
     if region_id is None:
         match len(regions):
             case 0: raise UserError(f"No regions in {path}")
@@ -52,7 +58,7 @@ def select_region(path: Path, regions: list[Region], region_id: int | None) -> R
         return regions[region_id - 1]
 
 
-def select_region_interactive(path: Path, regions: list[Region]) -> Region:
+def select_region_interactive[R: HasDescriptor](path: Path, regions: list[R]) -> R:
     return select_interactive(path, regions, "regions", "region")
 
 
@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from array import array
+from beat_studio_importer.constants import VIRTUAL_PORT_NAME
+from collections.abc import Callable
+from mido import Message
+from mido.ports import BaseOutput
+from pathlib import Path
+from typing import Self
+import time
+
+
+def is_virtual_port_name(name: str | None) -> bool:
+    return name is not None and \
+        (name == VIRTUAL_PORT_NAME or name.startswith(f"{VIRTUAL_PORT_NAME}:"))
+
+
+# Records the raw bytes of each message with a high-resolution receive
+# timestamp: message i is data[offsets[i]:offsets[i + 1]]
+class VirtualOutput(BaseOutput):
+    def __init__(self, path: Path | None = None, clock: Callable[[], int] = time.perf_counter_ns) -> None:
+        self._path: Path | None = path
+        self._clock: Callable[[], int] = clock
+        self.timestamps: array[int] = array("q")
+        self.offsets: array[int] = array("Q", [0])
+        self.data: bytearray = bytearray()
+        super().__init__(VIRTUAL_PORT_NAME)
+
+    @classmethod
+    def open(cls: type[Self], name: str) -> Self:
+        _, sep, path_str = name.partition(":")
+        return cls(path=Path(path_str) if sep != "" and path_str != "" else None)
+
+    @property
+    def message_count(self) -> int:
+        return len(self.timestamps)
+
+    def message_bytes(self, i: int) -> bytes:
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]])
+
+    def send_bytes(self, data: bytes) -> None:
+        self.timestamps.append(self._clock())
+        self.data.extend(data)
+        self.offsets.append(len(self.data))
+
+    def _send(self, msg: Message) -> None:
+        self.send_bytes(msg.bin())
+
+    # One line per message: nanoseconds since the first message and the
+    # message bytes in hex
+    def _close(self) -> None:
+        if self._path is None:
+            return
+
+        start = self.timestamps[0] if self.message_count > 0 else 0
+        with self._path.open("wt") as f:
+            _ = f.write("".join(
+                f"{self.timestamps[i] - start} {self.message_bytes(i).hex(" ")}\n"
+                for i in range(self.message_count)))
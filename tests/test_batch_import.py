@@ -0,0 +1,198 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.__main__ import run_command
+from beat_studio_importer.beat_studio_tempo import BeatStudioTempo
+from beat_studio_importer.batch_import import ImportJob, JobStatus, add_patterns, do_import_paths, load_manifest, run_jobs
+from beat_studio_importer.misc import MidiChannel, RegionId
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.user_error import UserError
+from pathlib import Path
+import pytest
+import shutil
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+class TestLoadManifest:
+    def test_csv(self, tmp_path: Path) -> None:
+        path = tmp_path / "jobs.csv"
+        _ = path.write_text(
+            "path,channel,region,quantum,tempo,repeat,name\n"
+            "a.mid,10,2,8,100,1,first\n"
+            "b.mid,,,,,,\n")
+        jobs = load_manifest(path, {"channel": 1, "quantum": 16})
+        assert jobs == [
+            ImportJob(
+                path=tmp_path / "a.mid",
+                channel=MidiChannel(10),
+                region_id=RegionId(2),
+                quantum=NoteValue.EIGHTH,
+                override_tempo=BeatStudioTempo(100),
+                repeat=1,
+                name="first"),
+            ImportJob(
+                path=tmp_path / "b.mid",
+                channel=MidiChannel(1)),
+        ]
+
+    def test_yaml(self, tmp_path: Path) -> None:
+        path = tmp_path / "jobs.yaml"
+        _ = path.write_text(
+            "jobs:\n"
+            "  - path: a.mid\n"
+            "    note_map: drums.notemap\n"
+            "    discard_boundary_hits: true\n")
+        assert load_manifest(path, {}) == [
+            ImportJob(
+                path=tmp_path / "a.mid",
+                note_name_path=tmp_path / "drums.notemap",
+                discard_boundary_hits=True),
+        ]
+
+    @pytest.mark.parametrize("content", [
+        "path,colour\na.mid,red\n",
+        "channel\n10\n",
+        "path,channel\na.mid,17\n",
+        "path,quantum\na.mid,3\n",
+        "path\n",
+    ])
+    def test_invalid(self, tmp_path: Path, content: str) -> None:
+        path = tmp_path / "jobs.csv"
+        _ = path.write_text(content)
+        with pytest.raises(UserError):
+            _ = load_manifest(path, {})
+
+
+class TestRunJobs:
+    def test_run(self) -> None:
+        jobs = [
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(1), name="one"),
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", name="two"),
+            ImportJob(path=SAMPLES_DIR / "seven-eight.mid", name="three"),
+            ImportJob(path=SAMPLES_DIR / "missing.mid"),
+        ]
+        results = list(run_jobs(jobs, progress=None, worker_count=1))
+        assert [r.status for r in results] == [
+            JobStatus.RENDERED,
+            JobStatus.FAILED,
+            JobStatus.RENDERED,
+            JobStatus.FAILED,
+        ]
+        assert results[1].error == "2 regions in file: specify region or all"
+        assert results[0].pattern is not None and results[0].pattern.name == "one"
+
+    def test_add(self, tmp_path: Path) -> None:
+        patterns_path = tmp_path / "patterns.beat"
+        _ = patterns_path.write_text("")
+        jobs = [
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(1), name="one"),
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(1), name="one"),
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(2), name="ONE"),
+        ]
+        results = add_patterns(
+            list(run_jobs(jobs, progress=None, worker_count=1)),
+            patterns_path)
+        assert [r.status for r in results] == [
+            JobStatus.ADDED,
+            JobStatus.IDENTICAL_PATTERN_DEFINED,
+            JobStatus.PATTERN_NAME_IN_USE,
+        ]
+        assert patterns_path.read_text().count("[\"one\"") == 1
+
+        results = add_patterns(
+            list(run_jobs(jobs[:1], progress=None, worker_count=1)),
+            patterns_path)
+        assert [r.status for r in results] == [JobStatus.IDENTICAL_PATTERN_DEFINED]
+
+    def test_all_regions(self) -> None:
+        jobs = [
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", all=True),
+            ImportJob(path=SAMPLES_DIR / "seven-eight.mid", all=True),
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(2)),
+        ]
+        results = list(run_jobs(jobs, progress=None, worker_count=2))
+        assert [(r.index, r.region_id) for r in results] == [
+            (0, 1),
+            (0, 2),
+            (1, 1),
+            (2, 2),
+        ]
+        assert [r.pattern.name for r in results if r.pattern is not None] == [
+            "example-1 region 1",
+            "example-1 region 2",
+            "seven-eight region 1",
+            "example-1",
+        ]
+
+    @pytest.mark.parametrize("worker_count", [1, 2])
+    def test_interleaved(self, tmp_path: Path, worker_count: int) -> None:
+        patterns_path = tmp_path / "patterns.beat"
+        _ = patterns_path.write_text("")
+        jobs = [
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(1), name="a"),
+            ImportJob(path=SAMPLES_DIR / "example-3.mid", channel=MidiChannel(10), name="clash"),
+            ImportJob(path=SAMPLES_DIR / "example-1.mid", region_id=RegionId(2), name="clash"),
+        ]
+        results = list(run_jobs(jobs, progress=None, worker_count=worker_count))
+        assert [r.index for r in results] == [0, 1, 2]
+
+        # The earlier job in the manifest wins the name clash
+        results = add_patterns(results, patterns_path)
+        assert [r.status for r in results] == [
+            JobStatus.ADDED,
+            JobStatus.ADDED,
+            JobStatus.PATTERN_NAME_IN_USE,
+        ]
+        content = patterns_path.read_text()
+        assert content.index("[\"a\"") < content.index("[\"clash\" - 16")
+
+
+class TestDoImportPaths:
+    def test_glob(self, capsys: pytest.CaptureFixture[str]) -> None:
+        do_import_paths(
+            SAMPLES_DIR / "seven-*.mid",
+            defaults={"channel": 10},
+            add=False,
+            worker_count=1)
+        out = capsys.readouterr().out
+        assert "[\"seven-eight-remapped\" - " in out
+        assert out.index("seven-eight-remapped.mid") < out.index("seven-eight.mid")
+        assert "empty pattern skipped" in out
+
+    def test_failures(self, tmp_path: Path) -> None:
+        _ = (tmp_path / "bad.mid").write_bytes(b"not a MIDI file")
+        with pytest.raises(UserError, match="1 of 1 import"):
+            do_import_paths(tmp_path, defaults={}, add=False, worker_count=1)
+
+    def test_no_files(self, tmp_path: Path) -> None:
+        with pytest.raises(UserError, match="No MIDI files"):
+            do_import_paths(tmp_path, defaults={}, add=False, worker_count=1)
+
+
+class TestImportCommand:
+    def test_literal_glob_chars(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        path = tmp_path / "Groove [v2].mid"
+        _ = shutil.copy(SAMPLES_DIR / "example-1.mid", path)
+        run_command(tmp_path, ["import", str(path), "--region", "1", "--no-colour"])
+        assert "[\"Groove [v2]\" - " in capsys.readouterr().out
@@ -0,0 +1,130 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.batch_remap import RemapStatus, remap_corpus
+from beat_studio_importer.midi_transform import MidiTransform
+from beat_studio_importer.misc import MidiChannel
+from beat_studio_importer.remap_command import do_remap
+from beat_studio_importer.user_error import UserError
+from pathlib import Path
+import os
+import pytest
+import shutil
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+@pytest.fixture
+def corpus_dir(tmp_path: Path) -> Path:
+    corpus_dir = tmp_path / "corpus"
+    (corpus_dir / "sub").mkdir(parents=True)
+    _ = shutil.copy(SAMPLES_DIR / "seven-eight.mid", corpus_dir / "a.mid")
+    _ = shutil.copy(SAMPLES_DIR / "example-0.mid", corpus_dir / "sub" / "b.mid")
+    _ = (corpus_dir / "sub" / "c.mid").write_bytes(b"not MIDI")
+    return corpus_dir
+
+
+class TestRemapCorpus:
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_remap(self, tmp_path: Path, corpus_dir: Path, jobs: int) -> None:
+        output_dir = tmp_path / "output"
+        summary = remap_corpus(corpus_dir, output_dir, progress=None, jobs=jobs)
+
+        assert [(r.path.name, r.status) for r in summary.results] == [
+            ("a.mid", RemapStatus.WRITTEN),
+            ("b.mid", RemapStatus.WRITTEN),
+            ("c.mid", RemapStatus.FAILED),
+        ]
+        assert summary.failures[0].error is not None
+        assert (output_dir / "a.mid").read_bytes() == \
+            (SAMPLES_DIR / "seven-eight-remapped.mid").read_bytes()
+        assert (output_dir / "sub" / "b.mid").is_file()
+        assert not (output_dir / "sub" / "c.mid").exists()
+
+    def test_up_to_date(self, tmp_path: Path, corpus_dir: Path) -> None:
+        output_dir = tmp_path / "output"
+        _ = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+        assert [r.status for r in summary.results] == [RemapStatus.UP_TO_DATE]
+
+        # Output older than input forces a comparison of the content
+        stat = (corpus_dir / "a.mid").stat()
+        os.utime(output_dir / "a.mid", ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+        assert [r.status for r in summary.results] == [RemapStatus.UNCHANGED]
+
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+        assert [r.status for r in summary.results] == [RemapStatus.UP_TO_DATE]
+
+    def test_transform_changed(self, tmp_path: Path, corpus_dir: Path) -> None:
+        output_dir = tmp_path / "output"
+        quieter = MidiTransform.build(
+            channel=MidiChannel(10),
+            velocity_scale=0.5)
+        _ = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+        original = (output_dir / "a.mid").read_bytes()
+
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1, transform=quieter)
+        assert [r.status for r in summary.results] == [RemapStatus.WRITTEN]
+        assert (output_dir / "a.mid").read_bytes() != original
+
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1, transform=quieter)
+        assert [r.status for r in summary.results] == [RemapStatus.UP_TO_DATE]
+
+        summary = remap_corpus(corpus_dir / "*.mid", output_dir, progress=None, jobs=1)
+        assert [r.status for r in summary.results] == [RemapStatus.WRITTEN]
+        assert (output_dir / "a.mid").read_bytes() == original
+
+    def test_failures_not_stamped(self, tmp_path: Path, corpus_dir: Path) -> None:
+        output_dir = tmp_path / "output"
+        _ = remap_corpus(corpus_dir, output_dir, progress=None, jobs=1)
+        summary = remap_corpus(corpus_dir, output_dir, progress=None, jobs=1)
+        assert [r.status for r in summary.results] == [
+            RemapStatus.UNCHANGED,
+            RemapStatus.UNCHANGED,
+            RemapStatus.FAILED,
+        ]
+
+    def test_output_within_input(self, corpus_dir: Path) -> None:
+        output_dir = corpus_dir / "output"
+        _ = remap_corpus(corpus_dir, output_dir, progress=None, jobs=1)
+        summary = remap_corpus(corpus_dir, output_dir, progress=None, jobs=1)
+        assert len(summary.results) == 3
+        assert not (output_dir / "output").exists()
+
+    def test_no_files(self, tmp_path: Path) -> None:
+        with pytest.raises(UserError):
+            _ = remap_corpus(tmp_path / "*.mid", tmp_path / "output", progress=None)
+
+
+class TestDoRemap:
+    def test_failures(self, tmp_path: Path, corpus_dir: Path) -> None:
+        output_dir = tmp_path / "output"
+        with pytest.raises(UserError, match="1 of 3 remap"):
+            do_remap(corpus_dir, output_dir, jobs=1)
+        assert (output_dir / "a.mid").is_file()
+
+    def test_success(self, tmp_path: Path, corpus_dir: Path) -> None:
+        do_remap(corpus_dir / "*.mid", tmp_path / "output", jobs=1)
+        assert (tmp_path / "output" / "a.mid").is_file()
@@ -0,0 +1,114 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_library import read_library
+from beat_studio_importer.compact_command import do_compact
+from beat_studio_importer.user_error import UserError
+from io import StringIO
+from pathlib import Path
+import pytest
+
+
+LIBRARY: str = """# MIDI Drum Patterns Collection
+# Drums: CRASH, CRASH2, RIDE, HI-HAT, OPEN-HIHAT, KICK, SNARE, HI-TOM, MED-TOM, LOW-TOM
+
+["one" - 4 - 120 - 16 - 4/4]
+KICK : 5...
+SNARE: ..5.
+
+# Pattern two
+# Generated using beat-studio-importer (https://github.com/rcook/beat-studio-importer)
+["two" - 4 - 120 - 16 - 4/4]
+KICK : 5...
+# interleaved comment
+SNARE: ..5.
+RIDE : ....
+
+# Pattern three
+# Generated using beat-studio-importer (https://github.com/rcook/beat-studio-importer)
+["three" - 4 - 100 - 16 - 4/4]
+KICK : 5.5.
+
+# Trailing comment
+"""
+
+
+class TestReadLibrary:
+    def test_round_trip(self) -> None:
+        entries = list(read_library(StringIO(LIBRARY)))
+        assert len(entries) == 4
+        assert [e.has_pattern for e in entries] == [True, True, True, False]
+        assert "".join(e.render() for e in entries) == LIBRARY
+        assert [e.read().name for e in entries[:3]] == ["one", "two", "three"]
+
+    def test_content_digest(self) -> None:
+        one, two, three, _ = read_library(StringIO(LIBRARY))
+        assert one.read().content_digest == two.read().content_digest
+        assert one.read().content_digest != three.read().content_digest
+
+    def test_missing_header(self) -> None:
+        with pytest.raises(ValueError):
+            _ = list(read_library(StringIO("KICK : 5...\n")))
+
+
+class TestCompact:
+    @pytest.mark.parametrize("drop_generated_comments, expected", [
+        (False, LIBRARY.replace("""
+# Pattern two
+# Generated using beat-studio-importer (https://github.com/rcook/beat-studio-importer)
+["two" - 4 - 120 - 16 - 4/4]
+KICK : 5...
+# interleaved comment
+SNARE: ..5.
+RIDE : ....
+""", "")),
+        (True, """# MIDI Drum Patterns Collection
+# Drums: CRASH, CRASH2, RIDE, HI-HAT, OPEN-HIHAT, KICK, SNARE, HI-TOM, MED-TOM, LOW-TOM
+
+["one" - 4 - 120 - 16 - 4/4]
+KICK : 5...
+SNARE: ..5.
+
+["three" - 4 - 100 - 16 - 4/4]
+KICK : 5.5.
+
+# Trailing comment
+""")
+    ])
+    def test_compact(self, tmp_path: Path, drop_generated_comments: bool, expected: str) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(LIBRARY)
+        do_compact(path, drop_generated_comments=drop_generated_comments)
+        assert path.read_text() == expected
+        assert [p.name for p in tmp_path.iterdir()] == ["patterns.beat"]
+
+    @pytest.mark.parametrize("content", [
+        "KICK : 5...\n",
+        "[\"one\" - 4 - 120 - 16 - 4/4]\nKICK : 5..\n",
+    ])
+    def test_compact_invalid(self, tmp_path: Path, content: str) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(content)
+        with pytest.raises(UserError, match="Invalid pattern"):
+            do_compact(path, drop_generated_comments=False)
+        assert path.read_text() == content
+        assert [p.name for p in tmp_path.iterdir()] == ["patterns.beat"]
@@ -0,0 +1,280 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_note_name import BeatStudioNoteName
+from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
+from beat_studio_importer.beat_studio_tempo import BeatStudioTempo
+from beat_studio_importer.beat_studio_velocity import BeatStudioVelocity
+from beat_studio_importer.constants import BEAT_STUDIO_DEFAULT_TIME_SIGNATURE
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.time_signature import Numerator, TimeSignature
+from pathlib import Path
+from tests.util import benchmark, best_time
+import pytest
+
+
+PATTERN: str = """
+["example-1 region 2" - 28 - 100 - 16 - 7/8]
+CRASH     : ............................
+CRASH2    : ............................
+HI-HAT    : 5.5.5.5.5.5.5.5.5.5.5.......
+HI-TOM    : ........................55..
+KICK      : 5.....5.5...5.5.....5.......
+LOW-TOM   : ............................
+MED-TOM   : ..........................55
+OPEN-HIHAT: ............................
+RIDE      : ............................
+SNARE     : ....5.............5...55....
+"""
+
+
+# Original implementation of BeatStudioPattern.read used as a reference
+# for behaviour and speed
+def reference_read(header: str, lines: list[str]) -> BeatStudioPattern:
+    def translate_hit_char(c: str) -> BeatStudioVelocity | None:
+        return None if c == "." else BeatStudioVelocity(int(c))
+
+    if not header.startswith("[\"") or not header.endswith("]"):
+        raise ValueError(f"Invalid header {header}: brackets not found")
+
+    s = header[2:-1]
+
+    idx = s.find("\"")
+    if idx == -1:
+        raise ValueError(f"Invalid header {header}: no name found")
+
+    encoded_name = s[:idx]
+    name = encoded_name.replace("\\\"", "\"")
+
+    parts = list(filter(
+        lambda s: len(s) > 0,
+        map(lambda s: s.strip(), s[idx + 1:].split("-"))))
+    part_count = len(parts)
+
+    if not (3 <= part_count <= 4):
+        raise ValueError(
+            f"Invalid header {header}: unexpected number of values")
+
+    step_count = int(parts[0])
+    tempo = BeatStudioTempo(int(parts[1]))
+    quantum = NoteValue.from_int(int(parts[2]))
+
+    if part_count > 3:
+        parts = parts[3].split("/")
+        if len(parts) != 2:
+            raise ValueError(
+                f"Invalid header {header}: invalid time signature")
+
+        time_signature = TimeSignature(
+            numerator=Numerator(int(parts[0])),
+            denominator=NoteValue.from_int(int(parts[1])))
+    else:
+        time_signature = BEAT_STUDIO_DEFAULT_TIME_SIGNATURE
+
+    hits: dict[BeatStudioNoteName, list[BeatStudioVelocity | None]] = {}
+
+    is_empty = True
+
+    for line in lines:
+        parts = line.split(":")
+        if len(parts) != 2:
+            raise ValueError(f"Invalid pattern {line}: invalid format")
+        note_name = next(
+            (m for m in BeatStudioNoteName if m.display == parts[0].strip()),
+            None)
+        if note_name is None:
+            raise ValueError(
+                f"Invalid Beat Studio note name {parts[0].strip()}")
+        s = parts[1].strip()
+        if len(s) != step_count:
+            raise ValueError(f"Invalid pattern {line}: invalid step count")
+
+        hits[note_name] = [translate_hit_char(c) for c in s]
+        is_empty = is_empty and len(s.strip(".")) == 0
+
+    return BeatStudioPattern(
+        name=name,
+        tempo=tempo,
+        time_signature=time_signature,
+        quantum=quantum,
+        step_count=step_count,
+        hits=hits,
+        is_empty=is_empty)
+
+
+def make_library(pattern_count: int) -> str:
+    header, *lines = PATTERN.strip().splitlines()
+    body = "\n".join(lines)
+    return "\n\n".join(
+        f"# Pattern {i}\n{header.replace("region 2", f"pattern {i}")}\n{body}"
+        for i in range(pattern_count)) + "\n"
+
+
+def reference_load(path: Path) -> list[BeatStudioPattern]:
+    patterns: list[BeatStudioPattern] = []
+    header: str | None = None
+    lines: list[str] = []
+    for line in path.read_text().splitlines():
+        s = line.strip()
+        if len(s) == 0 or s.startswith("#"):
+            continue
+        if s.startswith("[") and s.endswith("]"):
+            if header is not None:
+                patterns.append(reference_read(header, lines))
+            header = s
+            lines = []
+        else:
+            lines.append(s)
+    if header is not None:
+        patterns.append(reference_read(header, lines))
+    return patterns
+
+
+class TestBeatStudioPattern:
+    def test_parse(self) -> None:
+        pattern = BeatStudioPattern.parse(PATTERN)
+        assert pattern.name == "example-1 region 2"
+        assert pattern.step_count == 28
+        assert pattern.tempo == 100
+        assert pattern.quantum is NoteValue.SIXTEENTH
+        assert repr(pattern.time_signature) == "7/8"
+        assert pattern.hits[BeatStudioNoteName.MED_TOM][-2:] == [5, 5]
+        assert pattern.hits[BeatStudioNoteName.MED_TOM][0] is None
+        assert not pattern.is_empty
+
+    def test_render(self) -> None:
+        pattern = BeatStudioPattern.parse(PATTERN)
+        assert pattern.render() == PATTERN.lstrip()
+        assert pattern.encode() == PATTERN.lstrip().encode()
+        assert BeatStudioPattern.parse(pattern.render()) == pattern
+
+    def test_render_partial(self) -> None:
+        pattern = BeatStudioPattern.parse(
+            "[\"name\" - 4 - 120 - 16]\nSNARE: ..5.\nKICK: 9...")
+        assert pattern.render() == \
+            "[\"name\" - 4 - 120 - 16 - 4/4]\nKICK : 9...\nSNARE: ..5.\n"
+
+    @pytest.mark.parametrize("header", [
+        "[\"name\" - 4 - 120 - 16 - 7/8]",
+        "[\"name\" - 4 - 120 - 16]",
+        "[\"name\"-4-120-16-3/4]",
+        "[\"name\"  -  4  -  120  -  16  -  3 / 4  ]",
+        "[\"name\" 4 - 120 - 16 - 3/4]",
+        "[\"name\" - - 4 - 120 - 16]",
+        "[\"\" - 4 - 120 - 16]",
+    ])
+    def test_header_matches_reference(self, header: str) -> None:
+        lines = ["KICK: 5.9.", "SNARE : ...."]
+        assert BeatStudioPattern.read(header, lines) == \
+            reference_read(header, lines)
+
+    @pytest.mark.parametrize("header, lines", [
+        ("\"name\" - 4 - 120 - 16]", []),
+        ("[\"name - 4 - 120 - 16]", []),
+        ("[\"name\" - 4 - 120]", []),
+        ("[\"na\\\"me\" - 4 - 120 - 16]", []),
+        ("[\"name\" - 4 - 120 - 16 - 7/8 - 1]", []),
+        ("[\"name\" - 4 - 120 - 16 - 7]", []),
+        ("[\"name\" - 4 - 300 - 16]", []),
+        ("[\"name\" - 4 - 120 - 12]", []),
+        ("[\"name\" - x - 120 - 16]", []),
+        ("[\"name\" - 4 - 120 - 16]", ["KICK 5..."]),
+        ("[\"name\" - 4 - 120 - 16]", ["KICK: 5...: 5..."]),
+        ("[\"name\" - 4 - 120 - 16]", ["BOOM: 5..."]),
+        ("[\"name\" - 4 - 120 - 16]", ["KICK: 5...."]),
+        ("[\"name\" - 4 - 120 - 16]", ["KICK: 5.0."]),
+        ("[\"name\" - 4 - 120 - 16]", ["KICK: 5.x."]),
+    ])
+    def test_errors_match_reference(self, header: str, lines: list[str]) -> None:
+        with pytest.raises(ValueError) as expected:
+            _ = reference_read(header, lines)
+        with pytest.raises(ValueError) as actual:
+            _ = BeatStudioPattern.read(header, lines)
+        assert str(actual.value) == str(expected.value)
+
+
+class TestLoadParallel:
+    def test_matches_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text("# Preamble\n\n" + make_library(200))
+        patterns = BeatStudioPattern.load_parallel(
+            path,
+            max_workers=4,
+            min_chunk_size=1024)
+        assert len(patterns) == 200
+        assert patterns == BeatStudioPattern.load(path)
+
+    def test_empty(self, tmp_path: Path) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text("")
+        assert BeatStudioPattern.load_parallel(path) == []
+
+    def test_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(
+            make_library(100) + "[\"bad\" - 4 - 120 - 16]\nKICK: 5..\n" + make_library(100))
+
+        with pytest.raises(ValueError) as expected:
+            _ = BeatStudioPattern.load(path)
+        with pytest.raises(ValueError) as actual:
+            _ = BeatStudioPattern.load_parallel(
+                path,
+                max_workers=4,
+                min_chunk_size=1024)
+        assert str(actual.value) == str(expected.value)
+
+
+class TestBeatStudioPatternBenchmark:
+    def test_load_reference(self, tmp_path: Path) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(make_library(1_000))
+        assert BeatStudioPattern.load(path) == reference_load(path)
+
+    @benchmark
+    @pytest.mark.parametrize("pattern_count", [1_000, 10_000, 100_000])
+    def test_load(self, tmp_path: Path, pattern_count: int) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(make_library(pattern_count))
+
+        patterns = BeatStudioPattern.load(path)
+        assert patterns == reference_load(path)
+
+        t = best_time(lambda: BeatStudioPattern.load(path))
+        reference_t = best_time(lambda: reference_load(path))
+        print(
+            f"\nload {pattern_count} patterns: {t:.3f}s "
+            f"(reference {reference_t:.3f}s, speedup {reference_t / t:.1f}x)")
+        assert t < reference_t
+
+    @benchmark
+    @pytest.mark.parametrize("pattern_count", [100_000, 500_000])
+    def test_load_parallel(self, tmp_path: Path, pattern_count: int) -> None:
+        path = tmp_path / "patterns.beat"
+        _ = path.write_text(make_library(pattern_count))
+
+        t = best_time(lambda: BeatStudioPattern.load(path), repeat=1)
+        parallel_t = best_time(
+            lambda: BeatStudioPattern.load_parallel(path),
+            repeat=1)
+        print(
+            f"\nload_parallel {pattern_count} patterns: {parallel_t:.3f}s "
+            f"(load {t:.3f}s, speedup {t / parallel_t:.1f}x)")
@@ -0,0 +1,157 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.__main__ import run_command
+from beat_studio_importer.console import ANSI_ESCAPE_RE, NO_COLOR_ENV_VAR, PlainWriter, colour_enabled, colour_override, console_output
+from beat_studio_importer.serve_command import handle_request
+from beat_studio_importer.table import Table
+from beat_studio_importer.ui import cprint, print_key_value
+from colorama import Fore, Style
+from io import StringIO
+from pathlib import Path
+import pytest
+import sys
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+class TtyStringIO(StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class TestPlainWriter:
+    def test_strips_colour(self) -> None:
+        out = StringIO()
+        writer = PlainWriter(out)
+        _ = writer.write(f"{Fore.LIGHTBLUE_EX}key: {Fore.LIGHTCYAN_EX}value{Style.RESET_ALL}\n")
+        assert out.getvalue() == ""
+        writer.flush()
+        assert out.getvalue() == "key: value\n"
+
+    def test_buffer_size(self) -> None:
+        out = StringIO()
+        writer = PlainWriter(out, buffer_size=8)
+        _ = writer.write("1234")
+        assert out.getvalue() == ""
+        _ = writer.write("5678")
+        assert out.getvalue() == "12345678"
+
+    def test_flush_first(self) -> None:
+        out = StringIO()
+        stdout = PlainWriter(out)
+        stderr = PlainWriter(out, buffer_size=0, flush_first=stdout)
+        _ = stdout.write("output\n")
+        _ = stderr.write("error\n")
+        assert out.getvalue() == "output\nerror\n"
+
+    def test_closed_stream(self) -> None:
+        out = StringIO()
+        writer = PlainWriter(out)
+        _ = writer.write("lost")
+        out.close()
+        writer.flush()
+        writer.close()
+        assert writer.closed
+
+
+class TestColourEnabled:
+    def test_terminal(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv(NO_COLOR_ENV_VAR, raising=False)
+        assert colour_enabled(TtyStringIO())
+        assert not colour_enabled(StringIO())
+        assert not colour_enabled(PlainWriter(TtyStringIO()))
+
+    def test_no_color(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(NO_COLOR_ENV_VAR, "1")
+        assert not colour_enabled(TtyStringIO())
+
+    def test_override(self) -> None:
+        with colour_override(True):
+            assert colour_enabled(StringIO())
+        assert not colour_enabled(StringIO())
+
+
+class TestConsoleOutput:
+    def test_plain(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        out = StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        with console_output(False):
+            print_key_value("Key", 1)
+            cprint(Fore.LIGHTYELLOW_EX, "Heading")
+            with Table(("A", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTCYAN_EX), column_sep="  ") as table:
+                table.add_row("value")
+                table.print()
+            assert out.getvalue() == ""
+        assert sys.stdout is out
+        assert out.getvalue() == "Key: 1\nHeading\nA    \nvalue\n"
+
+    def test_colour(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        out = StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        with console_output(True):
+            assert sys.stdout is out
+            assert colour_enabled(sys.stdout)
+            print_key_value("Key", 1)
+        assert out.getvalue() == f"{Fore.LIGHTBLUE_EX}Key: {Fore.LIGHTCYAN_EX}1{Style.RESET_ALL}\n"
+
+    def test_table(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def print_table() -> None:
+            with Table(
+                    ("Name", Fore.LIGHTYELLOW_EX, "{}", Fore.LIGHTBLUE_EX),
+                    None,
+                    ("Count", None, "{:>5}", Fore.LIGHTCYAN_EX)) as table:
+                table.add_row("kick", "x", 12)
+                table.add_row("hi-hat", "longer value")
+                table.add_row("snare", "", 3, "extra")
+                table.print()
+
+        coloured = StringIO()
+        monkeypatch.setattr(sys, "stdout", coloured)
+        print_table()
+
+        plain = StringIO()
+        monkeypatch.setattr(sys, "stdout", plain)
+        with console_output(False):
+            print_table()
+
+        assert plain.getvalue() == ANSI_ESCAPE_RE.sub("", coloured.getvalue())
+
+
+class TestServedColour:
+    @pytest.mark.parametrize("colour", [True, False])
+    def test_client_colour(self, colour: bool) -> None:
+        def run(cwd: Path, argv: list[str]) -> None:
+            with console_output(None):
+                print_key_value("Key", 1)
+
+        response = handle_request({"cwd": "/tmp", "argv": ["info"], "colour": colour}, run)
+        assert ("\x1b[" in str(response["stdout"])) == colour
+
+
+class TestInfoDumpColour:
+    @pytest.mark.parametrize("option, colour", [("--colour", True), ("--no-colour", False)])
+    def test_dump(self, option: str, colour: bool, capsys: pytest.CaptureFixture[str]) -> None:
+        run_command(SAMPLES_DIR, ["info", str(SAMPLES_DIR / "example-3.mid"), "--dump", option])
+        out = capsys.readouterr().out
+        assert ("\x1b[" in out.split("MIDI messages")[-1]) == colour
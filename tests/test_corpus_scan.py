@@ -0,0 +1,142 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.corpus_scan import FileScanResult, scan_corpus
+from beat_studio_importer.output_format import SummaryFormat
+from beat_studio_importer.path_util import expand_midi_paths, is_multi_path, multi_path_root
+from beat_studio_importer.user_error import UserError
+from io import StringIO
+from pathlib import Path
+import csv
+import json
+import pytest
+import shutil
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+@pytest.fixture
+def corpus_dir(tmp_path: Path) -> Path:
+    _ = shutil.copy(SAMPLES_DIR / "example-0.mid", tmp_path / "a.mid")
+    (tmp_path / "sub").mkdir()
+    _ = shutil.copy(SAMPLES_DIR / "seven-eight.mid", tmp_path / "sub" / "b.MID")
+    _ = (tmp_path / "c.mid").write_bytes(b"MThd")
+    _ = (tmp_path / "notes.txt").write_text("not MIDI")
+    return tmp_path
+
+
+class TestExpandMidiPaths:
+    def test_dir(self, corpus_dir: Path) -> None:
+        assert expand_midi_paths(corpus_dir) == [
+            corpus_dir / "a.mid",
+            corpus_dir / "c.mid",
+            corpus_dir / "sub" / "b.MID",
+        ]
+
+    def test_glob(self, corpus_dir: Path) -> None:
+        assert expand_midi_paths(corpus_dir / "**" / "b.*") == [
+            corpus_dir / "sub" / "b.MID",
+        ]
+
+
+    def test_literal_glob_chars(self, tmp_path: Path) -> None:
+        d = tmp_path / "take [1]"
+        d.mkdir()
+        p = d / "Groove [v2].mid"
+        _ = shutil.copy(SAMPLES_DIR / "example-1.mid", p)
+        assert not is_multi_path(p)
+        assert expand_midi_paths(p) == [p]
+        assert is_multi_path(d / "*.mid")
+        assert expand_midi_paths(d / "*.mid") == [p]
+        assert multi_path_root(d / "*.mid") == d
+
+
+class TestScanCorpus:
+    def test_scan(self) -> None:
+        result = FileScanResult.scan(SAMPLES_DIR / "example-0.mid")
+        assert result.error is None
+        assert result.ticks_per_beat == 960
+        assert result.channels == "1"
+        assert result.region_count == 5
+        assert result.tempos == "100.0 120.0 60.0 180.0"
+        assert result.time_signatures == "5/4 7/8 4/4 12/8"
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_csv(self, corpus_dir: Path, jobs: int) -> None:
+        with StringIO() as f:
+            error_count = scan_corpus(
+                corpus_dir,
+                summary_format=SummaryFormat.CSV,
+                out=f,
+                progress=None,
+                jobs=jobs)
+            rows = list(csv.DictReader(StringIO(f.getvalue())))
+
+        assert error_count == 1
+        assert [Path(row["path"]) for row in rows] == [
+            Path("a.mid"),
+            Path("c.mid"),
+            Path("sub") / "b.MID",
+        ]
+        assert rows[0]["error"] == ""
+        assert rows[0]["region_count"] == "5"
+        assert rows[1]["error"] != ""
+        assert rows[1]["region_count"] == ""
+        assert rows[2]["time_signatures"] == "7/8"
+
+    def test_jsonl(self, corpus_dir: Path) -> None:
+        with StringIO() as f:
+            error_count = scan_corpus(
+                corpus_dir / "*.mid",
+                summary_format=SummaryFormat.JSONL,
+                out=f,
+                progress=None,
+                jobs=1)
+            objs = [json.loads(line) for line in f.getvalue().splitlines()]
+
+        assert error_count == 1
+        assert [obj["path"] for obj in objs] == ["a.mid", "c.mid"]
+        assert objs[1]["region_count"] is None
+
+    def test_table(self, corpus_dir: Path) -> None:
+        with StringIO() as f:
+            error_count = scan_corpus(
+                corpus_dir / "*.mid",
+                summary_format=SummaryFormat.TABLE,
+                out=f,
+                progress=None,
+                jobs=1)
+            lines = f.getvalue().splitlines()
+
+        assert error_count == 1
+        assert lines[0].split()[:3] == ["path", "error", "ticks_per_beat"]
+        assert [line.split()[0] for line in lines[1:]] == ["a.mid", "c.mid"]
+        assert len(set(map(len, lines))) == 1
+
+    def test_no_files(self, tmp_path: Path) -> None:
+        with pytest.raises(UserError):
+            _ = scan_corpus(
+                tmp_path,
+                summary_format=SummaryFormat.CSV,
+                out=StringIO(),
+                progress=None)
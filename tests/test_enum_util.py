@@ -0,0 +1,105 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_note_name import BeatStudioNoteName
+from beat_studio_importer.enum_util import enum_index
+from beat_studio_importer.midi_note_name import MidiNoteName
+from beat_studio_importer.note_value import NoteValue
+from beat_studio_importer.pulse import Pulse
+from collections.abc import Callable
+from enum import Enum
+from fractions import Fraction
+from tests.util import benchmark, best_time
+import pytest
+
+
+LOOKUP_COUNT: int = 20_000
+
+
+def linear_scan[E: Enum](enum_cls: type[E], attr: str, value: object) -> E:
+    for member in enum_cls:
+        if getattr(member, attr) == value:
+            return member
+    raise ValueError(value)
+
+
+class TestEnumIndex:
+    def test_basics(self) -> None:
+        index = enum_index(NoteValue, "int_value")
+        assert index[16] is NoteValue.SIXTEENTH
+        assert enum_index(NoteValue, "int_value") is index
+        with pytest.raises(TypeError):
+            index[3] = NoteValue.WHOLE  # type: ignore[index]
+
+    def test_duplicate(self) -> None:
+        class Duplicate(Enum):
+            A = 1, "x"
+            B = 2, "x"
+
+            @property
+            def display(self) -> str: return self.value[1]
+
+        with pytest.raises(ValueError):
+            _ = enum_index(Duplicate, "display")
+
+    def test_lookups(self) -> None:
+        assert NoteValue.from_int(8) is NoteValue.EIGHTH
+        assert Pulse.from_multiplier(Fraction(3, 2)) is Pulse.DOTTED_QUARTER
+        assert BeatStudioNoteName.parse("HI-HAT") is BeatStudioNoteName.HI_HAT
+        assert MidiNoteName.parse("ride_cymbal_1") is MidiNoteName.RIDE_CYMBAL_1
+        with pytest.raises(ValueError):
+            _ = NoteValue.from_int(3)
+        with pytest.raises(NotImplementedError):
+            _ = Pulse.from_multiplier(Fraction(5, 7))
+        assert Pulse.from_multiplier(Fraction(5, 7), allow_fraction=True) == \
+            Fraction(5, 7)
+
+    def test_compound(self) -> None:
+        assert Pulse.EIGHTH.compound() is Pulse.DOTTED_QUARTER
+        assert Pulse.DOTTED_WHOLE.compound(allow_fraction=True) == Fraction(18)
+        with pytest.raises(NotImplementedError):
+            _ = Pulse.DOTTED_WHOLE.compound()
+
+
+@benchmark
+class TestEnumIndexBenchmark:
+    @pytest.mark.parametrize("enum_cls, attr, value, lookup", [
+        (NoteValue, "int_value", 64, NoteValue.from_int),
+        (Pulse, "multiplier", Fraction(6), Pulse.from_multiplier),
+        (BeatStudioNoteName, "display", "SNARE", BeatStudioNoteName.parse),
+        (MidiNoteName, "display", "crash_cymbal_2", MidiNoteName.parse),
+    ])
+    def test_lookup(self, enum_cls: type[Enum], attr: str, value: object, lookup: Callable[[object], Enum]) -> None:
+        def run_indexed() -> None:
+            for _ in range(LOOKUP_COUNT):
+                _ = lookup(value)
+
+        def run_linear_scan() -> None:
+            for _ in range(LOOKUP_COUNT):
+                _ = linear_scan(enum_cls, attr, value)
+
+        t = best_time(run_indexed)
+        reference_t = best_time(run_linear_scan)
+        print(
+            f"\n{enum_cls.__name__} {LOOKUP_COUNT} lookups: {t:.4f}s "
+            f"(linear scan {reference_t:.4f}s, speedup {reference_t / t:.1f}x)")
+        assert t < reference_t
@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.__main__ import run_command
+from beat_studio_importer.info_command import dump_messages
+from beat_studio_importer.output_format import DumpFormat
+from io import StringIO
+from mido import MidiFile
+from pathlib import Path
+import json
+import pytest
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+class TestDumpMessages:
+    def test_text(self) -> None:
+        file = MidiFile(SAMPLES_DIR / "example-0.mid")
+        with StringIO() as f:
+            dump_messages(
+                file,
+                exclude=frozenset(["note_off"]),
+                dump_format=DumpFormat.TEXT,
+                out=f,
+                colour=False)
+            lines = f.getvalue().splitlines()
+
+        assert len(lines) == len(file.merged_track) - 49
+        assert lines[2] == "  0.0         MetaMessage('set_tempo', tempo=600000, time=0)"
+        assert "\x1b" not in f"{lines}"
+
+    def test_jsonl(self) -> None:
+        file = MidiFile(SAMPLES_DIR / "example-0.mid")
+        with StringIO() as f:
+            dump_messages(
+                file,
+                exclude=frozenset(),
+                dump_format=DumpFormat.JSONL,
+                out=f,
+                colour=False)
+            objs = [json.loads(line) for line in f.getvalue().splitlines()]
+
+        assert len(objs) == len(file.merged_track)
+        assert objs[2] == {"type": "set_tempo", "tempo": 600000, "time": 0.0}
+        note_ons = [obj for obj in objs if obj["type"] == "note_on"]
+        assert note_ons[0].keys() == {"type", "channel", "note", "velocity", "time"}
+        assert objs[-1]["time"] > 14
+
+
+class TestInfoCommand:
+    def test_dump_jsonl(self, capsys: pytest.CaptureFixture[str]) -> None:
+        run_command(SAMPLES_DIR, [
+            "info",
+            str(SAMPLES_DIR / "example-0.mid"),
+            "--dump",
+            "--format",
+            "jsonl",
+            "--colour"
+        ])
+        out = capsys.readouterr().out
+        objs = [json.loads(line) for line in out.splitlines()]
+        assert len(objs) == len(MidiFile(SAMPLES_DIR / "example-0.mid").merged_track)
+        assert objs[2] == {"type": "set_tempo", "tempo": 600000, "time": 0.0}
+        assert "\x1b" not in out
+
+    def test_dump_text(self, capsys: pytest.CaptureFixture[str]) -> None:
+        run_command(SAMPLES_DIR, ["info", str(SAMPLES_DIR / "example-0.mid"), "--dump", "--no-colour"])
+        out = capsys.readouterr().out
+        assert "Region 1" in out
+        assert "  0.0         MetaMessage('set_tempo', tempo=600000, time=0)" in out
@@ -0,0 +1,149 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.beat_studio_pattern import BeatStudioPattern
+from beat_studio_importer.import_command import PatternInfo
+from beat_studio_importer.library_index import IndexedPattern, LibraryIndex
+from beat_studio_importer.time_signature import TimeSignature
+from pathlib import Path
+import pytest
+import sqlite3
+
+
+LIBRARY: str = """# MIDI Drum Patterns Collection
+
+["one" - 4 - 120 - 16 - 4/4]
+KICK : 5...
+SNARE: ..5.
+
+["two" - 28 - 100 - 16 - 7/8]
+KICK : 5.....5.5...5.5.....5.......
+"""
+
+APPENDED: str = """
+# Pattern three
+["three" - 8 - 95 - 8 - 7/8]
+HI-HAT: 5.5.5.5.
+"""
+
+
+@pytest.fixture
+def patterns_path(tmp_path: Path) -> Path:
+    path = tmp_path / "patterns.beat"
+    _ = path.write_text(LIBRARY)
+    return path
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "library.sqlite3"
+
+
+class TestLibraryIndex:
+    def test_sync(self, patterns_path: Path, index_path: Path) -> None:
+        with LibraryIndex(index_path) as index:
+            result = index.sync(patterns_path)
+            assert result.rebuilt
+            assert result.added_count == 2
+
+            result = index.sync(patterns_path)
+            assert not result.rebuilt
+            assert result.added_count == 0
+
+            with patterns_path.open("at") as f:
+                _ = f.write(APPENDED)
+            result = index.sync(patterns_path)
+            assert not result.rebuilt
+            assert result.added_count == 1
+            assert result.pattern_count == 3
+
+            _ = patterns_path.write_text(APPENDED)
+            result = index.sync(patterns_path)
+            assert result.rebuilt
+            assert result.pattern_count == 1
+
+    def test_query(self, patterns_path: Path, index_path: Path) -> None:
+        with patterns_path.open("at") as f:
+            _ = f.write(APPENDED)
+
+        with LibraryIndex(index_path) as index:
+            _ = index.sync(patterns_path)
+
+            def names(patterns: list[IndexedPattern]) -> list[str]:
+                return [p.name for p in patterns]
+
+            assert names(index.query()) == ["one", "two", "three"]
+            assert names(index.query(
+                time_signature=TimeSignature.parse("7/8"))) == ["two", "three"]
+            assert names(index.query(
+                time_signature=TimeSignature.parse("7/8"),
+                min_tempo=90,
+                max_tempo=110,
+                max_step_count=16)) == ["three"]
+            assert names(index.query(name="T*")) == ["two", "three"]
+
+    def test_to_pattern(self, patterns_path: Path, index_path: Path) -> None:
+        with LibraryIndex(index_path) as index:
+            _ = index.sync(patterns_path)
+            indexed = index.find_by_name("TWO")
+
+        assert len(indexed) == 1
+        pattern = indexed[0].to_pattern()
+        expected = BeatStudioPattern.load(patterns_path)[1]
+        assert pattern.content_digest == expected.content_digest
+        assert pattern.render().splitlines()[0] == \
+            expected.render().splitlines()[0]
+        assert "KICK      : 5.....5.5...5.5.....5......." in pattern.render()
+
+    @pytest.mark.parametrize("s, expected", [
+        ("[\"one\" - 4 - 120 - 16 - 4/4]\nKICK: 5...\nSNARE: ..5.", PatternInfo.IDENTICAL_PATTERN_DEFINED),
+        ("[\"ONE\" - 4 - 120 - 16 - 4/4]\nKICK: 5...\nSNARE: ..5.", PatternInfo.PATTERN_NAME_IN_USE),
+        ("[\"one\" - 4 - 120 - 16 - 4/4]\nKICK: 5...", PatternInfo.PATTERN_NAME_IN_USE),
+        ("[\"one\" - 4 - 120 - 16 - 4/4]\nKICK: 5...\nSNARE: ..5.\nRIDE: ....", PatternInfo.PATTERN_NAME_IN_USE),
+        ("[\"empty\" - 4 - 120 - 16 - 4/4]\nKICK: ....", PatternInfo.IDENTICAL_PATTERN_DEFINED),
+        ("[\"empty\" - 4 - 120 - 16 - 4/4]\nKICK: ....\nSNARE: ....", PatternInfo.PATTERN_NAME_IN_USE),
+        ("[\"four\" - 4 - 120 - 16 - 4/4]\nKICK: 5...", None),
+    ])
+    def test_find_existing(self, patterns_path: Path, index_path: Path, s: str, expected: PatternInfo | None) -> None:
+        with patterns_path.open("at") as f:
+            _ = f.write("\n[\"empty\" - 4 - 120 - 16 - 4/4]\nKICK: ....\n")
+        pattern = BeatStudioPattern.parse(s)
+        assert PatternInfo.find_existing(patterns_path, pattern) is expected
+
+        LibraryIndex(index_path).close()
+        assert PatternInfo.find_existing(
+            patterns_path,
+            pattern,
+            index_path=index_path) is expected
+
+    def test_schema_upgrade(self, patterns_path: Path, index_path: Path) -> None:
+        index_path.parent.mkdir(parents=True)
+        with sqlite3.connect(index_path) as connection:
+            _ = connection.executescript(
+                "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+                "CREATE TABLE patterns (position INTEGER PRIMARY KEY, digest TEXT NOT NULL);"
+                "INSERT INTO meta VALUES ('schema_version', '1');")
+        connection.close()
+
+        with LibraryIndex(index_path) as index:
+            result = index.sync(patterns_path)
+            assert result.pattern_count == 2
@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.meta_scan import MetaScan
+from beat_studio_importer.misc import MidiChannel
+from beat_studio_importer.region import Region
+from beat_studio_importer.timeline import Timeline
+from mido import Message, MetaMessage, MidiFile, MidiTrack
+from pathlib import Path
+from tests.util import benchmark, best_time
+import pytest
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+def make_file(bar_count: int) -> MidiFile:
+    file = MidiFile(ticks_per_beat=960)
+    meta_track = MidiTrack()
+    meta_track.append(MetaMessage("set_tempo", tempo=500000, time=0))
+    meta_track.append(MetaMessage(
+        "time_signature",
+        numerator=7,
+        denominator=8,
+        time=0))
+    meta_track.append(MetaMessage("set_tempo", tempo=400000, time=3360 * 2))
+    file.tracks.append(meta_track)
+
+    note_track = MidiTrack()
+    note_track.append(Message("control_change", channel=9, control=1, value=64, time=0))
+    for _ in range(bar_count * 7):
+        note_track.append(Message("note_on", channel=9, note=42, velocity=100, time=0))
+        note_track.append(Message("note_on", channel=9, note=42, velocity=0, time=480))
+    file.tracks.append(note_track)
+    return file
+
+
+class TestMetaScan:
+    @pytest.mark.parametrize("path", sorted(SAMPLES_DIR.glob("**/*.mid")), ids=lambda p: p.name)
+    @pytest.mark.parametrize("channel", [None, MidiChannel(1), MidiChannel(10)])
+    @pytest.mark.parametrize("discard_boundary_hits", [True, False])
+    def test_samples(self, path: Path, channel: MidiChannel | None, discard_boundary_hits: bool) -> None:
+        timeline = Timeline.build(MidiFile(path), channel=channel)
+        expected = Region.build_all(
+            timeline,
+            discard_boundary_hits=discard_boundary_hits)
+
+        scan = MetaScan.load(
+            path,
+            channel=channel,
+            discard_boundary_hits=discard_boundary_hits)
+
+        assert scan.regions == [r.summary for r in expected]
+        assert [r.descriptor for r in scan.regions] == \
+            [r.descriptor for r in expected]
+        assert scan.tempo_map == timeline.tempo_map
+
+    def test_running_status(self, tmp_path: Path) -> None:
+        path = tmp_path / "running-status.mid"
+        make_file(bar_count=4).save(path)
+
+        # mido writes consecutive note-on messages using running status
+        assert b"\x99\x2a\x64\x83\x60\x2a\x00" in path.read_bytes()
+
+        scan = MetaScan.load(path)
+        assert [(r.start_tick, r.note_count, r.bar_count) for r in scan.regions] == [
+            (0, 27, 2),
+            (6720, 28, 2),
+        ]
+        assert scan.regions == \
+            [r.summary for r in Region.build_all(Timeline.build(MidiFile(path)))]
+
+    def test_not_midi(self) -> None:
+        with pytest.raises(ValueError):
+            _ = MetaScan.scan(b"MTrk\x00\x00\x00\x06\x00\x01\x00\x01\x03\xc0")
+
+    @benchmark
+    def test_performance(self, tmp_path: Path) -> None:
+        path = tmp_path / "large.mid"
+        make_file(bar_count=20_000).save(path)
+
+        t = best_time(
+            lambda: Region.build_all(Timeline.build(MidiFile(path))),
+            repeat=1)
+        meta_t = best_time(lambda: MetaScan.load(path).regions, repeat=1)
+        print(
+            f"\nMetaScan {path.stat().st_size} bytes: {meta_t:.3f}s "
+            f"(full parse {t:.3f}s, speedup {t / meta_t:.1f}x)")
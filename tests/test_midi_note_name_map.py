@@ -22,8 +22,13 @@
 
 from beat_studio_importer.beat_studio_note_name import BeatStudioNoteName
 from beat_studio_importer.midi_note_name import MidiNoteName
-from beat_studio_importer.midi_note_name_map import DEFAULT_MIDI_NOTE_NAME_MAP
+from beat_studio_importer.midi_note_name_map import DEFAULT_MIDI_NOTE_NAME_MAP, MidiNoteNameMap, _LOADED_MAPS
 from beat_studio_importer.misc import MidiNote
+from pathlib import Path
+import shutil
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
 
 
 class TestMidiNoteNameMap:
@@ -33,3 +38,28 @@ class TestMidiNoteNameMap:
         assert note_name.display == "hi_mid_tom"
         assert note_name.midi_note == MidiNote(48)
         assert note_name.beat_studio_note_name is BeatStudioNoteName.HI_TOM
+
+    def test_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "example.notemap"
+        _ = shutil.copy(SAMPLES_DIR / "example.notemap", path)
+        cache_dir = tmp_path / "cache"
+
+        note_name_map = MidiNoteNameMap.load(path, cache_dir=cache_dir)
+        assert note_name_map.name == "General MIDI Drums"
+        assert note_name_map[MidiNote(42)] is MidiNoteName.CLOSED_HI_HAT
+        assert len(list((cache_dir / "note-maps").iterdir())) == 1
+
+        # Same process
+        assert MidiNoteNameMap.load(path, cache_dir=cache_dir) is note_name_map
+
+        # Later run
+        _LOADED_MAPS.clear()
+        cached_map = MidiNoteNameMap.load(path, cache_dir=cache_dir)
+        assert cached_map is not note_name_map
+        assert cached_map == note_name_map
+
+        # Modified file
+        _ = path.write_text("name: Modified\nnotes:\n  36: bass_drum_1\n")
+        modified_map = MidiNoteNameMap.load(path, cache_dir=cache_dir)
+        assert modified_map.name == "Modified"
+        assert modified_map.notes == {MidiNote(36): MidiNoteName.BASS_DRUM_1}
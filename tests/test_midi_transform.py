@@ -0,0 +1,172 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.midi_note_name import MidiNoteName
+from beat_studio_importer.midi_note_name_map import MidiNoteNameMap
+from beat_studio_importer.midi_transform import MidiTransform, transform_file, transform_in_place, transform_midi_file
+from beat_studio_importer.misc import MidiChannel, MidiNote
+from beat_studio_importer.remap_command import do_remap
+from mido import Message, MetaMessage, MidiFile, MidiTrack
+from pathlib import Path
+import pytest
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+DRUMS: MidiTransform = MidiTransform.channel(MidiChannel(10))
+
+
+def remap_bytes(data: bytes, transform: MidiTransform = DRUMS) -> bytes:
+    buffer = bytearray(data)
+    size = transform_in_place(buffer, transform)
+    return bytes(buffer[:size])
+
+
+def vendor_note_map() -> MidiNoteNameMap:
+    return MidiNoteNameMap(
+        path=None,
+        name="vendor",
+        notes={
+            MidiNote(60): MidiNoteName.BASS_DRUM_1,
+            MidiNote(62): MidiNoteName.ACOUSTIC_SNARE,
+        })
+
+
+class TestMidiTransform:
+    def test_identity(self) -> None:
+        assert MidiTransform().is_identity
+        assert MidiTransform.build().is_identity
+        assert not DRUMS.is_identity
+
+    def test_compose(self) -> None:
+        transform = MidiTransform.compose([
+            MidiTransform.channel(MidiChannel(2)),
+            MidiTransform.note_map(vendor_note_map()),
+            MidiTransform.velocity_curve(scale=0.5, offset=10),
+            DRUMS,
+        ])
+        message = [0x93, 60, 100]
+        transform.apply(message)
+        assert message == [0x99, 36, 60]
+
+        message = [0x83, 62, 100]
+        transform.apply(message)
+        assert message == [0x89, 38, 100]
+
+        message = [0xb0, 60, 100]
+        transform.apply(message)
+        assert message == [0xb9, 60, 100]
+
+    def test_velocity_curve(self) -> None:
+        velocities = MidiTransform.velocity_curve(scale=2.0, offset=-100).velocities
+        assert velocities[0] == 0
+        assert velocities[1] == 1
+        assert velocities[100] == 100
+        assert velocities[127] == 127
+
+
+class TestTransformInPlace:
+    def test_seven_eight(self) -> None:
+        data = (SAMPLES_DIR / "seven-eight.mid").read_bytes()
+        expected = (SAMPLES_DIR / "seven-eight-remapped.mid").read_bytes()
+        assert remap_bytes(data) == expected
+
+    @pytest.mark.parametrize("path", sorted(SAMPLES_DIR.glob("**/*.mid")), ids=lambda p: p.name)
+    def test_matches_mido(self, path: Path) -> None:
+        assert remap_bytes(path.read_bytes()) == \
+            transform_midi_file(path, DRUMS)
+
+    def test_channel_prefix_and_sysex(self, tmp_path: Path) -> None:
+        file = MidiFile()
+        track = MidiTrack()
+        track.append(MetaMessage("channel_prefix", channel=2, time=0))
+        track.append(Message("program_change", channel=2, program=5, time=0))
+        track.append(Message("sysex", data=[1, 2, 3], time=10))
+        track.append(Message("note_on", channel=3, note=36, time=200))
+        track.append(Message("note_on", channel=4, note=38, time=0))
+        file.tracks.append(track)
+        path = tmp_path / "input.mid"
+        file.save(path)
+
+        assert remap_bytes(path.read_bytes()) == \
+            transform_midi_file(path, DRUMS)
+
+    @pytest.mark.parametrize("path", sorted(SAMPLES_DIR.glob("**/*.mid")), ids=lambda p: p.name)
+    def test_notes_and_velocities_match_mido(self, path: Path) -> None:
+        transform = MidiTransform.build(
+            channel=MidiChannel(10),
+            note_name_map=vendor_note_map(),
+            velocity_scale=0.8,
+            velocity_offset=5)
+        assert remap_bytes(path.read_bytes(), transform) == \
+            transform_midi_file(path, transform)
+
+    def test_non_minimal_delta(self) -> None:
+        data = (SAMPLES_DIR / "example-3.mid").read_bytes()
+        # Insert a redundant 0x80 byte into the first delta time
+        i = data.index(b"MTrk") + 8
+        padded = bytearray(data[:i] + b"\x80" + data[i:])
+        padded[i - 4:i] = (int.from_bytes(data[i - 4:i]) + 1).to_bytes(4)
+        assert remap_bytes(bytes(padded)) == remap_bytes(data)
+
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"MTrk\x00\x00\x00\x06\x00\x01\x00\x01\x03\xc0",
+        # Running status after meta event
+        b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0MTrk\x00\x00\x00\x0c\x00\x90\x24\x40\x00\xff\x01\x00\x00\x24\x00\x00",
+        # No end of track event
+        b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0MTrk\x00\x00\x00\x04\x00\x90\x24\x40",
+        # Sysex event without trailing F7
+        b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0MTrk\x00\x00\x00\x0a\x00\xf0\x03\x7e\x7f\x09\x00\xff\x2f\x00",
+        # Escaped sysex event
+        b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0MTrk\x00\x00\x00\x0a\x00\xf7\x03\x7e\x7f\xf7\x00\xff\x2f\x00",
+    ])
+    def test_unsupported(self, data: bytes) -> None:
+        with pytest.raises(ValueError):
+            _ = remap_bytes(data)
+
+
+    def test_unterminated_sysex(self, tmp_path: Path) -> None:
+        path = tmp_path / "input.mid"
+        _ = path.write_bytes(
+            b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0"
+            b"MTrk\x00\x00\x00\x0e\x00\xf0\x03\x7e\x7f\x09\x00\x91\x24\x40\x00\xff\x2f\x00")
+        assert bytes(transform_file(path, DRUMS)) == \
+            transform_midi_file(path, DRUMS)
+
+
+class TestDoRemap:
+    def test_remap(self, tmp_path: Path) -> None:
+        output_path = tmp_path / "remapped.mid"
+        do_remap(SAMPLES_DIR / "seven-eight.mid", output_path)
+        assert output_path.read_bytes() == \
+            (SAMPLES_DIR / "seven-eight-remapped.mid").read_bytes()
+
+    def test_fallback(self, tmp_path: Path) -> None:
+        # Missing end of track event is added by mido
+        path = tmp_path / "input.mid"
+        _ = path.write_bytes(
+            b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x03\xc0MTrk\x00\x00\x00\x04\x00\x90\x24\x40")
+        output_path = tmp_path / "remapped.mid"
+        do_remap(path, output_path)
+        assert [m.channel for m in MidiFile(output_path).tracks[0] if hasattr(m, "channel")] == [9]
@@ -0,0 +1,59 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.play_command import raw_sender
+from mido import Message
+from mido.ports import BaseOutput
+
+
+class CapturingOutput(BaseOutput):
+    def __init__(self) -> None:
+        super().__init__("capture")
+        self.messages: list[Message] = []
+
+    def _send(self, msg: Message) -> None:
+        self.messages.append(msg)
+
+
+class FakeRtMidiOut:
+    def __init__(self) -> None:
+        self.data: list[bytes] = []
+
+    def send_message(self, data: bytes) -> None:
+        self.data.append(data)
+
+
+class TestRawSender:
+    def test_rtmidi(self) -> None:
+        port = CapturingOutput()
+        rt = FakeRtMidiOut()
+        setattr(port, "_rt", rt)
+        raw_sender(port)(b"\x99\x2a\x64")
+        assert rt.data == [b"\x99\x2a\x64"]
+        assert port.messages == []
+
+    def test_fallback(self) -> None:
+        port = CapturingOutput()
+        raw_sender(port)(b"\x99\x2a\x64")
+        assert port.messages == [
+            Message("note_on", channel=9, note=42, velocity=100)
+        ]
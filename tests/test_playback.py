@@ -0,0 +1,250 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from array import array
+from beat_studio_importer.midi_transform import MidiTransform
+from beat_studio_importer.misc import MidiChannel, Ppqn, Tick
+from beat_studio_importer.playback import PlaybackSchedule, TimingStats, paused_gc, play_schedule
+from beat_studio_importer.tempo_map import TempoMap
+from mido import Message, MetaMessage, MidiFile, MidiTrack
+from pathlib import Path
+from tests.util import benchmark
+import gc
+import pytest
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+# Simulated clock whose sleeps always overrun and whose reads take time
+class FakeClock:
+    def __init__(self, oversleep_ns: int, read_ns: int) -> None:
+        self.now: int = 0
+        self.oversleep_ns: int = oversleep_ns
+        self.read_ns: int = read_ns
+        self.sleep_count: int = 0
+
+    def clock(self) -> int:
+        self.now += self.read_ns
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleep_count += 1
+        self.now += int(seconds * 1_000_000_000) + self.oversleep_ns
+
+
+def make_schedule(message_count: int, interval_ns: int) -> PlaybackSchedule:
+    encoded = Message("note_on", note=42).bin()
+    return PlaybackSchedule(
+        tempo_map=TempoMap.build(Ppqn(960), []),
+        ticks=array("q", range(message_count)),
+        deadlines=array("q", (i * interval_ns for i in range(message_count))),
+        offsets=array("Q", (i * len(encoded) for i in range(message_count + 1))),
+        data=encoded * message_count)
+
+
+class TestPlaybackSchedule:
+    def test_build(self) -> None:
+        file = MidiFile(SAMPLES_DIR / "example-0.mid")
+        schedule = PlaybackSchedule.build(file)
+
+        expected: list[tuple[float, Message]] = []
+        time = 0.0
+        for message in file:  # yields messages with delta time in seconds
+            time += message.time
+            if not isinstance(message, MetaMessage):
+                expected.append((time, message))
+
+        assert schedule.message_count == len(expected)
+        assert schedule.data == b"".join(m.bin() for _, m in expected)
+        for deadline, (time, _) in zip(schedule.deadlines, expected, strict=True):
+            assert abs(deadline - time * 1_000_000_000) < 1_000
+
+    def test_force_channel(self) -> None:
+        file = MidiFile(SAMPLES_DIR / "seven-eight.mid")
+        schedule = PlaybackSchedule.build(file, transform=MidiTransform.channel(MidiChannel(10)))
+        messages = [
+            Message.from_bytes(schedule.message_bytes(i))
+            for i in range(schedule.message_count)
+        ]
+        assert len(messages) > 0
+        assert {m.channel for m in messages if hasattr(m, "channel")} == {9}
+
+    def test_slice(self) -> None:
+        file = MidiFile(ticks_per_beat=960)
+        track = MidiTrack()
+        track.append(Message("program_change", channel=9, program=1, time=0))
+        track.append(Message("control_change", channel=9, control=7, value=100, time=0))
+        track.append(Message("program_change", channel=9, program=2, time=0))
+        track.append(Message("note_on", channel=9, note=36, velocity=100, time=0))
+        track.append(Message("control_change", channel=9, control=7, value=90, time=960))
+        track.append(MetaMessage("set_tempo", tempo=250_000, time=960))
+        track.append(Message("note_on", channel=9, note=38, velocity=100, time=0))
+        track.append(Message("note_on", channel=9, note=42, velocity=100, time=480))
+        track.append(Message("note_on", channel=9, note=36, velocity=100, time=1440))
+        file.tracks.append(track)
+        schedule = PlaybackSchedule.build(file)
+
+        # Region after tempo change: two quarter notes of 0.25s
+        looped = schedule.slice(Tick(1920), Tick(3840), loop_count=3)
+
+        messages = [
+            Message.from_bytes(looped.message_bytes(i))
+            for i in range(looped.message_count)
+        ]
+        # Only the latest state before the region is restored
+        assert messages[:2] == [
+            Message("program_change", channel=9, program=2),
+            Message("control_change", channel=9, control=7, value=90),
+        ]
+        # Notes left sounding are released at the end of each iteration
+        assert [(m.type, m.note) for m in messages[2:]] == [
+            ("note_on", 38),
+            ("note_on", 42),
+            ("note_off", 38),
+            ("note_off", 42),
+        ] * 3
+        assert list(looped.deadlines) == [
+            0,
+            0,
+            0,
+            125_000_000,
+            500_000_000,
+            500_000_000,
+            500_000_000,
+            625_000_000,
+            1_000_000_000,
+            1_000_000_000,
+            1_000_000_000,
+            1_125_000_000,
+            1_500_000_000,
+            1_500_000_000,
+        ]
+        assert list(looped.ticks)[2:] == [
+            1920, 2400, 3840, 3840,
+            3840, 4320, 5760, 5760,
+            5760, 6240, 7680, 7680,
+        ]
+
+    def test_slice_note_off_on_boundary(self) -> None:
+        file = MidiFile(ticks_per_beat=960)
+        track = MidiTrack()
+        track.append(Message("note_on", channel=9, note=36, velocity=100, time=0))
+        track.append(Message("note_on", channel=9, note=38, velocity=100, time=480))
+        track.append(Message("note_on", channel=9, note=36, velocity=0, time=480))
+        track.append(Message("note_off", channel=9, note=38, time=0))
+        track.append(Message("note_on", channel=9, note=42, velocity=100, time=0))
+        file.tracks.append(track)
+        schedule = PlaybackSchedule.build(file)
+
+        looped = schedule.slice(Tick(0), Tick(960), loop_count=2)
+
+        messages = [
+            Message.from_bytes(looped.message_bytes(i))
+            for i in range(looped.message_count)
+        ]
+        # Note-offs at the end tick are kept, the note-on is not, and
+        # no extra releases are needed
+        assert [(m.type, m.note, m.velocity) for m in messages] == [
+            ("note_on", 36, 100),
+            ("note_on", 38, 100),
+            ("note_on", 36, 0),
+            ("note_off", 38, 64),
+        ] * 2
+        assert list(looped.ticks) == [0, 480, 960, 960, 960, 1440, 1920, 1920]
+        assert list(looped.deadlines) == [
+            0,
+            250_000_000,
+            500_000_000,
+            500_000_000,
+            500_000_000,
+            750_000_000,
+            1_000_000_000,
+            1_000_000_000,
+        ]
+
+
+class TestPlaySchedule:
+    def test_drift_compensation(self) -> None:
+        fake = FakeClock(oversleep_ns=3_000_000, read_ns=1_000)
+        sent: list[tuple[int, bytes]] = []
+        schedule = make_schedule(1000, 10_000_000)
+        stats = play_schedule(
+            schedule,
+            lambda m: sent.append((fake.now, m)),
+            clock=fake.clock,
+            sleep=fake.sleep).stats(schedule)
+
+        assert len(sent) == 1000
+        assert all(data == b"\x90\x2a\x40" for _, data in sent)
+        assert fake.sleep_count > 0
+        # After the first oversleep, the spin window absorbs the overrun
+        assert stats.p99_error_ns <= 1_000
+        # Lateness does not accumulate over the whole schedule
+        assert sent[-1][0] - sent[0][0] <= 999 * 10_000_000 + 1_000
+
+    def test_late_messages(self) -> None:
+        fake = FakeClock(oversleep_ns=0, read_ns=5_000_000)
+        schedule = make_schedule(10, 1_000_000)
+        stats = play_schedule(
+            schedule,
+            lambda _: None,
+            clock=fake.clock,
+            sleep=fake.sleep).stats(schedule)
+        assert fake.sleep_count == 0
+        assert stats.message_count == 10
+        assert stats.max_error_ns > 0
+
+    def test_timing_stats(self) -> None:
+        deadlines = [i * 1000 for i in range(100)]
+        errors = list(range(100, 0, -1))
+        stats = TimingStats.build(
+            deadlines,
+            start_ns=5_000,
+            times=[5_000 + d + e for d, e in zip(deadlines, errors)])
+        assert stats.message_count == 100
+        assert stats.mean_error_ns == 50.5
+        assert stats.p50_error_ns == 50
+        assert stats.p90_error_ns == 90
+        assert stats.p99_error_ns == 99
+        assert stats.max_error_ns == 100
+        assert stats.jitter_ns == pytest.approx(28.866, rel=1e-4)
+        assert stats.elapsed_ns == 99_001
+        assert stats.throughput == pytest.approx(100 / 99_001e-9)
+
+    def test_paused_gc(self) -> None:
+        assert gc.isenabled()
+        with paused_gc():
+            assert not gc.isenabled()
+        assert gc.isenabled()
+        with paused_gc(False):
+            assert gc.isenabled()
+
+    @benchmark
+    def test_real_clock(self) -> None:
+        schedule = make_schedule(500, 2_000_000)
+        stats = play_schedule(schedule, lambda _: None).stats(schedule)
+        print(
+            f"\nplay_schedule {stats.message_count} messages: "
+            f"mean {stats.mean_error_ns / 1000:.1f}us, "
+            f"p99 {stats.p99_error_ns / 1000:.1f}us, "
+            f"max {stats.max_error_ns / 1000:.1f}us")
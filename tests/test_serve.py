@@ -0,0 +1,109 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.__main__ import run_command
+from beat_studio_importer.serve_client import forward_to_server
+from beat_studio_importer.serve_command import ImportServer, do_serve, handle_request
+from beat_studio_importer.user_error import UserError
+from collections.abc import Generator
+from pathlib import Path
+from threading import Thread
+import pytest
+import sys
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Generator[Path, None, None]:
+    socket_path = tmp_path / "server.sock"
+    with ImportServer(socket_path, run_command) as server:
+        thread = Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            yield socket_path
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+class TestHandleRequest:
+    def test_output(self) -> None:
+        def run(cwd: Path, argv: list[str]) -> None:
+            print(cwd, *argv)
+            print("warning", file=sys.stderr)
+
+        response = handle_request({"cwd": "/tmp", "argv": ["info", "x"]}, run)
+        assert response == {
+            "exit_code": 0,
+            "stdout": "/tmp info x\n",
+            "stderr": "warning\n"
+        }
+
+    @pytest.mark.parametrize("error,exit_code", [
+        (SystemExit(2), 2),
+        (SystemExit(None), 0),
+        (EOFError(), 1),
+        (ValueError("bad"), 1),
+    ])
+    def test_errors(self, error: BaseException, exit_code: int) -> None:
+        def run(cwd: Path, argv: list[str]) -> None:
+            raise error
+
+        response = handle_request({"cwd": "/tmp", "argv": ["import"]}, run)
+        assert response["exit_code"] == exit_code
+
+    def test_unsupported_command(self) -> None:
+        def run(cwd: Path, argv: list[str]) -> None:
+            assert False
+
+        response = handle_request({"cwd": "/tmp", "argv": ["remap"]}, run)
+        assert response["exit_code"] == 1
+
+
+class TestServer:
+    def test_import(self, server: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        argv = ["import", "example-1.mid", "--region", "2", "--tempo", "100"]
+        assert forward_to_server(server, SAMPLES_DIR, argv) == 0
+        forwarded = capsys.readouterr().out
+
+        run_command(SAMPLES_DIR, argv)
+        local = capsys.readouterr().out
+
+        # Only the generation timestamp differs
+        def strip(s: str) -> list[str]:
+            return [line for line in s.splitlines() if "Generated at" not in line]
+
+        assert "[\"example-1\" - 28 - 100 - 16 - 7/8]" in forwarded
+        assert strip(forwarded) == strip(local)
+
+    def test_exit_code(self, server: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        assert forward_to_server(server, SAMPLES_DIR, ["import", "missing.mid"]) == 1
+        assert "not found" in capsys.readouterr().err
+
+    def test_already_listening(self, server: Path) -> None:
+        with pytest.raises(UserError):
+            do_serve(server, run_command)
+
+    def test_not_listening(self, tmp_path: Path) -> None:
+        assert forward_to_server(tmp_path / "server.sock", SAMPLES_DIR, ["info"]) is None
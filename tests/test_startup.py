@@ -0,0 +1,86 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from pathlib import Path
+from tests.util import benchmark
+import subprocess
+import sys
+
+
+# Startup must not import these: they are only needed once a
+# subcommand has been dispatched
+DEFERRED_MODULES: list[str] = [
+    "beat_studio_importer.compact_command",
+    "beat_studio_importer.import_command",
+    "beat_studio_importer.info_command",
+    "beat_studio_importer.library_command",
+    "beat_studio_importer.play_command",
+    "beat_studio_importer.remap_command",
+    "concurrent.futures.process",
+    "mido",
+    "sqlite3",
+    "yaml",
+]
+
+# Cumulative import time of the command line entry point
+STARTUP_BUDGET_US: int = 100_000
+
+PROJECT_DIR: Path = Path(__file__).parent.parent
+
+
+# Cumulative import time in microseconds of each module imported by
+# code, as reported by -X importtime
+def import_times(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True)
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    def test_deferred(self) -> None:
+        times = import_times("import beat_studio_importer.__main__")
+        assert "beat_studio_importer.__main__" in times
+        assert [m for m in DEFERRED_MODULES if m in times] == []
+
+    def test_batch_import_deferred(self) -> None:
+        times = import_times("import beat_studio_importer.batch_import")
+        assert "beat_studio_importer.batch_import" in times
+        assert "yaml" not in times
+
+    @benchmark
+    def test_budget(self) -> None:
+        best = min(
+            import_times("import beat_studio_importer.__main__")["beat_studio_importer.__main__"]
+            for _ in range(5))
+        print(f"startup: {best / 1000:.1f} ms")
+        assert best < STARTUP_BUDGET_US
@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.table import Table
+from io import StringIO
+
+
+class TestTable:
+    def test_two_pass(self) -> None:
+        out = StringIO()
+        with Table("Name", ("Count", None, "{:>3}", None), column_sep=" ") as table:
+            table.add_row("kick", 1)
+            table.add_row("hi-hat", 12)
+            table.add_row("snare", 3, "extra")
+            assert out.getvalue() == ""
+            table.print(out)
+        assert out.getvalue().splitlines() == [
+            "Name   Count      ",
+            "kick     1        ",
+            "hi-hat  12        ",
+            "snare    3   extra",
+        ]
+
+    def test_streaming(self) -> None:
+        out = StringIO()
+        with Table("Name", "Count", column_sep=" ", sample_size=2, file=out) as table:
+            table.add_row("kick", 1)
+            assert out.getvalue() == ""
+            table.add_row("snare", 3)
+            assert out.getvalue().splitlines() == [
+                "Name  Count",
+                "kick  1    ",
+                "snare 3    ",
+            ]
+            table.add_row("hi-hat", 12, "extra")
+            assert out.getvalue().splitlines()[-1] == "hi-hat 12    extra"
+            table.print()
+        assert len(out.getvalue().splitlines()) == 4
+
+    def test_streaming_fewer_rows(self) -> None:
+        out = StringIO()
+        with Table("Name", column_sep=" ", sample_size=10, file=out) as table:
+            table.add_row("kick")
+            assert out.getvalue() == ""
+            table.print()
+            table.print()
+        assert out.getvalue().splitlines() == ["Name", "kick"]
+
+    def test_declared_widths(self) -> None:
+        out = StringIO()
+        with Table("Name", "Count", column_sep="|", sample_size=0, widths=[6, 3], file=out) as table:
+            assert out.getvalue() == "Name  |Count\n"
+            table.add_row("kick", 1)
+            table.add_row("hi-hat", 12)
+            table.print()
+        assert out.getvalue().splitlines() == [
+            "Name  |Count",
+            "kick  |1    ",
+            "hi-hat|12   ",
+        ]
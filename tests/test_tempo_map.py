@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.events import TempoEvent
+from beat_studio_importer.misc import Ppqn, Tick
+from beat_studio_importer.region import Region
+from beat_studio_importer.tempo_map import TempoMap
+from beat_studio_importer.tempos import MidiTempo
+from beat_studio_importer.timeline import Timeline
+from fractions import Fraction
+from mido import MidiFile
+from pathlib import Path
+import math
+import pytest
+
+
+SAMPLES_DIR: Path = Path(__file__).parent.parent / "samples"
+
+
+class TestTempoMap:
+    def test_default_tempo(self) -> None:
+        tempo_map = TempoMap.build(Ppqn(960), [])
+        assert tempo_map.tick_to_seconds(Tick(960)) == Fraction(1, 2)
+        assert tempo_map.seconds_to_tick(0.5) == 960
+
+    def test_basics(self) -> None:
+        tempo_map = TempoMap.build(Ppqn(960), [
+            TempoEvent(tick=Tick(0), tempo=MidiTempo(600_000)),
+            TempoEvent(tick=Tick(1920), tempo=MidiTempo(1_000_000)),
+            TempoEvent(tick=Tick(1920), tempo=MidiTempo(250_000)),
+        ])
+        assert tempo_map.tick_to_seconds(Tick(0)) == 0
+        assert tempo_map.tick_to_seconds(Tick(960)) == Fraction(6, 10)
+        assert tempo_map.tick_to_seconds(Tick(1920)) == Fraction(12, 10)
+        assert tempo_map.tick_to_seconds(Tick(2880)) == Fraction(145, 100)
+        assert tempo_map.tick_to_seconds(Tick(1)) == Fraction(600_000, 960 * 1_000_000)
+
+        for tick in range(0, 4000, 7):
+            seconds = tempo_map.tick_to_seconds(Tick(tick))
+            assert tempo_map.seconds_to_tick(seconds) == tick
+
+        assert tempo_map.seconds_to_tick(Fraction(145, 100) - Fraction(1, 10**9)) == 2879
+
+        with pytest.raises(ValueError):
+            _ = tempo_map.seconds_to_tick(-1)
+
+    def test_matches_mido(self) -> None:
+        file = MidiFile(SAMPLES_DIR / "example-0.mid")
+        tempo_map = Timeline.build(file).tempo_map
+
+        tick = 0
+        seconds = 0.0
+        # merged_track yields delta ticks, iterating the file yields
+        # delta seconds
+        for message, timed_message in zip(file.merged_track, file):
+            tick += message.time
+            seconds += timed_message.time
+            assert math.isclose(
+                float(tempo_map.tick_to_seconds(Tick(tick))),
+                seconds,
+                abs_tol=1e-9)
+
+
+class TestFindRegion:
+    def test_find(self) -> None:
+        regions = Region.build_all(
+            Timeline.build(MidiFile(SAMPLES_DIR / "example-0.mid")))
+        for region in regions:
+            assert Region.find(regions, region.start_tick) is region
+            assert Region.find(regions, Tick(region.end_tick - 1)) is region
+        assert Region.find(regions, regions[-1].end_tick) is None
@@ -0,0 +1,54 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.tempos import MidiTempo, is_qpm_in_range, midi_tempo_to_bpm, midi_tempo_to_qpm, midi_tempo_to_rounded_qpm
+from fractions import Fraction
+import pytest
+
+
+class TestTempos:
+    def test_midi_tempo_to_qpm(self) -> None:
+        assert midi_tempo_to_qpm(MidiTempo(600_000)) == 100
+        assert midi_tempo_to_qpm(MidiTempo(700_000)) == Fraction(600, 7)
+        assert midi_tempo_to_qpm(MidiTempo(700_000)) is \
+            midi_tempo_to_qpm(MidiTempo(700_000))
+
+    def test_midi_tempo_to_bpm(self) -> None:
+        assert midi_tempo_to_bpm(MidiTempo(400_000), Fraction(3, 2)) == 100
+
+    @pytest.mark.parametrize("tempo", [
+        *range(200_000, 1_100_000, 9_973),
+        # Exact
+        240_000, 400_000, 480_000, 600_000, 800_000, 960_000,
+        # Half way: 2.5 rounds down and 1.5 rounds up
+        24_000_000, 40_000_000,
+    ])
+    def test_midi_tempo_to_rounded_qpm(self, tempo: MidiTempo) -> None:
+        assert midi_tempo_to_rounded_qpm(tempo) == \
+            round(midi_tempo_to_qpm(tempo))
+
+    @pytest.mark.parametrize("tempo", [
+        299_999, 300_000, 300_001, 999_999, 1_000_000, 1_000_001
+    ])
+    def test_is_qpm_in_range(self, tempo: MidiTempo) -> None:
+        assert is_qpm_in_range(tempo, 60, 200) == \
+            (60 <= midi_tempo_to_qpm(tempo) <= 200)
@@ -0,0 +1,98 @@
+# Copyright (c) 2026 Richard Cook
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+from beat_studio_importer.__main__ import run_command
+from beat_studio_importer.play_command import do_play, open_midi_port, raw_sender
+from beat_studio_importer.virtual_port import VirtualOutput, is_virtual_port_name
+from mido import Message, MidiFile, MidiTrack
+from pathlib import Path
+import pytest
+
+
+class TestVirtualOutput:
+    @pytest.mark.parametrize("name,expected", [
+        (None, False),
+        ("virtual", True),
+        ("virtual:out.txt", True),
+        ("virtualx", False),
+        ("Microsoft GS Wavetable Synth", False),
+    ])
+    def test_is_virtual_port_name(self, name: str | None, expected: bool) -> None:
+        assert is_virtual_port_name(name) == expected
+
+    def test_record(self, tmp_path: Path) -> None:
+        ticks = iter(range(1000, 10000, 250))
+        path = tmp_path / "recording.txt"
+        with VirtualOutput(path=path, clock=lambda: next(ticks)) as port:
+            port.send(Message("note_on", channel=9, note=42, velocity=100))
+            port.send_bytes(b"\x89\x2a\x00")
+            assert port.message_count == 2
+            assert port.message_bytes(0) == b"\x99\x2a\x64"
+            assert list(port.timestamps) == [1000, 1250]
+
+        assert path.read_text() == "0 99 2a 64\n250 89 2a 00\n"
+
+    def test_open_midi_port(self, tmp_path: Path) -> None:
+        path = tmp_path / "recording.txt"
+        with open_midi_port(f"virtual:{path}") as port:
+            assert isinstance(port, VirtualOutput)
+            raw_sender(port)(b"\xfa")
+        assert path.read_text() == "0 fa\n"
+
+    def test_benchmark(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        # 20 messages over a quarter of a second at the default 120 QPM
+        file = MidiFile(ticks_per_beat=960)
+        track = MidiTrack()
+        for _ in range(10):
+            track.append(Message("note_on", channel=0, note=36, velocity=100, time=0))
+            track.append(Message("note_off", channel=0, note=36, velocity=0, time=48))
+        file.tracks.append(track)
+        midi_path = tmp_path / "notes.mid"
+        file.save(midi_path)
+
+        path = tmp_path / "recording.txt"
+        do_play(
+            midi_path,
+            port_name=f"virtual:{path}",
+            force_channel_10=True,
+            benchmark=True)
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 20
+        assert [line.split(" ", 1)[1] for line in lines[:2]] == [
+            "99 24 64",
+            "89 24 00",
+        ]
+        assert int(lines[-1].split(" ")[0]) >= 249_000_000
+        assert "Throughput" in capsys.readouterr().out
+
+    def test_relative_path(self, tmp_path: Path) -> None:
+        file = MidiFile(ticks_per_beat=960)
+        track = MidiTrack()
+        track.append(Message("note_on", channel=0, note=36, velocity=100, time=0))
+        track.append(Message("note_off", channel=0, note=36, velocity=0, time=1))
+        file.tracks.append(track)
+        file.save(tmp_path / "notes.mid")
+
+        # Resolved against the command's working directory
+        run_command(tmp_path, ["play", "notes.mid", "--port", "virtual:recording.txt"])
+        assert len((tmp_path / "recording.txt").read_text().splitlines()) == 2
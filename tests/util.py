@@ -20,8 +20,12 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
+from beat_studio_importer.features import is_feature_enabled
+from collections.abc import Callable
 from fractions import Fraction
+from time import perf_counter
 import math
+import pytest
 
 
 def is_close_tempo(expected: int, actual: Fraction) -> bool:
@@ -29,3 +33,18 @@ def is_close_tempo(expected: int, actual: Fraction) -> bool:
         return expected == int(actual)
     else:
         return math.isclose(expected, actual, rel_tol=1e-5)
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    result = math.inf
+    for _ in range(repeat):
+        start = perf_counter()
+        _ = func()
+        result = min(result, perf_counter() - start)
+    return result
+
+
+# Large benchmarks only run when BS_IMPORTER_BENCHMARKS is set
+benchmark: pytest.MarkDecorator = pytest.mark.skipif(
+    not is_feature_enabled("BENCHMARKS"),
+    reason="set BS_IMPORTER_BENCHMARKS to run benchmarks")